@@ -0,0 +1,89 @@
+"""
+Benchmark matching a fleet against advisories with advisory.AdvisoryIndex
+
+Builds a synthetic fleet in which hosts install one of a few versions of
+each package in a shared catalog, and a set of advisories fixed in
+versions drawn from the same distribution. Reports the time to build
+the index and to match the whole fleet, and compares a sample of hosts
+against the naive approach of comparing every package on a host with
+every advisory for its name using rpm.compare_evrs.
+
+Run with ``python benchmarks/bench_advisory.py [hosts] [packages]
+[advisories]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from random import Random
+from sys import argv, path
+from timeit import default_timer
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+import corpus  # noqa: E402
+from version_utils import rpm  # noqa: E402
+from version_utils.advisory import Advisory, AdvisoryIndex  # noqa: E402
+
+
+def build_fleet(hosts, packages, advisories, seed=0):
+    """Build hosts, each with ``packages`` packages, and advisories"""
+    rand = Random(seed)
+    names = ['pkg{0}'.format(index) for index in range(packages)]
+    choices = dict((name, corpus.evrs(4, seed + index))
+                   for index, name in enumerate(names))
+    catalog = dict((name, [rpm.package('{0}-{1}:{2}-{3}.x86_64'.format(
+        name, *evr)) for evr in choices[name]]) for name in names)
+    fleet = dict(('host{0}'.format(host),
+                  [rand.choice(catalog[name]) for name in names])
+                 for host in range(hosts))
+    fixed = []
+    for index in range(advisories):
+        name = rand.choice(names)
+        fixed.append(Advisory('ADV-{0}'.format(index), name,
+                              rand.choice(choices[name])))
+    return fleet, fixed
+
+
+def naive_match(fleet, advisories):
+    """Compare every installed package with every advisory for its name"""
+    by_name = {}
+    for advisory in advisories:
+        by_name.setdefault(advisory.name, []).append(advisory)
+    for host, packages in fleet.items():
+        for package in packages:
+            for advisory in by_name.get(package.name, ()):
+                if rpm.compare_evrs(package.evr, advisory.fixed_evr) < 0:
+                    yield host, package, advisory
+
+
+def main():
+    hosts = int(argv[1]) if len(argv) > 1 else 2000
+    packages = int(argv[2]) if len(argv) > 2 else 800
+    advisories = int(argv[3]) if len(argv) > 3 else 5000
+    fleet, fixed = build_fleet(hosts, packages, advisories)
+    print('{0} hosts x {1} packages, {2} advisories, backend {3}'.format(
+        hosts, packages, advisories, rpm.backend))
+
+    start = default_timer()
+    index = AdvisoryIndex(fixed)
+    print('index build:   {0:8.3f} s'.format(default_timer() - start))
+
+    start = default_timer()
+    matches = sum(1 for _ in index.match(fleet))
+    elapsed = default_timer() - start
+    print('index match:   {0:8.3f} s  {1} matches, {2:,.0f} packages/s'.format(
+        elapsed, matches, hosts * packages / elapsed))
+
+    sample = dict(list(fleet.items())[:max(1, hosts // 20)])
+    start = default_timer()
+    naive = sum(1 for _ in naive_match(sample, fixed))
+    naive_elapsed = (default_timer() - start) * len(fleet) / len(sample)
+    print('naive match:   {0:8.3f} s  (extrapolated from {1} hosts, '
+          '{2} matches)'.format(naive_elapsed, len(sample), naive))
+    print('speedup:       {0:8.1f}x'.format(naive_elapsed / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark scaling of rpm.compare_many across worker processes
+
+Compares a stream of generated (installed, fixed-in) package pairs with
+1, 2, 4, and 8 workers, reporting pairs per second and the speedup over
+a single worker.
+
+Run with ``python benchmarks/bench_compare_many.py [count]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from sys import argv, path
+from timeit import default_timer
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+
+
+def package_pairs(count):
+    """Generate (installed, fixed-in) package string pairs"""
+    for i in range(count):
+        yield ('openssl{0}-1.0.{1}e-{2}.el6.x86_64'.format(
+                   i % 100, i % 3, i % 60),
+               'openssl{0}-1.0.{1}e-{2}.el6_9.x86_64'.format(
+                   i % 100, i % 4, i % 50))
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 400000
+    single = None
+    print('{0:>7} {1:>14} {2:>8}'.format('workers', 'pairs/s', 'speedup'))
+    for workers in (1, 2, 4, 8):
+        start = default_timer()
+        rpm.compare_many(package_pairs(count), workers=workers)
+        rate = count / (default_timer() - start)
+        single = single or rate
+        print('{0:>7} {1:>14,.0f} {2:>7.2f}x'.format(
+            workers, rate, rate / single))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the external merge sort against sorting in memory
+
+Sorts package strings with ``extsort.sort_package_strings`` under
+several memory budgets, reporting the time taken, and the peak memory
+allocated by Python as measured by ``tracemalloc`` in a second pass.
+Sorting the whole list in memory with ``rpm.evr_key`` is shown for
+comparison.
+
+Run with ``python benchmarks/bench_extsort.py [count]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from sys import argv, path
+from timeit import default_timer
+import tracemalloc
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+import corpus  # noqa: E402
+from version_utils import extsort, rpm  # noqa: E402
+
+
+def in_memory(strings):
+    packages = list(rpm.parse_many(strings))
+    packages.sort(key=lambda pkg: (pkg.name, rpm.evr_key(pkg), pkg.arch))
+    for pkg in packages:
+        yield pkg.package
+
+
+def measure(func, strings):
+    """Consume ``func(strings)``, returning its time and peak memory"""
+    start = default_timer()
+    count = sum(1 for _ in func(strings))
+    elapsed = default_timer() - start
+    tracemalloc.start()
+    sum(1 for _ in func(strings))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert count == len(strings)
+    return elapsed, peak
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    strings = corpus.package_strings(count)
+    input_mb = sum(len(string) for string in strings) / 1e6
+    print('{0} packages, {1:.1f} MB of input'.format(count, input_mb))
+    print('{0:<16} {1:>10} {2:>14}'.format('sort', 'seconds', 'peak MB'))
+    cases = [('in memory', in_memory)]
+    for memory_mb in (64, 4, 1):
+        cases.append(('extsort {0} MiB'.format(memory_mb),
+                      lambda ss, m=memory_mb: extsort.sort_package_strings(
+                          ss, memory=m * 1024 * 1024)))
+    for name, func in cases:
+        elapsed, peak = measure(func, strings)
+        print('{0:<16} {1:>10.2f} {2:>14.1f}'.format(name, elapsed,
+                                                     peak / 1e6))
+
+
+if __name__ == '__main__':
+    main()
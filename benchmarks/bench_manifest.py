@@ -0,0 +1,72 @@
+"""
+Benchmark reading manifest files with manifest.read_manifest
+
+Writes a synthetic ``rpm -qa`` manifest, plain and gzip-compressed, to
+a temporary directory and reports the ingest rate in MB/s of manifest
+data, along with the peak memory allocated while reading. Peak memory
+should not grow with the size of the manifest.
+
+Run with ``python benchmarks/bench_manifest.py [megabytes]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from gzip import GzipFile
+from os.path import abspath, dirname, getsize, join
+from shutil import rmtree
+from sys import argv, path
+from tempfile import mkdtemp
+from timeit import default_timer
+import tracemalloc
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+import corpus  # noqa: E402
+from version_utils.manifest import read_manifest  # noqa: E402
+
+
+def write_manifest(filename, megabytes, compress=False):
+    """Write a manifest of roughly the given size, in megabytes"""
+    lines = ('\n'.join(corpus.package_strings(10000)) + '\n').encode('ascii')
+    opener = GzipFile if compress else open
+    with opener(filename, 'wb') as manifest:
+        written = 0
+        while written < megabytes * 1e6:
+            manifest.write(lines)
+            written += len(lines)
+    return written
+
+
+def main():
+    megabytes = int(argv[1]) if len(argv) > 1 else 50
+    tmpdir = mkdtemp()
+    try:
+        print('{0:<6} {1:>10} {2:>10} {3:>14}'.format(
+            'format', 'MB', 'MB/s', 'peak KiB'))
+        for compress in (False, True):
+            filename = join(tmpdir, 'manifest.gz' if compress
+                            else 'manifest.txt')
+            size = write_manifest(filename, megabytes, compress)
+            start = default_timer()
+            for _ in read_manifest(filename):
+                pass
+            elapsed = default_timer() - start
+            # Memory is traced separately, since tracing slows reading
+            tracemalloc.start()
+            for _ in read_manifest(filename):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('{0:<6} {1:>10.1f} {2:>10.2f} {3:>14.1f}'.format(
+                'gzip' if compress else 'plain', size / 1e6,
+                size / 1e6 / elapsed, peak / 1024))
+            if compress:
+                print('(gzip file is {0:.1f} MB on disk)'.format(
+                    getsize(filename) / 1e6))
+    finally:
+        rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
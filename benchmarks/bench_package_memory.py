@@ -0,0 +1,93 @@
+"""
+Benchmark the memory used by common.Package objects
+
+Measures the bytes allocated per Package when parsing a synthetic
+inventory with ``rpm.package``, compared with the previous layout,
+which kept a ``__dict__`` and stored ``evr`` and ``info`` tuples on
+every instance. Also measures the memory retained per package, fields
+included, when parsing with ``rpm.parse_many`` with and without a
+shared ``common.StringPool``.
+
+Run with ``python benchmarks/bench_package_memory.py [count]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from sys import argv, getsizeof, path
+import gc
+import tracemalloc
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+from version_utils.common import Package, StringPool  # noqa: E402
+
+
+class DictPackage(object):
+    """The Package layout used before Package had __slots__"""
+
+    def __init__(self, name, epoch=None, version=None, release=None,
+                 arch=None, package_str=None):
+        self.name = name
+        self.epoch = epoch
+        self.version = version
+        self.release = release
+        self.arch = arch
+        self.evr = (epoch, version, release)
+        self.info = (name, epoch, version, release, arch)
+        self.package = package_str
+
+
+def package_strings(count):
+    """Generate distinct package strings sharing names and arches"""
+    arches = ('x86_64', 'noarch', 'i686')
+    return ['pkg{0}-{1}.{2}-{3}.el7.{4}'.format(
+        i % 500, i % 7, i % 13, i % 40, arches[i % 3])
+        for i in range(count)]
+
+
+def bytes_per_package(cls, strings):
+    """Measure memory allocated per package object of class ``cls``"""
+    infos = [rpm.parse_package(s) for s in strings]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    packages = [cls(info['name'], info['EVR'][0], info['EVR'][1],
+                    info['EVR'][2], info['arch'], package_str=s)
+                for s, info in zip(strings, infos)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the packages
+    return (after - before - getsizeof(packages)) / len(packages)
+
+
+def retained_per_package(strings, pool=None):
+    """Measure memory retained per package parsed by rpm.parse_many"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    packages = list(rpm.parse_many(strings, pool=pool))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - getsizeof(packages)) / len(packages)
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    strings = package_strings(count)
+    for cls in (DictPackage, Package):
+        print('{0:<12} {1:>8.1f} bytes per package'.format(
+            cls.__name__, bytes_per_package(cls, strings)))
+    print('{0:<12} {1:>8.1f} bytes retained per parsed package'.format(
+        'no pool', retained_per_package(strings)))
+    pool = StringPool()
+    print('{0:<12} {1:>8.1f} bytes retained per parsed package'.format(
+        'StringPool', retained_per_package(strings, pool)))
+    print('pool: {0}'.format(pool.info()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark parsing of long and malformed package strings
+
+Times ``rpm.package`` on worst-case inputs of 10KB and 1MB, such as
+strings of nothing but hyphens, which untrusted sources could send to
+slow down parsing. Parsing time should grow linearly with the length
+of the input, so each 1MB time should be about 100 times the 10KB time.
+
+For comparison, the regular expression formerly used to parse package
+strings is also timed on the 10KB inputs. It backtracks heavily on
+some of them, and is not timed on the 1MB inputs, which would take
+hours.
+
+Run with ``python benchmarks/bench_parse_adversarial.py``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from re import compile
+from sys import path
+from timeit import default_timer
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+from version_utils.errors import RpmError  # noqa: E402
+
+old_rpm_re = compile(r'(\S+)-(?:(\d*):)?(.*)-(~?\w+[\w.]*)'
+                     r'[\s\S]*?\.([^.]*)\Z')
+
+
+def inputs(size):
+    """Generate worst-case package strings of about ``size`` characters"""
+    return [
+        ('hyphens', '-' * size + '.x86_64'),
+        ('hyphen-plus', 'a-+' * (size // 3) + '.x86_64'),
+        ('periods', 'a-1-' + '.' * size),
+        ('epochs', 'a-' + '1:-' * (size // 3) + '.x86_64'),
+        ('spaces', 'a-1-1 ' * (size // 6) + '.x86_64'),
+        ('long-name', 'a' * size + '-1.0-1.el7.x86_64'),
+    ]
+
+
+def best_time(func, package_string, repeat=3):
+    """Time ``func`` on a string, returning the best of ``repeat`` runs"""
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        try:
+            func(package_string)
+        except RpmError:
+            pass
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print('{0:<12} {1:>12} {2:>12} {3:>14}'.format(
+        'input', '10KB', '1MB', 'old regex 10KB'))
+    for (name, small), (_, large) in zip(inputs(10 ** 4), inputs(10 ** 6)):
+        print('{0:<12} {1:>10.6f} s {2:>10.6f} s {3:>12.6f} s'.format(
+            name, best_time(rpm.package, small),
+            best_time(rpm.package, large),
+            best_time(old_rpm_re.match, small, repeat=1)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark bulk parsing of rpm -qa style package lists
+
+Reports the number of lines per second parsed by ``rpm.parse_many``
+and, for comparison, by calling ``rpm.package`` on each line.
+
+Run with ``python benchmarks/bench_parse_many.py [count]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from sys import argv, path
+from timeit import default_timer
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+
+
+def qa_lines(count):
+    """Generate lines resembling ``rpm -qa`` output"""
+    arches = ('x86_64', 'noarch', 'i686')
+    return ['perl-Compress-Raw-Zlib{0}-{1}:2.{2}-136.el6_6.{3}.{4}\n'.format(
+        i % 900, i % 3, i % 50, i % 7, arches[i % 3]) for i in range(count)]
+
+
+def lines_per_second(func, lines):
+    """Time ``func`` over ``lines``, returning the best rate of 3 runs"""
+    best = None
+    for _ in range(3):
+        start = default_timer()
+        func(lines)
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 200000
+    lines = qa_lines(count)
+    cases = [
+        ('parse_many', lambda ls: list(rpm.parse_many(ls))),
+        ('package', lambda ls: [rpm.package(line.strip()) for line in ls]),
+    ]
+    for name, func in cases:
+        print('{0:<12} {1:>12,.0f} lines/s'.format(
+            name, lines_per_second(func, lines)))
+
+
+if __name__ == '__main__':
+    main()
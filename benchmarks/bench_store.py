@@ -0,0 +1,60 @@
+"""
+Benchmark the store binary format against pickling lists of packages
+
+Reports the time to serialize, the size of the result, the time to open
+it, and the time to load every package, for pickle and for store. Two
+corpora are used: packages with all-distinct EVRs, and a fleet-like set
+in which a few thousand distinct packages are repeated across hosts.
+
+Run with ``python benchmarks/bench_store.py [count]``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from os.path import abspath, dirname
+from sys import argv, path
+from timeit import default_timer
+import pickle
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+import corpus  # noqa: E402
+from version_utils import rpm, store  # noqa: E402
+
+
+def timed(func, *args):
+    start = default_timer()
+    result = func(*args)
+    return result, default_timer() - start
+
+
+def report(label, packages):
+    print(label)
+    print('{0:<8} {1:>10} {2:>10} {3:>10} {4:>10}'.format(
+        'format', 'dump s', 'MB', 'open s', 'load s'))
+    data, dump_time = timed(pickle.dumps, packages, -1)
+    _, open_time = timed(pickle.loads, data)
+    print('{0:<8} {1:>10.3f} {2:>10.2f} {3:>10.3f} {4:>10.3f}'.format(
+        'pickle', dump_time, len(data) / 1e6, open_time, open_time))
+    data, dump_time = timed(store.dumps, packages)
+    stored, open_time = timed(store.loads, data)
+    _, load_time = timed(list, stored)
+    print('{0:<8} {1:>10.3f} {2:>10.2f} {3:>10.3f} {4:>10.3f}'.format(
+        'store', dump_time, len(data) / 1e6, open_time, load_time))
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    report('{0} packages, distinct EVRs'.format(count),
+           list(rpm.parse_many(corpus.package_strings(count))))
+    # Parsed separately, as when collected from many hosts, so that
+    # equal packages do not share objects
+    distinct = corpus.package_strings(2000)
+    report('{0} packages, 2000 distinct'.format(count),
+           list(rpm.parse_many(distinct[index % len(distinct)]
+                               for index in range(count))))
+
+
+if __name__ == '__main__':
+    main()
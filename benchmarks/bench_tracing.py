@@ -0,0 +1,55 @@
+"""
+Benchmark the cost of debug logging in the rpm module
+
+Times parsing and comparison with tracing disabled (the default) and
+enabled. With tracing enabled every ``logger.debug`` call is made, as
+it was before tracing could be disabled, but the logger is left at the
+``WARNING`` level so that records are discarded rather than emitted.
+
+Run with ``python benchmarks/bench_tracing.py``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from logging import WARNING, getLogger
+from os.path import abspath, dirname
+from sys import path
+from timeit import repeat
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+
+
+cases = [
+    ('compare_versions', rpm.compare_versions,
+     ('2.6.32-573.12.1.el6', '2.6.32-573.18.1.el6')),
+    ('_compare_versions_legacy', rpm._compare_versions_legacy,
+     ('2.6.32-573.12.1.el6', '2.6.32-573.18.1.el6')),
+    ('parse_package', rpm.parse_package,
+     ('perl-Compress-Raw-Zlib-2.021-136.el6_6.1.x86_64',)),
+]
+
+
+def time_call(func, args, number=20000):
+    """Return the best time per call in microseconds"""
+    best = min(repeat(lambda: func(*args), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    getLogger('version_utils').setLevel(WARNING)
+    print('{0:<26} {1:>12} {2:>12} {3:>8}'.format(
+        'function', 'tracing us', 'fast us', 'speedup'))
+    for name, func, args in cases:
+        rpm.set_tracing(True)
+        traced = time_call(func, args)
+        rpm.set_tracing(False)
+        fast = time_call(func, args)
+        print('{0:<26} {1:>12.2f} {2:>12.2f} {3:>7.1f}x'.format(
+            name, traced, fast, traced / fast))
+
+
+if __name__ == '__main__':
+    main()
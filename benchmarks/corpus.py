@@ -0,0 +1,111 @@
+"""
+Synthetic corpus generator for version_utils benchmarks
+
+Every function takes a ``seed``, so the same corpus is generated on
+every run and results can be compared between releases.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from random import Random
+
+
+arches = ('x86_64', 'noarch', 'i686', 'aarch64')
+dists = ('el6', 'el7', 'el8_4', 'fc33', 'centos')
+
+
+def short_versions(count, seed=0):
+    """Generate short versions such as ``1.2.3``"""
+    rand = Random(seed)
+    return ['.'.join(str(rand.randint(0, 20))
+                     for _ in range(rand.randint(1, 3)))
+            for _ in range(count)]
+
+
+def long_versions(count, seed=0):
+    """Generate long versions with mixed numeric and alpha segments"""
+    rand = Random(seed)
+    pieces = ('0', '12', '007', '2019', 'rc', 'git', 'beta', 'p')
+    return ['.'.join(rand.choice(pieces) + rand.choice(pieces)
+                     for _ in range(rand.randint(12, 20)))
+            for _ in range(count)]
+
+
+def tilde_versions(count, seed=0):
+    """Generate pre-release versions that use tildes"""
+    rand = Random(seed)
+    return ['{0}.{1}~{2}{3}~{4}'.format(
+        rand.randint(1, 3), rand.randint(0, 9),
+        rand.choice(('rc', 'beta', 'alpha')), rand.randint(1, 4),
+        rand.choice(('git', 'dev', '1')))
+        for _ in range(count)]
+
+
+def releases(count, seed=0):
+    """Generate release strings such as ``16.el6_6.1``"""
+    rand = Random(seed)
+    return ['{0}.{1}.{2}'.format(rand.randint(1, 600), rand.choice(dists),
+                                 rand.randint(0, 9))
+            for _ in range(count)]
+
+
+def evrs(count, seed=0):
+    """Generate EVR tuples with a mixture of epochs"""
+    rand = Random(seed)
+    versions = short_versions(count, seed)
+    rels = releases(count, seed)
+    return [(rand.choice('0012'), version, release)
+            for version, release in zip(versions, rels)]
+
+
+def debian_versions(count, seed=0):
+    """Generate Debian versions such as ``1:2.30-1ubuntu2~20.04.1``"""
+    rand = Random(seed)
+    result = []
+    for version in short_versions(count, seed):
+        epoch = rand.choice(('', '', '', '1:', '2:'))
+        suffix = rand.choice(('', '', '+dfsg', '~rc1', '+b1'))
+        revision = rand.choice(('', '-1', '-2', '-{0}ubuntu{1}'.format(
+            rand.randint(0, 5), rand.randint(1, 9)),
+            '-1ubuntu0.{0}~20.04.1'.format(rand.randint(1, 9))))
+        result.append(epoch + version + suffix + revision)
+    return result
+
+
+def alpine_versions(count, seed=0):
+    """Generate Alpine versions such as ``1.2.3_rc1-r0``"""
+    rand = Random(seed)
+    result = []
+    for version in short_versions(count, seed):
+        suffix = rand.choice(('', '', '', '_rc1', '_p2', '_git20210512',
+                              'a'))
+        result.append('{0}{1}-r{2}'.format(version, suffix,
+                                           rand.randint(0, 12)))
+    return result
+
+
+def package_strings(count, seed=0, name_length=10):
+    """Generate ``rpm -qa`` style package strings
+
+    :param int count: number of strings to generate
+    :param int seed: random seed
+    :param int name_length: approximate number of characters in each
+        package name, which may contain hyphens
+    """
+    rand = Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    result = []
+    for version, release in zip(short_versions(count, seed),
+                                releases(count, seed)):
+        name = '-'.join(''.join(rand.choice(letters) for _ in range(5))
+                        for _ in range(max(1, name_length // 6)))
+        epoch = rand.choice(('', '', '', '1:', '2:'))
+        result.append('{0}-{1}{2}-{3}.{4}'.format(
+            name, epoch, version, release, rand.choice(arches)))
+    return result
+
+
+def pairs(items, seed=0):
+    """Pair each item with another randomly chosen item"""
+    rand = Random(seed)
+    return [(item, rand.choice(items)) for item in items]
@@ -0,0 +1,104 @@
+"""
+Run the version_utils benchmark suite
+
+Times each case in ``suite.py``, reporting microseconds per operation.
+Results can be saved as a baseline and later runs compared against it,
+so that performance can be compared from release to release::
+
+    python benchmarks/run.py --save benchmarks/baselines/0.3.1-c.json
+    python benchmarks/run.py --compare benchmarks/baselines/0.3.1-c.json
+
+Baselines are stored for both the C extension and, with
+``--pure-python``, the pure Python implementation. Absolute timings
+depend on the machine, so compare against a baseline recorded on the
+same machine where possible.
+
+Cases can be selected by passing part of their names. When comparing,
+the exit status is 1 if any case is slower than the baseline by more
+than ``--threshold``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from argparse import ArgumentParser
+from json import dump, load
+from platform import python_implementation, python_version
+from sys import exit
+from timeit import default_timer
+
+# Local imports
+import suite
+from version_utils import __version__, rpm
+
+
+def time_case(case, repeat):
+    """Get the best time per operation of a case, in microseconds"""
+    func, operations = case()
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / operations * 1e6
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('names', nargs='*',
+                        help='only run cases containing these names')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of times to run each case')
+    parser.add_argument('--save', metavar='FILE',
+                        help='save results as a baseline')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare results to a saved baseline')
+    parser.add_argument('--pure-python', action='store_true',
+                        help='use the pure Python comparison even if the '
+                             'C extension is available')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='fraction slower than the baseline that is '
+                             'reported as a regression (default 0.2)')
+    args = parser.parse_args(argv)
+    if args.pure_python:
+        rpm._c_compare_evrs = None
+        rpm._compare_unequal = rpm._compare_versions
+        rpm.backend = 'python'
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = load(baseline_file)['results']
+
+    results = {}
+    regressions = []
+    print('{0:<26} {1:>12} {2:>12} {3:>8}'.format(
+        'case', 'us/op', 'baseline', 'ratio'))
+    for case in suite.cases:
+        name = case.__name__
+        if args.names and not any(part in name for part in args.names):
+            continue
+        results[name] = time_case(case, args.repeat)
+        line = '{0:<26} {1:>12.3f}'.format(name, results[name])
+        if name in baseline:
+            ratio = results[name] / baseline[name]
+            line += ' {0:>12.3f} {1:>7.2f}x'.format(baseline[name], ratio)
+            if ratio > 1 + args.threshold:
+                regressions.append(name)
+                line += '  REGRESSION'
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            dump({'version': __version__,
+                  'python': '{0} {1}'.format(python_implementation(),
+                                             python_version()),
+                  'backend': rpm.backend,
+                  'results': results},
+                 baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    exit(main())
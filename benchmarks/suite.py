@@ -0,0 +1,220 @@
+"""
+Benchmark cases for the version_utils parse and compare hot paths
+
+Each case is a function that takes no arguments and returns a 2-tuple
+of (function to time, number of operations it performs). Corpora are
+generated before timing starts.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+from functools import cmp_to_key
+from os.path import abspath, dirname
+from sys import path
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Local imports
+import corpus  # noqa: E402
+from version_utils import apk, dpkg, rpm  # noqa: E402
+from version_utils.common import Package  # noqa: E402
+
+
+def _compare_pairs(version_pairs):
+    compare = rpm.compare_versions
+
+    def run():
+        for ver_a, ver_b in version_pairs:
+            compare(ver_a, ver_b)
+    return run, len(version_pairs)
+
+
+def compare_versions_short():
+    return _compare_pairs(corpus.pairs(corpus.short_versions(20000)))
+
+
+def compare_versions_long():
+    return _compare_pairs(corpus.pairs(corpus.long_versions(5000)))
+
+
+def compare_versions_tilde():
+    return _compare_pairs(corpus.pairs(corpus.tilde_versions(20000)))
+
+
+def compare_evrs_epoch():
+    evr_pairs = [(a, b) for a, b in corpus.pairs(corpus.evrs(20000))
+                 if a[0] != b[0]]
+
+    def run():
+        for evr_a, evr_b in evr_pairs:
+            rpm.compare_evrs(evr_a, evr_b)
+    return run, len(evr_pairs)
+
+
+def compare_evrs_same_epoch():
+    evr_pairs = [(('0',) + a[1:], ('0',) + b[1:])
+                 for a, b in corpus.pairs(corpus.evrs(20000))]
+
+    def run():
+        for evr_a, evr_b in evr_pairs:
+            rpm.compare_evrs(evr_a, evr_b)
+    return run, len(evr_pairs)
+
+
+def pop_arch_long():
+    strings = corpus.package_strings(2000, name_length=200)
+
+    def run():
+        for package_string in strings:
+            rpm._pop_arch(list(package_string))
+    return run, len(strings)
+
+
+def split_package_long():
+    strings = corpus.package_strings(2000, name_length=200)
+
+    def run():
+        for package_string in strings:
+            rpm._split_package(package_string)
+    return run, len(strings)
+
+
+def package():
+    strings = corpus.package_strings(20000)
+
+    def run():
+        for package_string in strings:
+            rpm.package(package_string)
+    return run, len(strings)
+
+
+def parse_many():
+    strings = corpus.package_strings(20000)
+
+    def run():
+        for _ in rpm.parse_many(strings):
+            pass
+    return run, len(strings)
+
+
+def sort_100k_evr_key():
+    packages = list(rpm.parse_many(corpus.package_strings(100000)))
+
+    def run():
+        sorted(packages, key=rpm.evr_key)
+    return run, len(packages)
+
+
+def sort_100k_compare_evrs():
+    packages = list(rpm.parse_many(corpus.package_strings(100000)))
+    key = cmp_to_key(rpm.compare_evrs)
+
+    def run():
+        sorted((pkg.evr for pkg in packages), key=key)
+    return run, len(packages)
+
+
+def _constraint_packages():
+    """100,000 packages of one name, drawn from 1000 distinct EVRs"""
+    evrs = corpus.evrs(1000)
+    return [Package('pkg', *evrs[index % len(evrs)], arch='x86_64')
+            for index in range(100000)], evrs[len(evrs) // 2]
+
+
+def constraint_filter():
+    packages, evr = _constraint_packages()
+    constraint = rpm.Constraint('pkg', '>=', evr)
+
+    def run():
+        for _ in constraint.filter(packages):
+            pass
+    return run, len(packages)
+
+
+def constraint_compare_evrs():
+    packages, evr = _constraint_packages()
+
+    def run():
+        for pkg in packages:
+            if pkg.name == 'pkg' and rpm.compare_evrs(pkg.evr, evr) >= 0:
+                pass
+    return run, len(packages)
+
+
+def diff_inventories():
+    """Diff two 20,000 package inventories, a tenth of them changed"""
+    old = corpus.package_strings(20000)
+    changed = corpus.package_strings(2000, seed=1)
+    new = changed + old[len(changed):]
+
+    def run():
+        for _ in rpm.diff_inventories(old, new):
+            pass
+    return run, len(old)
+
+
+def dpkg_compare_versions():
+    version_pairs = corpus.pairs(corpus.debian_versions(20000))
+
+    def run():
+        for ver_a, ver_b in version_pairs:
+            dpkg.compare_versions(ver_a, ver_b)
+    return run, len(version_pairs)
+
+
+def dpkg_compare_many():
+    """100,000 pairs drawn from 2000 distinct versions, as in a fleet"""
+    versions = corpus.debian_versions(2000)
+    version_pairs = corpus.pairs(versions * 50)
+
+    def run():
+        dpkg.compare_many(version_pairs)
+    return run, len(version_pairs)
+
+
+def dpkg_sort_100k_version_key():
+    versions = corpus.debian_versions(100000)
+
+    def run():
+        sorted(versions, key=dpkg.version_key)
+    return run, len(versions)
+
+
+def apk_compare_versions():
+    version_pairs = corpus.pairs(corpus.alpine_versions(20000))
+
+    def run():
+        for ver_a, ver_b in version_pairs:
+            apk.compare_versions(ver_a, ver_b)
+    return run, len(version_pairs)
+
+
+def apk_sort_100k_version_key():
+    versions = corpus.alpine_versions(100000)
+
+    def run():
+        sorted(versions, key=apk.version_key)
+    return run, len(versions)
+
+
+cases = [
+    compare_versions_short,
+    compare_versions_long,
+    compare_versions_tilde,
+    compare_evrs_epoch,
+    compare_evrs_same_epoch,
+    pop_arch_long,
+    split_package_long,
+    package,
+    parse_many,
+    sort_100k_evr_key,
+    sort_100k_compare_evrs,
+    constraint_filter,
+    constraint_compare_evrs,
+    diff_inventories,
+    dpkg_compare_versions,
+    dpkg_compare_many,
+    dpkg_sort_100k_version_key,
+    apk_compare_versions,
+    apk_sort_100k_version_key,
+]
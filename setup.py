@@ -4,19 +4,56 @@ setup.py module for version_utils
 
 
 from __future__ import (absolute_import, unicode_literals)
+from distutils.errors import CCompilerError, DistutilsError
+from os import environ
+from sys import version_info as python_version
+from warnings import warn
+
 from pkg_resources import resource_string
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
+from setuptools.command.build_ext import build_ext
 
 # Get version info without importing version.py
 version_info = {}
 version_txt = resource_string('version_utils', 'version.py')
 exec(version_txt, version_info)
 
-long_description = ('version_utils is a pure Python convenience library for'
+long_description = ('version_utils is a Python convenience library for '
                     'parsing system package strings and comparing package '
-                    'versions. Currently it only supports RPM/Yum, but there '
-                    'are plans in the near future to add dpkg/Debian and '
-                    'other packaging standards.')
+                    'versions, with an optional C extension that speeds up '
+                    'RPM version comparison. It supports RPM/Yum, '
+                    'dpkg/Debian, and apk/Alpine, and there are plans to '
+                    'add other packaging standards.')
+
+
+class optional_build_ext(build_ext):
+    """Build C extensions, continuing without them if the build fails
+
+    The extensions only speed up functionality that is also implemented
+    in pure Python, so failing to build them is not an error.
+    """
+
+    def run(self):
+        try:
+            build_ext.run(self)
+        except (CCompilerError, DistutilsError) as exc:
+            warn('Could not build C extensions, using pure Python: '
+                 '{0}'.format(exc))
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except (CCompilerError, DistutilsError) as exc:
+            warn('Could not build {0}, using pure Python: '
+                 '{1}'.format(ext.name, exc))
+
+
+# The compiled comparison functions require Python 3, and may be
+# skipped by setting VERSION_UTILS_PURE_PYTHON
+ext_modules = []
+if python_version[0] >= 3 and not environ.get('VERSION_UTILS_PURE_PYTHON'):
+    ext_modules.append(Extension(str('version_utils._rpmvercmp'),
+                                 [str('version_utils/_rpmvercmp.c')]))
 
 
 setup(
@@ -46,7 +83,16 @@ setup(
         'Topic :: System :: Software Distribution',
         'Topic :: Utilities'
     ],
-    keywords=('ihiji version compare parse rpm yum versions comparison '
-              'utility utilities control distribution'),
-    packages=find_packages(exclude=['tests'])
+    keywords=('ihiji version compare parse rpm yum dpkg debian deb apk '
+              'alpine versions comparison utility utilities control '
+              'distribution'),
+    packages=find_packages(exclude=['tests']),
+    ext_modules=ext_modules,
+    cmdclass={'build_ext': optional_build_ext},
+    entry_points={
+        'console_scripts': ['version_utils = version_utils.cli:main']
+    },
+    extras_require={
+        'table': ['numpy']
+    }
 )
@@ -0,0 +1,16 @@
+"""
+conftest.py module for version_utils tests
+"""
+
+# Standard library imports
+from sys import version_info
+
+# Test modules using syntax that older Pythons cannot compile
+collect_ignore = []
+if version_info < (3, 6):
+    collect_ignore.append('test_aio.py')
+# Test modules for functionality requiring newer Pythons
+if version_info < (3, 4):
+    collect_ignore.append('test_store.py')
+if version_info < (3, 5):
+    collect_ignore.append('test_extsort.py')
@@ -0,0 +1,83 @@
+"""
+Test module for version_utils.advisory
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import rpm
+from version_utils.advisory import Advisory, AdvisoryIndex
+
+logger = getLogger(__name__)
+
+advisories = [
+    Advisory('RHSA-1', 'openssl', ('0', '1.0.1e', '48.el6')),
+    Advisory('RHSA-2', 'openssl', ('0', '1.0.1e', '42.el6')),
+    Advisory('RHSA-3', 'openssl', ('0', '1.0.1e', '57.el6'), arch='i686'),
+    Advisory('RHSA-4', 'gcc', ('0', '4.4.7', '17.el6')),
+]
+
+hosts = {
+    'host1': [rpm.package('openssl-1.0.1e-42.el6.x86_64'),
+              rpm.package('gcc-4.4.7-17.el6.x86_64'),
+              rpm.package('nmap-6.40-1.i386')],
+    'host2': [rpm.package('openssl-1.0.1e-42.el6.i686'),
+              rpm.package('gcc-4.4.7-16.el6.x86_64')],
+}
+
+
+@pytest.fixture
+def index():
+    return AdvisoryIndex(advisories)
+
+
+def _ids(found):
+    return sorted(advisory.id for advisory in found)
+
+
+def test_affecting(index):
+    """Test finding the advisories affecting single packages"""
+    assert ['RHSA-1'] == _ids(index.affecting(hosts['host1'][0]))
+    assert ['RHSA-1', 'RHSA-3'] == _ids(index.affecting(hosts['host2'][0]))
+    assert [] == index.affecting(hosts['host1'][1])
+    assert [] == index.affecting(hosts['host1'][2])
+    assert 4 == len(index)
+
+
+def test_match(index):
+    """Test matching advisories across hosts"""
+    found = sorted((host, pkg.name, advisory.id)
+                   for host, pkg, advisory in index.match(hosts))
+    assert [('host1', 'openssl', 'RHSA-1'),
+            ('host2', 'gcc', 'RHSA-4'),
+            ('host2', 'openssl', 'RHSA-1'),
+            ('host2', 'openssl', 'RHSA-3')] == found
+    assert found == sorted((host, pkg.name, advisory.id)
+                           for host, pkg, advisory
+                           in index.match(list(hosts.items())))
+
+
+def test_match_compare_evrs():
+    """Test that matching agrees with pairwise compare_evrs"""
+    rand = Random(1819)
+
+    def evr():
+        return (rand.choice('01'), '1.{0}'.format(rand.randint(0, 5)),
+                '{0}.el7'.format(rand.randint(0, 5)))
+
+    random_advisories = [Advisory(i, 'pkg{0}'.format(i % 3), evr())
+                         for i in range(30)]
+    packages = [rpm.package('pkg{0}-{1}:{2}-{3}.x86_64'.format(
+        i % 4, *evr())) for i in range(100)]
+    expect = sorted((pkg.package, advisory.id) for pkg in packages
+                    for advisory in random_advisories
+                    if advisory.name == pkg.name and
+                    rpm.compare_evrs(pkg.evr, advisory.fixed_evr) < 0)
+    found = AdvisoryIndex(random_advisories).match({'host': packages})
+    assert expect == sorted((pkg.package, advisory.id)
+                            for _, pkg, advisory in found)
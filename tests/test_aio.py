@@ -0,0 +1,144 @@
+"""
+Test module for version_utils.aio
+"""
+
+# Builtin imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import aio, errors, rpm
+
+logger = getLogger(__name__)
+
+package_strings = ['nmap-6.40-1.i386', '', 'gcc-4.4.7-16.el6.x86_64  ',
+                   'openssl-1:1.0.1e-42.el6.x86_64', 'bash-4.2.46-1.noarch']
+bad_strings = ['what_even_is_this_thing', 'foo-1.0-1']
+
+
+def _run(coroutine):
+    """Run a coroutine in a new event loop, as asyncio.run does on 3.7+"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def _aiter(items, delay=0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+def _info(packages):
+    return [pkg.info for pkg in packages]
+
+
+@pytest.mark.parametrize('wrap', [list, _aiter])
+def test_parse_many(wrap):
+    """Test parsing from iterables and async iterables"""
+    expect = _info(rpm.parse_many(package_strings))
+    result = _run(_collect(aio.parse_many(wrap(package_strings),
+                                          chunksize=2)))
+    assert expect == _info(result)
+
+
+def test_parse_many_executor():
+    """Test parsing in a given executor"""
+    with ThreadPoolExecutor(2) as executor:
+        result = _run(_collect(aio.parse_many(
+            package_strings * 10, chunksize=3, executor=executor,
+            max_pending=3)))
+    assert _info(rpm.parse_many(package_strings * 10)) == _info(result)
+
+
+def test_parse_many_errors():
+    """Test the on_error modes, as for rpm.parse_many"""
+    strings = package_strings[:1] + bad_strings + package_strings[1:]
+    failures = []
+    result = _run(_collect(aio.parse_many(strings, on_error=failures,
+                                          chunksize=2)))
+    assert _info(rpm.parse_many(package_strings)) == _info(result)
+    assert bad_strings == [string for string, _ in failures]
+    result = _run(_collect(aio.parse_many(strings, on_error='skip')))
+    assert 4 == len(result)
+
+    yielded = []
+
+    async def consume():
+        async for pkg in aio.parse_many(strings):
+            yielded.append(pkg)
+    with pytest.raises(errors.RpmError):
+        _run(consume())
+    assert 1 == len(yielded)
+    with pytest.raises(ValueError):
+        _run(_collect(aio.parse_many(strings, on_error='ignore')))
+
+
+@pytest.mark.parametrize('wrap', [list, _aiter])
+def test_compare_many(wrap):
+    """Test comparing pairs from iterables and async iterables"""
+    pairs = [(a, b) for a in package_strings[2:] for b in package_strings[2:]]
+    expect = rpm.compare_many(pairs)
+    result = _run(aio.compare_many(wrap(pairs), chunksize=2))
+    assert expect == result
+
+
+def test_compare_many_error():
+    """Test that unparseable package strings raise an error"""
+    with pytest.raises(errors.RpmError):
+        _run(aio.compare_many([(bad_strings[0], bad_strings[0])]))
+
+
+def test_event_loop_not_blocked():
+    """Test that other tasks run while chunks are processed"""
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def run():
+        task = asyncio.ensure_future(ticker())
+        pairs = [(package_strings[2], package_strings[3])] * 2000
+        await aio.compare_many(pairs, chunksize=100)
+        task.cancel()
+    _run(run())
+    assert len(ticks) >= 20
+
+
+def test_backpressure_and_cancellation():
+    """Test that input is read as needed, and consumers can cancel"""
+    read = []
+
+    async def source():
+        for index in range(1000):
+            read.append(index)
+            yield package_strings[0]
+
+    async def run():
+        parser = aio.parse_many(source(), chunksize=10, max_pending=2)
+        async for _ in parser:
+            break
+        # Only the chunks submitted ahead of the consumer have been read
+        assert len(read) <= 30
+        task = asyncio.ensure_future(_collect(aio.parse_many(
+            _aiter(package_strings * 100, delay=0.001))))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await parser.aclose()
+    _run(run())
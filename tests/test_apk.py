@@ -0,0 +1,264 @@
+"""
+Test module for version_utils.apk
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import apk
+from version_utils import errors
+
+logger = getLogger(__name__)
+
+# Version pairs and the expected result of comparing them
+version_list = [
+    ('1.0', '1.0', 0),
+    ('1.0', '1.1', -1),
+    ('1.10', '1.9', 1),
+    ('2.34', '0.1.0_alpha', 1),
+    ('0.1.0_alpha', '0.1.0_alpha', 0),
+    ('0.1.0_alpha', '0.1.3_alpha', -1),
+    ('0.1.0_alpha2', '0.1.0_alpha', 1),
+    ('0.1.0_alpha', '0.1.0_beta', -1),
+    ('0.1.0_beta', '0.1.0_pre', -1),
+    ('0.1.0_pre', '0.1.0_rc', -1),
+    ('0.1.1_rc1', '0.1.1', -1),
+    ('0.1.0', '0.1.0_cvs', -1),
+    ('0.1.0_cvs', '0.1.0_svn', -1),
+    ('0.1.0_svn', '0.1.0_git', -1),
+    ('0.1.0_git', '0.1.0_hg', -1),
+    ('0.1.0_hg', '0.1.0_p', -1),
+    ('1.2.3_rc1-r0', '1.2.3-r0', -1),
+    ('1.2.3_rc1-r9', '1.2.3_rc2-r0', -1),
+    ('1.2.3_p1-r0', '1.2.3-r5', 1),
+    ('1.2.3-r0', '1.2.3', 1),
+    ('1.2.3-r10', '1.2.3-r9', 1),
+    ('1.0_rc1_p1', '1.0_rc1', 1),
+    ('1.0_rc1_alpha', '1.0_rc1', -1),
+    ('1.0a', '1.0', 1),
+    ('1.0a', '1.0b', -1),
+    ('1.0a', '1.0.1', -1),
+    ('1.0.1', '1.0', 1),
+    ('1.01', '1.1', -1),
+    ('1.001', '1.01', -1),
+    ('1.09', '1.1', -1),
+    ('1.0', '1.01', -1),
+    ('2.0_git20200101-r1', '2.0-r1', 1),
+    ('1.36.1-r2', '1.36.1-r15', -1),
+    ('1.0_rc1', '1.0', 1),
+    ('2.-r0', '2.0', 1),
+    ('1.', '1.0', 1),
+    ('1.', '1.00', 1),
+    ('1.0.', '1.0', 1),
+]
+
+
+# A direct port of apk-tools' version comparison, used as a reference
+_token_digit_or_zero, _token_digit, _token_letter, _token_suffix = range(4)
+_token_suffix_no, _token_revision_no, _token_end = range(4, 7)
+_token_invalid = -1
+
+
+def _reference_next_token(token, blob):
+    if not blob:
+        return _token_end, blob
+    char = blob[0]
+    if token in (_token_digit, _token_digit_or_zero) and char.islower():
+        new = _token_letter
+    elif token == _token_letter and char.isdigit():
+        new = _token_digit
+    elif token == _token_suffix and char.isdigit():
+        new = _token_suffix_no
+    else:
+        new = _token_invalid
+        if char == '.':
+            new = _token_digit_or_zero
+        elif char == '_':
+            new = _token_suffix
+        elif char == '-':
+            if blob[1:2] == 'r':
+                new = _token_revision_no
+                blob = blob[1:]
+        blob = blob[1:]
+    if new < token and (new, token) not in (
+            (_token_digit_or_zero, _token_digit),
+            (_token_suffix, _token_suffix_no),
+            (_token_digit, _token_letter)):
+        new = _token_invalid
+    return new, blob
+
+
+def _reference_get_token(token, blob):
+    pre_suffixes = ['alpha', 'beta', 'pre', 'rc']
+    post_suffixes = ['cvs', 'svn', 'git', 'hg', 'p']
+    if not blob:
+        return 0, _token_end, blob
+    value, i, new = 0, 0, _token_invalid
+    if token == _token_digit_or_zero and blob[0] == '0':
+        while i < len(blob) and blob[i] == '0':
+            i += 1
+        new = _token_digit
+        value = -i
+    elif token in (_token_digit_or_zero, _token_digit, _token_suffix_no,
+                   _token_revision_no):
+        while i < len(blob) and blob[i].isdigit():
+            value = value * 10 + int(blob[i])
+            i += 1
+    elif token == _token_letter:
+        value = ord(blob[0])
+        i = 1
+    elif token == _token_suffix:
+        for value, suffix in enumerate(pre_suffixes + post_suffixes):
+            if blob.startswith(suffix):
+                break
+        else:
+            return 0, _token_invalid, blob
+        value -= len(pre_suffixes)
+        i = len(suffix)
+    blob = blob[i:]
+    if not blob:
+        token = _token_end
+    elif new != _token_invalid:
+        token = new
+    else:
+        token, blob = _reference_next_token(token, blob)
+    return value, token, blob
+
+
+def _reference_compare(version_a, version_b):
+    at = bt = _token_digit
+    av = bv = 0
+    while (at == bt and at not in (_token_end, _token_invalid) and
+           av == bv):
+        av, at, version_a = _reference_get_token(at, version_a)
+        bv, bt, version_b = _reference_get_token(bt, version_b)
+    if av != bv:
+        return 1 if av > bv else -1
+    if at == bt:
+        return 0
+    if at == _token_suffix and _reference_get_token(at, version_a)[0] < 0:
+        return -1
+    if bt == _token_suffix and _reference_get_token(bt, version_b)[0] < 0:
+        return 1
+    return -1 if at > bt else 1
+
+
+def _generate_versions(count, seed=1947):
+    """Generate a corpus of random Alpine version strings"""
+    rand = Random(seed)
+    pieces = ['0', '00', '1', '01', '2', '10', '007', '.', '.', 'a', 'z',
+              '_alpha', '_beta', '_pre', '_rc', '_cvs', '_svn', '_git',
+              '_hg', '_p', '-r', '-r1', '.-r1', '._p', '.a']
+    versions = []
+    while len(versions) < count:
+        version = rand.choice('0129') + ''.join(
+            rand.choice(pieces) for _ in range(rand.randint(0, 8)))
+        try:
+            apk.version_key(version)
+        except errors.ApkError:
+            continue
+        versions.append(version)
+    return versions
+
+
+@pytest.mark.parametrize('version_a,version_b,exp', version_list)
+def test_compare_versions(version_a, version_b, exp):
+    """Test comparison of Alpine version strings"""
+    assert exp == apk.compare_versions(version_a, version_b)
+    assert -exp == apk.compare_versions(version_b, version_a)
+    assert exp == _reference_compare(version_a, version_b)
+
+
+def test_compare_versions_matches_reference():
+    """Compare key-based comparison to a port of apk-tools' algorithm"""
+    rand = Random(1982)
+    versions = _generate_versions(2000)
+    pairs = [(rand.choice(versions), rand.choice(versions))
+             for _ in range(4000)]
+    pairs.extend((ver, ver + suffix) for ver in versions[:500]
+                 for suffix in ('.0', '0', 'a', '_rc', '_p', '-r0', '.',
+                                '.-r0', '._rc', '.a'))
+    for ver_a, ver_b in pairs:
+        try:
+            apk.version_key(ver_b)
+        except errors.ApkError:
+            continue
+        exp = _reference_compare(ver_a, ver_b)
+        assert exp == apk.compare_versions(ver_a, ver_b), (ver_a, ver_b)
+        assert ((apk.version_key(ver_a) == apk.version_key(ver_b)) ==
+                (exp == 0)), (ver_a, ver_b)
+
+
+def test_compare_many():
+    """Test that batch comparison matches compare_versions"""
+    pairs = [(a, b) for a, b, _ in version_list] * 3
+    results = apk.compare_many(pairs)
+    assert [exp for _, _, exp in version_list] * 3 == list(results)
+    assert 'b' == results.typecode
+    assert [] == list(apk.compare_many([]))
+
+
+def test_compare_evrs():
+    """Test comparison of EVR tuples and Packages"""
+    assert 0 == apk.compare_evrs((None, '1.0', 'r0'), ('0', '1.0', 'r0'))
+    assert 1 == apk.compare_evrs((None, '1.0', 'r1'), (None, '1.0', None))
+    assert -1 == apk.compare_evrs(apk.package('musl-1.2.3-r4'),
+                                  apk.package('musl-1.2.4-r0'))
+    with pytest.raises(errors.ApkError):
+        apk.compare_evrs((None, '1.0', 'x1'), (None, '1.0', None))
+
+
+def test_version_key_sort():
+    """Test sorting versions by their keys"""
+    versions = ['1.1-r1', '1.1_rc1', '1.1', '1.1_p1', '1.1a', '0.9',
+                '1.1_alpha', '1.1.1', '1.1_rc1-r1']
+    assert ['0.9', '1.1_alpha', '1.1_rc1', '1.1_rc1-r1', '1.1', '1.1-r1',
+            '1.1_p1', '1.1a', '1.1.1'] == sorted(versions,
+                                                 key=apk.version_key)
+    assert apk.version_key('1.0-r0') == apk.version_key('1.0-r0')
+    assert 1 == len(set([apk.version_key('1.2'), apk.evr_key(
+        (None, '1.2', None))]))
+
+
+@pytest.mark.parametrize('version', [
+    '', '1.0-', '1.0-1', '1.0_foo', '1.0_rc1.2', '1a.2', '1.0-r1.1',
+    '1.0-r1_p1', '1.0A', '1.0 ', None,
+])
+def test_version_key_invalid(version):
+    with pytest.raises(errors.ApkError):
+        apk.version_key(version)
+
+
+@pytest.mark.parametrize('package_string,exp', [
+    ('musl-1.2.3-r4', ('musl', None, '1.2.3', 'r4', None)),
+    ('busybox-1.36.1-r2\n', ('busybox', None, '1.36.1', 'r2', None)),
+    ('py3-foo-bar-2.0_git20200101-r1',
+     ('py3-foo-bar', None, '2.0_git20200101', 'r1', None)),
+    ('lib2-foo-1.0', ('lib2-foo', None, '1.0', None, None)),
+    ('openssl-3-3.1.4-r5', ('openssl-3', None, '3.1.4', 'r5', None)),
+    ('musl-1.2.4-r2 x86_64 {musl} (MIT) [installed]',
+     ('musl', None, '1.2.4', 'r2', 'x86_64')),
+])
+def test_package(package_string, exp):
+    pkg = apk.package(package_string)
+    assert exp == pkg.info
+    assert package_string == pkg.package
+
+
+@pytest.mark.parametrize('package_string', [
+    'musl',
+    'musl-r4',
+    '-1.2.3-r4',
+    'musl-1.2.3-foo-r4',
+    'musl-1.2.3_foo-r4',
+    '',
+    None,
+])
+def test_package_invalid(package_string):
+    with pytest.raises(errors.ApkError):
+        apk.package(package_string)
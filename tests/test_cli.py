@@ -0,0 +1,211 @@
+"""
+Test module for version_utils.cli
+"""
+
+# Builtin imports
+import gzip
+from io import BytesIO, TextIOWrapper
+from logging import getLogger
+from os.path import abspath, dirname
+from subprocess import check_output
+import sys
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import cli
+from version_utils.version import __version__
+
+logger = getLogger(__name__)
+
+inventory = [
+    'gcc-4.4.7-17.el6.x86_64',
+    'bash-4.2-9.x86_64',
+    'gcc-4.4.7-16.el6.x86_64',
+    'bash-4.2-10.x86_64',
+    'bash-4.2-9.i686',
+]
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    """Replace standard input with the given text"""
+    def set_stdin(text):
+        monkeypatch.setattr(sys, 'stdin', TextIOWrapper(
+            BytesIO(text.encode('utf-8')), encoding='utf-8'))
+    return set_stdin
+
+
+def _run(capsys, argv):
+    status = cli.main(argv)
+    out, err = capsys.readouterr()
+    return status, out.splitlines(), err
+
+
+def test_compare_args(capsys):
+    assert _run(capsys, ['compare', 'gcc-4.4.7-17.el6.x86_64',
+                         'gcc-4.4.7-16.el6.x86_64']) == (0, ['1'], '')
+    assert _run(capsys, ['compare', '--no-arch', 'gcc-4.4.7-16.el6',
+                         'gcc-4.4.7-17.el6']) == (0, ['-1'], '')
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_compare_stdin(capsys, stdin, jobs):
+    stdin('a-1-1.x86_64 a-2-1.x86_64\n'
+          '\n'
+          'a-1-1.x86_64\ta-1-1.x86_64\n'
+          'a-1:1-1.x86_64 a-2-1.x86_64\n')
+    assert _run(capsys, ['compare', '--jobs', jobs]) == (
+        0, ['-1', '0', '1'], '')
+
+
+def test_compare_errors(capsys, stdin):
+    status, out, err = _run(capsys, ['compare', 'a-1-1.x86_64'])
+    assert status == 1
+    assert err.startswith('version_utils: error: compare takes two')
+    stdin('a-1-1.x86_64 a-2-1.x86_64 a-3-1.x86_64\n')
+    status, out, err = _run(capsys, ['compare'])
+    assert status == 1
+    assert 'Expected two package strings' in err
+    stdin('a-1-1 a-2-1\n')
+    status, out, err = _run(capsys, ['compare'])
+    assert (status, out) == (1, [])
+    assert 'architecture' in err
+
+
+def test_sort(capsys, stdin):
+    stdin('\n'.join(inventory))
+    assert _run(capsys, ['sort']) == (0, [
+        'bash-4.2-9.i686',
+        'bash-4.2-9.x86_64',
+        'bash-4.2-10.x86_64',
+        'gcc-4.4.7-16.el6.x86_64',
+        'gcc-4.4.7-17.el6.x86_64',
+    ], '')
+    stdin('\n'.join(inventory))
+    assert _run(capsys, ['sort', '-r'])[1] == [
+        'gcc-4.4.7-17.el6.x86_64',
+        'gcc-4.4.7-16.el6.x86_64',
+        'bash-4.2-10.x86_64',
+        'bash-4.2-9.x86_64',
+        'bash-4.2-9.i686',
+    ]
+
+
+def test_sort_files(capsys, tmpdir):
+    plain = tmpdir.join('plain.txt')
+    plain.write('\n'.join(inventory[:2]))
+    compressed = str(tmpdir.join('compressed.txt.gz'))
+    with gzip.open(compressed, 'wb') as compressed_file:
+        compressed_file.write('\n'.join(inventory[2:]).encode('utf-8'))
+    assert _run(capsys, ['sort', str(plain), compressed])[1] == [
+        'bash-4.2-9.i686',
+        'bash-4.2-9.x86_64',
+        'bash-4.2-10.x86_64',
+        'gcc-4.4.7-16.el6.x86_64',
+        'gcc-4.4.7-17.el6.x86_64',
+    ]
+
+
+def test_sort_temporary_directory(capsys, stdin, tmpdir):
+    stdin('\n'.join(inventory))
+    assert _run(capsys, ['sort', '-S', '1', '-T', str(tmpdir)])[1] == [
+        'bash-4.2-9.i686',
+        'bash-4.2-9.x86_64',
+        'bash-4.2-10.x86_64',
+        'gcc-4.4.7-16.el6.x86_64',
+        'gcc-4.4.7-17.el6.x86_64',
+    ]
+
+
+def test_sort_in_memory(capsys, stdin, monkeypatch):
+    """Test sorting without extsort, as on Python 3.4 and earlier"""
+    monkeypatch.setattr(sys, 'version_info', (3, 4, 10))
+    stdin('\n'.join(inventory))
+    assert _run(capsys, ['sort', '-S', '0', '-r'])[1] == [
+        'gcc-4.4.7-17.el6.x86_64',
+        'gcc-4.4.7-16.el6.x86_64',
+        'bash-4.2-10.x86_64',
+        'bash-4.2-9.x86_64',
+        'bash-4.2-9.i686',
+    ]
+
+
+def test_sort_skip_invalid(capsys, stdin):
+    stdin('bash-4.2-10.x86_64\nnot a package\nbash-4.2-9.x86_64\n')
+    status, out, err = _run(capsys, ['sort'])
+    assert (status, out) == (1, [])
+    assert err.startswith('version_utils: error:')
+    stdin('bash-4.2-10.x86_64\nnot a package\nbash-4.2-9.x86_64\n')
+    assert _run(capsys, ['sort', '--skip-invalid']) == (
+        0, ['bash-4.2-9.x86_64', 'bash-4.2-10.x86_64'], '')
+
+
+def test_newest(capsys, stdin):
+    stdin('\n'.join(inventory))
+    assert _run(capsys, ['newest']) == (0, [
+        'gcc-4.4.7-17.el6.x86_64',
+        'bash-4.2-10.x86_64',
+        'bash-4.2-9.i686',
+    ], '')
+
+
+def test_newest_no_arch(capsys, stdin):
+    stdin('gcc-4.4.7-16.el6\ngcc-1:4.4.7-1.el6\ngcc-4.4.7-17.el6\n')
+    assert _run(capsys, ['newest', '--no-arch'])[1] == ['gcc-1:4.4.7-1.el6']
+
+
+def test_diff(capsys, tmpdir):
+    old = tmpdir.join('old.txt')
+    old.write('\n'.join(inventory))
+    new = tmpdir.join('new.txt')
+    new.write('gcc-4.4.7-18.el6.x86_64\n'
+              'bash-4.2-9.x86_64\n'
+              'zsh-5.0.2-28.el7.x86_64\n')
+    status, out, err = _run(capsys, ['diff', str(old), str(new)])
+    assert (status, err) == (0, '')
+    assert sorted(out) == sorted([
+        'added\t-\tgcc-4.4.7-18.el6.x86_64',
+        'removed\tgcc-4.4.7-17.el6.x86_64\t-',
+        'removed\tgcc-4.4.7-16.el6.x86_64\t-',
+        'added\t-\tzsh-5.0.2-28.el7.x86_64',
+        'removed\tbash-4.2-10.x86_64\t-',
+        'removed\tbash-4.2-9.i686\t-',
+    ])
+    out = _run(capsys, ['diff', '--unchanged', str(old), str(new)])[1]
+    assert 'unchanged\tbash-4.2-9.x86_64\tbash-4.2-9.x86_64' in out
+
+
+def test_diff_stdin(capsys, stdin, tmpdir):
+    new = tmpdir.join('new.txt')
+    new.write('bash-4.2-11.x86_64\n')
+    stdin('bash-4.2-10.x86_64\n')
+    assert _run(capsys, ['diff', '-', str(new)]) == (
+        0, ['upgraded\tbash-4.2-10.x86_64\tbash-4.2-11.x86_64'], '')
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='submodules are imported lazily from Python 3.7')
+def test_lazy_imports():
+    """Test that the tool starts without importing comparison modules"""
+    modules = check_output([sys.executable, '-c', (
+        'import sys\n'
+        'from version_utils import cli\n'
+        'cli._parser()\n'
+        'print(" ".join(sys.modules))\n')],
+        cwd=dirname(dirname(abspath(__file__)))).decode('utf-8').split()
+    assert 'version_utils.cli' in modules
+    for name in ('apk', 'dpkg', 'rpm', '_rpmvercmp', 'common'):
+        assert 'version_utils.' + name not in modules
+
+
+def test_usage_errors(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main([])
+    assert exc_info.value.code == 2
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(['--version'])
+    assert exc_info.value.code == 0
+    out, err = capsys.readouterr()
+    assert __version__ in out + err
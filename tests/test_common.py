@@ -13,13 +13,16 @@ except ImportError:
     from mock import MagicMock, patch
 
 from logging import getLogger
+from pickle import dumps, loads
 from sys import path
+from threading import Thread
 
 logger = getLogger(__name__)
 
 
 path.append('..')
-from version_utils.common import Package
+from version_utils.common import (CacheInfo, LRUCache, Package, PoolInfo,
+                                  StringPool)
 
 
 class CommonTestCase(unittest.TestCase):
@@ -33,6 +36,118 @@ class CommonTestCase(unittest.TestCase):
         self.assertEqual("Package Object: ('test', '0', '1.0', '1', 'i386')",
                          str(new_pkg))
 
+    def test_evr_info(self):
+        pkg = Package('test', '0', '1.0', '1', 'i386')
+        self.assertEqual(('0', '1.0', '1'), pkg.evr)
+        self.assertEqual(('test', '0', '1.0', '1', 'i386'), pkg.info)
+        pkg.release = '2'
+        self.assertEqual(('0', '1.0', '2'), pkg.evr)
+        self.assertEqual(('test', '0', '1.0', '2', 'i386'), pkg.info)
+
+    def test_compact(self):
+        pkg = Package(''.join(['te', 'st']), arch=''.join(['i3', '86']))
+        self.assertFalse(hasattr(pkg, '__dict__'))
+        self.assertTrue(pkg.name is Package('test').name)
+        self.assertTrue(pkg.arch is Package('x', arch='i386').arch)
+
+    def test_pickle(self):
+        pkg = Package('test', '0', '1.0', '1', 'i386', 'test-1.0-1.i386')
+        new_pkg = loads(dumps(pkg))
+        self.assertEqual(pkg.info, new_pkg.info)
+        self.assertEqual(pkg.package, new_pkg.package)
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    """Tests for the LRUCache class"""
+
+    def test_get_set(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual(CacheInfo(1, 1, 0, 2, 1), cache.info())
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(1, cache.info().evictions)
+        self.assertEqual(2, len(cache))
+
+    def test_unhashable_key(self):
+        cache = LRUCache(2)
+        cache.set(['a'], 1)
+        self.assertEqual(None, cache.get(['a']))
+        self.assertEqual(0, len(cache))
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(CacheInfo(0, 1, 0, 2, 0), cache.info())
+
+    def test_threads(self):
+        cache = LRUCache(50)
+
+        def worker(offset):
+            for i in range(1000):
+                key = (i + offset) % 100
+                if cache.get(key) is None:
+                    cache.set(key, key)
+
+        threads = [Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.info()
+        self.assertEqual(8000, info.hits + info.misses)
+        self.assertEqual(50, info.currsize)
+
+
+class StringPoolTestCase(unittest.TestCase):
+    """Tests for the StringPool class"""
+
+    def test_intern(self):
+        pool = StringPool()
+        first = ''.join(['1.', '0'])
+        second = ''.join(['1.', '0'])
+        self.assertIsNot(first, second)
+        self.assertIs(first, pool.intern(first))
+        self.assertIs(first, pool.intern(second))
+        self.assertIsNone(pool.intern(None))
+        self.assertIn('1.0', pool)
+        self.assertEqual(1, len(pool))
+        info = pool.info()
+        self.assertEqual(PoolInfo(2, 1, 1, info.nbytes), info)
+        self.assertTrue(info.nbytes > 0)
+
+    def test_intern_package(self):
+        pool = StringPool()
+        pkg_a = Package('gcc', '0', ''.join(['4.4', '.7']), '16.el6',
+                        'x86_64', 'gcc-4.4.7-16.el6.x86_64')
+        pkg_b = Package('gcc', '0', ''.join(['4.4', '.7']), '17.el6',
+                        'x86_64', 'gcc-4.4.7-17.el6.x86_64')
+        self.assertIs(pkg_b, pool.intern_package(pkg_b))
+        pool.intern_package(pkg_a)
+        self.assertIs(pkg_a.version, pkg_b.version)
+        self.assertEqual(('gcc', '0', '4.4.7', '16.el6', 'x86_64'),
+                         pkg_a.info)
+
+    def test_clear(self):
+        pool = StringPool()
+        pool.intern('x86_64')
+        pool.clear()
+        self.assertEqual(0, len(pool))
+        self.assertEqual(PoolInfo(0, 0, 0, pool.info().nbytes), pool.info())
+
 
 if __name__ == '__main__':
     unittest.main()
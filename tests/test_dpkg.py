@@ -0,0 +1,235 @@
+"""
+Test module for version_utils.dpkg
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import dpkg
+from version_utils import errors
+
+logger = getLogger(__name__)
+
+# Version pairs and the expected result of comparing them, largely from
+# the test suite of dpkg itself
+version_list = [
+    ('1.0', '1.0', 0),
+    ('1.0', '1.0-0', 0),
+    ('1.01', '1.1', 0),
+    ('0:1.0', '1.0', 0),
+    ('1:1.0', '1.0', 1),
+    ('1:1.0', '2:0.1', -1),
+    ('10:1', '9:2', 1),
+    ('1.0', '1.1', -1),
+    ('2.30-1', '2.4-1', 1),
+    ('1.0-1', '1.0-2', -1),
+    ('1.0-1ubuntu1', '1.0-1', 1),
+    ('1.0-1', '1.0-1~bpo1', 1),
+    ('1.0~rc1', '1.0', -1),
+    ('1.0~', '1.0', -1),
+    ('1.0~~', '1.0~', -1),
+    ('1.0~~a', '1.0~~', 1),
+    ('1.0~~a', '1.0~', -1),
+    ('1.0a', '1.0', 1),
+    ('1.0a', '1.0+', -1),
+    ('1.0+', '1.0.', -1),
+    ('1.0+b1', '1.0', 1),
+    ('1.0.1', '1.0', 1),
+    ('1.0', '1.0.0', -1),
+    ('1.0a', '1.0A', 1),
+    ('2.7.4+reloaded2-13ubuntu1', '2.7.4+reloaded2-13', 1),
+    ('8.2p1-4ubuntu0.5', '8.2p1-4ubuntu0.13', -1),
+    ('1:8.2p1-4ubuntu0.5', '1:8.2p1-4ubuntu0.5', 0),
+    ('1.2.3-1-1', '1.2.3-1', 1),
+    ('0.0', '0', 1),
+    ('a', '0', 1),
+    ('~', '0', -1),
+]
+
+
+def _order(char):
+    """The weight of a character, as in dpkg's lib/dpkg/version.c"""
+    if char.isdigit():
+        return 0
+    if char.isalpha():
+        return ord(char)
+    if char == '~':
+        return -1
+    return ord(char) + 256
+
+
+def _verrevcmp(val, ref):
+    """A direct port of dpkg's verrevcmp, used as a reference"""
+    val, ref = list(val), list(ref)
+    while val or ref:
+        first_diff = 0
+        while ((val and not val[0].isdigit()) or
+               (ref and not ref[0].isdigit())):
+            vc = _order(val[0]) if val else 0
+            rc = _order(ref[0]) if ref else 0
+            if vc != rc:
+                return vc - rc
+            val, ref = val[1:], ref[1:]
+        while val and val[0] == '0':
+            val = val[1:]
+        while ref and ref[0] == '0':
+            ref = ref[1:]
+        while val and val[0].isdigit() and ref and ref[0].isdigit():
+            if not first_diff:
+                first_diff = ord(val[0]) - ord(ref[0])
+            val, ref = val[1:], ref[1:]
+        if val and val[0].isdigit():
+            return 1
+        if ref and ref[0].isdigit():
+            return -1
+        if first_diff:
+            return first_diff
+    return 0
+
+
+def _reference_compare(version_a, version_b):
+    epoch_a, upstream_a, revision_a = dpkg.parse_version(version_a)
+    epoch_b, upstream_b, revision_b = dpkg.parse_version(version_b)
+    if int(epoch_a) != int(epoch_b):
+        return 1 if int(epoch_a) > int(epoch_b) else -1
+    result = (_verrevcmp(upstream_a, upstream_b) or
+              _verrevcmp(revision_a or '', revision_b or ''))
+    return (result > 0) - (result < 0)
+
+
+def _generate_versions(count, seed=1819):
+    """Generate a corpus of random Debian version strings"""
+    rand = Random(seed)
+    pieces = ['0', '00', '1', '01', '2', '10', '007', 'a', 'b', 'Z', 'rc',
+              'ubuntu', '~', '~~', '.', '+', '-', ':']
+    versions = []
+    while len(versions) < count:
+        version = (rand.choice(['', '1:', '2:', '10:']) + rand.choice('0129') +
+                   ''.join(rand.choice(pieces)
+                           for _ in range(rand.randint(0, 8))))
+        try:
+            dpkg.parse_version(version)
+        except errors.DpkgError:
+            continue
+        versions.append(version)
+    return versions
+
+
+@pytest.mark.parametrize('version_a,version_b,exp', version_list)
+def test_compare_versions(version_a, version_b, exp):
+    """Test comparison of Debian version strings"""
+    assert exp == dpkg.compare_versions(version_a, version_b)
+    assert -exp == dpkg.compare_versions(version_b, version_a)
+    assert exp == _reference_compare(version_a, version_b)
+
+
+def test_compare_versions_matches_reference():
+    """Compare key-based comparison to a port of dpkg's algorithm"""
+    rand = Random(2021)
+    versions = _generate_versions(2000)
+    pairs = [(rand.choice(versions), rand.choice(versions))
+             for _ in range(4000)]
+    pairs.extend((ver, ver + suffix) for ver in versions[:500]
+                 for suffix in ('~', 'a', '0', '.', '-0', '-~'))
+    for ver_a, ver_b in pairs:
+        try:
+            exp = _reference_compare(ver_a, ver_b)
+        except errors.DpkgError:
+            continue
+        assert exp == dpkg.compare_versions(ver_a, ver_b), (ver_a, ver_b)
+        assert ((dpkg.version_key(ver_a) == dpkg.version_key(ver_b)) ==
+                (exp == 0)), (ver_a, ver_b)
+
+
+def test_compare_many():
+    """Test that batch comparison matches compare_versions"""
+    pairs = [(a, b) for a, b, _ in version_list] * 3
+    results = dpkg.compare_many(pairs)
+    assert [exp for _, _, exp in version_list] * 3 == list(results)
+    assert 'b' == results.typecode
+    assert [] == list(dpkg.compare_many([]))
+
+
+def test_compare_evrs():
+    """Test comparison of EVR tuples and Packages"""
+    assert 0 == dpkg.compare_evrs(('0', '1.0', None), (None, '1.0', '0'))
+    assert 1 == dpkg.compare_evrs(('1', '0.1', None), ('0', '9.9', '9'))
+    assert -1 == dpkg.compare_evrs(
+        dpkg.package('bash_5.0-6ubuntu1.1_amd64'),
+        dpkg.package('bash_5.0-6ubuntu1.2_amd64'))
+    with pytest.raises(errors.DpkgError):
+        dpkg.compare_evrs(('x', '1.0', None), ('0', '1.0', None))
+
+
+def test_version_key_sort():
+    """Test sorting versions by their keys"""
+    versions = ['1.0', '1.0~rc1', '1:0.1', '1.0-1', '1.0+b1', '0.9',
+                '1.0~rc1~git1', '1.0a']
+    assert ['0.9', '1.0~rc1~git1', '1.0~rc1', '1.0', '1.0-1', '1.0a',
+            '1.0+b1', '1:0.1'] == sorted(versions, key=dpkg.version_key)
+    keys = set([dpkg.version_key('1.01'), dpkg.version_key('1.1-0'),
+                dpkg.version_key('0:1.1')])
+    assert 1 == len(keys)
+
+
+@pytest.mark.parametrize('version,exp', [
+    ('1.0', ('0', '1.0', None)),
+    ('1:1.0', ('1', '1.0', None)),
+    ('2.7.4+reloaded2-13ubuntu1', ('0', '2.7.4+reloaded2', '13ubuntu1')),
+    ('1:2.30-1-1', ('1', '2.30-1', '1')),
+    ('1:2:3-4', ('1', '2:3', '4')),
+    (' 1.0 ', ('0', '1.0', None)),
+])
+def test_parse_version(version, exp):
+    assert exp == dpkg.parse_version(version)
+
+
+@pytest.mark.parametrize('version', [
+    '', '  ', '1 .0', ':1.0', 'a:1.0', '1:', '1.0-', '-1', None,
+])
+def test_parse_version_invalid(version):
+    with pytest.raises(errors.DpkgError):
+        dpkg.parse_version(version)
+
+
+@pytest.mark.parametrize('package_string,arch_included,exp', [
+    ('libc6_2.31-0ubuntu9.2_amd64', True,
+     ('libc6', '0', '2.31', '0ubuntu9.2', 'amd64')),
+    ('openssh-client_1%3a8.2p1-4ubuntu0.5_amd64.deb', True,
+     ('openssh-client', '1', '8.2p1', '4ubuntu0.5', 'amd64')),
+    ('tzdata_2021a-0ubuntu0.20.04_all.deb', True,
+     ('tzdata', '0', '2021a', '0ubuntu0.20.04', 'all')),
+    ('adduser_3.118ubuntu2', False,
+     ('adduser', '0', '3.118ubuntu2', None, None)),
+    ('openssh-client 1:8.2p1-4ubuntu0.5 amd64', True,
+     ('openssh-client', '1', '8.2p1', '4ubuntu0.5', 'amd64')),
+    ('libc6:i386\t2.31-0ubuntu9.2\n', True,
+     ('libc6', '0', '2.31', '0ubuntu9.2', 'i386')),
+    ('adduser\t3.118ubuntu2', False,
+     ('adduser', '0', '3.118ubuntu2', None, None)),
+])
+def test_package(package_string, arch_included, exp):
+    pkg = dpkg.package(package_string, arch_included)
+    assert exp == pkg.info
+    assert package_string == pkg.package
+
+
+@pytest.mark.parametrize('package_string,arch_included', [
+    ('libc6', True),
+    ('libc6_2.31-0ubuntu9.2', True),
+    ('libc6_2.31-0ubuntu9.2_amd64', False),
+    ('libc6 2.31 amd64 extra', True),
+    ('libc6_a:2.31_amd64', True),
+    ('_2.31_amd64', True),
+    ('libc6:_2.31', True),
+    ('', True),
+    (None, True),
+])
+def test_package_invalid(package_string, arch_included):
+    with pytest.raises(errors.DpkgError):
+        dpkg.package(package_string, arch_included)
@@ -0,0 +1,147 @@
+"""
+Test module for version_utils.extsort
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import errors, extsort, rpm
+from version_utils.common import Package
+
+logger = getLogger(__name__)
+
+
+def _inventory(count, seed=1617):
+    """Generate package strings with many repeated names and versions"""
+    rand = Random(seed)
+    names = ['bash', 'gcc', 'kernel', 'openssl', 'perl-Compress-Raw-Zlib']
+    versions = ['1.0', '1.01', '1.1', '1.0~rc1', '2.a', '10', '9.9.9']
+    strings = []
+    for _ in range(count):
+        epoch = rand.choice(['', '', '1:'])
+        strings.append('{0}-{1}{2}-{3}.el{4}.{5}'.format(
+            rand.choice(names), epoch, rand.choice(versions),
+            rand.randint(1, 12), rand.choice(['6', '7', '7_2']),
+            rand.choice(['x86_64', 'i686', 'noarch'])))
+    return strings
+
+
+def _expected(strings, reverse=False):
+    packages = [rpm.package(string) for string in strings]
+    packages.sort(key=lambda pkg: (pkg.name, rpm.evr_key(pkg), pkg.arch),
+                  reverse=reverse)
+    return [pkg.package for pkg in packages]
+
+
+@pytest.mark.parametrize('memory,fan_in', [
+    (10 ** 9, 128),  # In memory
+    (20000, 128),  # Several runs, one merge
+    (5000, 2),  # Many runs, several merge passes
+])
+def test_sort_package_strings(memory, fan_in, tmpdir):
+    strings = _inventory(3000)
+    expect = _expected(strings)
+    assert expect == list(extsort.sort_package_strings(
+        strings, memory=memory, fan_in=fan_in, tmpdir=str(tmpdir)))
+    assert [] == tmpdir.listdir()
+
+
+@pytest.mark.parametrize('memory,fan_in', [(10 ** 9, 128), (5000, 3)])
+def test_sort_packages_stable(memory, fan_in):
+    """Test that equivalent packages keep their input order"""
+    strings = _inventory(2000)
+    packages = [rpm.package(string) for string in strings]
+    result = list(extsort.sort_packages(packages, memory=memory,
+                                        fan_in=fan_in))
+    expect = sorted(packages, key=lambda pkg: (pkg.name, rpm.evr_key(pkg),
+                                               pkg.arch))
+    assert [pkg.package for pkg in expect] == [pkg.package
+                                               for pkg in result]
+    assert [pkg.info for pkg in expect] == [pkg.info for pkg in result]
+    reverse = list(extsort.sort_packages(packages, reverse=True,
+                                         memory=memory, fan_in=fan_in))
+    expect.sort(key=lambda pkg: (pkg.name, rpm.evr_key(pkg), pkg.arch),
+                reverse=True)
+    assert [pkg.package for pkg in expect] == [pkg.package
+                                               for pkg in reverse]
+
+
+def test_sort_packages_fields():
+    """Test that packages without package strings or arches are kept"""
+    packages = [Package('zsh', '0', '5.0', '1', None, None),
+                Package('zsh', '0', '4.0', '1', None, None),
+                rpm.package('bash-1:4.2-1.el7.x86_64')]
+    result = list(extsort.sort_packages(packages, memory=1))
+    assert [packages[2].info, packages[1].info, packages[0].info] == [
+        pkg.info for pkg in result]
+    assert [None, None] == [pkg.package for pkg in result[1:]]
+
+
+def test_sort_empty(tmpdir):
+    assert [] == list(extsort.sort_package_strings([]))
+    assert [] == list(extsort.sort_packages([], memory=1,
+                                            tmpdir=str(tmpdir)))
+
+
+def test_sort_package_strings_errors():
+    strings = ['bash-4.2-10.x86_64', 'not a package', 'bash-4.2-9.x86_64']
+    with pytest.raises(errors.RpmError):
+        list(extsort.sort_package_strings(strings))
+    failures = []
+    assert ['bash-4.2-9.x86_64', 'bash-4.2-10.x86_64'] == list(
+        extsort.sort_package_strings(strings, on_error=failures))
+    assert 'not a package' == failures[0][0]
+    assert ['bash-4.2-9', 'bash-4.2-10'] == list(
+        extsort.sort_package_strings(['bash-4.2-10', 'bash-4.2-9'],
+                                     arch_included=False))
+
+
+def test_sort_open_files_bounded(monkeypatch, tmpdir):
+    """Test that more runs than fan_in never open more than fan_in files"""
+    open_files = []
+    most_open = []
+
+    class TrackedFile(object):
+        def __init__(self, *args):
+            self._file = open(*args)
+            open_files.append(self)
+            most_open.append(len(open_files))
+
+        def __getattr__(self, name):
+            return getattr(self._file, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            open_files.remove(self)
+            self._file.close()
+
+    monkeypatch.setattr(extsort, 'open', TrackedFile, raising=False)
+    strings = _inventory(2000)
+    assert _expected(strings) == list(extsort.sort_package_strings(
+        strings, memory=1, fan_in=8, tmpdir=str(tmpdir)))
+    # One run was written per package
+    assert len(most_open) > 2000
+    assert 8 == max(most_open)
+    assert [] == open_files
+    assert [] == tmpdir.listdir()
+
+
+def test_sort_closed_early(tmpdir):
+    """Test that closing the generator removes its temporary files"""
+    sorter = extsort.sort_package_strings(_inventory(1000), memory=5000,
+                                          tmpdir=str(tmpdir))
+    next(sorter)
+    sorter.close()
+    assert [] == tmpdir.listdir()
+
+
+def test_sort_invalid_fan_in():
+    with pytest.raises(ValueError):
+        list(extsort.sort_packages([], fan_in=1))
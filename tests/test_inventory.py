@@ -0,0 +1,105 @@
+"""
+Test module for version_utils.inventory
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import rpm
+from version_utils.inventory import Inventory
+
+logger = getLogger(__name__)
+
+package_strs = [
+    'kernel-2.6.32-573.18.1.el6.x86_64',
+    'kernel-2.6.32-573.12.1.el6.x86_64',
+    'kernel-2.6.32-642.el6.x86_64',
+    'openssl-1.0.1e-42.el6.x86_64',
+    'openssl-1.0.1e-42.el6.i686',
+    'openssl-1:1.0.1e-15.el6.i686',
+    'gcc-4.4.7-16.el6.x86_64',
+]
+
+
+@pytest.fixture
+def inventory():
+    return Inventory(rpm.package(pkg) for pkg in package_strs)
+
+
+def _strs(packages):
+    return [pkg.package for pkg in packages]
+
+
+def test_versions(inventory):
+    """Test that versions are kept in EVR order"""
+    assert ['kernel-2.6.32-573.12.1.el6.x86_64',
+            'kernel-2.6.32-573.18.1.el6.x86_64',
+            'kernel-2.6.32-642.el6.x86_64'] == _strs(
+                inventory.versions('kernel'))
+    assert ['openssl-1.0.1e-42.el6.i686',
+            'openssl-1:1.0.1e-15.el6.i686'] == _strs(
+                inventory.versions('openssl', 'i686'))
+    assert [] == inventory.versions('bash')
+    assert ['gcc', 'kernel', 'openssl'] == inventory.names()
+    assert 7 == len(inventory)
+
+
+def test_newest(inventory):
+    """Test finding the newest version of a package"""
+    assert ('kernel-2.6.32-642.el6.x86_64' ==
+            inventory.newest('kernel').package)
+    assert ('openssl-1.0.1e-42.el6.x86_64' ==
+            inventory.newest('openssl', 'x86_64').package)
+    assert None is inventory.newest('bash')
+
+
+def test_older_newer(inventory):
+    """Test finding versions older or newer than an EVR"""
+    evr = ('0', '2.6.32', '573.18.1.el6')
+    assert (['kernel-2.6.32-573.12.1.el6.x86_64'] ==
+            _strs(inventory.older_than('kernel', evr)))
+    assert (['kernel-2.6.32-642.el6.x86_64'] ==
+            _strs(inventory.newer_than('kernel', evr)))
+    assert [] == inventory.older_than('kernel', evr, 'i686')
+
+
+def test_is_installed(inventory):
+    """Test checking whether packages and versions are installed"""
+    assert inventory.is_installed('gcc')
+    assert inventory.is_installed('gcc', ('0', '4.4.7', '16.el6'))
+    assert not inventory.is_installed('gcc', ('0', '4.4.7', '17.el6'))
+    assert not inventory.is_installed('gcc', arch='i686')
+    assert rpm.package('gcc-4.4.7-16.el6.x86_64') in inventory
+    assert rpm.package('gcc-4.4.7-16.el6.i686') not in inventory
+
+
+def test_remove(inventory):
+    """Test removing packages"""
+    inventory.remove(rpm.package('openssl-1.0.1e-42.el6.x86_64'))
+    assert (['openssl-1.0.1e-42.el6.i686', 'openssl-1:1.0.1e-15.el6.i686'] ==
+            _strs(inventory.versions('openssl')))
+    assert [] == inventory.versions('openssl', 'x86_64')
+    inventory.remove(rpm.package('gcc-4.4.7-16.el6.x86_64'))
+    assert ['kernel', 'openssl'] == inventory.names()
+    with pytest.raises(KeyError):
+        inventory.remove(rpm.package('gcc-4.4.7-16.el6.x86_64'))
+
+
+def test_incremental_order():
+    """Test that adding and removing keeps groups sorted"""
+    rand = Random(1617)
+    packages = [rpm.package('pkg-1.{0}-{1}.el7.x86_64'.format(
+        rand.randint(0, 20), rand.randint(0, 20))) for _ in range(200)]
+    inventory = Inventory()
+    for pkg in packages:
+        inventory.add(pkg)
+    for pkg in packages[::3]:
+        inventory.remove(pkg)
+    remaining = [pkg for i, pkg in enumerate(packages) if i % 3]
+    assert ([pkg.evr for pkg in sorted(remaining, key=rpm.evr_key)] ==
+            [pkg.evr for pkg in inventory.versions('pkg')])
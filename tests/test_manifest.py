@@ -0,0 +1,91 @@
+"""
+Test module for version_utils.manifest
+"""
+
+# Builtin imports
+from gzip import GzipFile
+from io import BytesIO
+from logging import getLogger
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import errors, rpm
+from version_utils.manifest import read_manifest
+
+logger = getLogger(__name__)
+
+package_strs = [
+    'gcc-4.4.7-16.el6.x86_64',
+    'ruby-1:1.8.7.374-4.el6_6.x86_64',
+    'openssl-1.0.1e-42.el6.x86_64',
+]
+
+manifest = ('# rpm -qa on host01\n\n' + '\n'.join(package_strs) +
+            '\n  \n').encode('utf-8')
+
+
+def _gzipped(data):
+    buf = BytesIO()
+    with GzipFile(fileobj=buf, mode='wb') as gz:
+        gz.write(data)
+    return buf.getvalue()
+
+
+def _infos(packages):
+    return [pkg.info for pkg in packages]
+
+
+expect = [rpm.package(pkg).info for pkg in package_strs]
+
+
+@pytest.mark.parametrize('data', [manifest, _gzipped(manifest)],
+                         ids=['plain', 'gzip'])
+def test_read_path(tmpdir, data):
+    """Test reading a manifest file by path"""
+    path = tmpdir.join('manifest.txt')
+    path.write_binary(data)
+    packages = list(read_manifest(str(path)))
+    assert expect == _infos(packages)
+    assert package_strs[0] == packages[0].package
+
+
+@pytest.mark.parametrize('data', [manifest, _gzipped(manifest)],
+                         ids=['plain', 'gzip'])
+def test_read_stream(data):
+    """Test reading a manifest from a binary stream"""
+    assert expect == _infos(read_manifest(BytesIO(data)))
+
+
+def test_read_open_file(tmpdir):
+    """Test reading a gzipped manifest from an open file"""
+    path = tmpdir.join('manifest.gz')
+    path.write_binary(_gzipped(manifest))
+    with open(str(path), 'rb') as stream:
+        assert expect == _infos(read_manifest(stream))
+
+
+def test_read_empty(tmpdir):
+    """Test reading an empty manifest file"""
+    path = tmpdir.join('manifest.txt')
+    path.write_binary(b'')
+    assert [] == list(read_manifest(str(path)))
+
+
+def test_read_no_arch():
+    """Test reading a manifest without architectures"""
+    data = '\n'.join(pkg.rsplit('.', 1)[0] for pkg in package_strs)
+    packages = read_manifest(BytesIO(data.encode('utf-8')),
+                             arch_included=False)
+    assert [info[:4] + (None,) for info in expect] == _infos(packages)
+
+
+def test_read_errors():
+    """Test handling lines that cannot be parsed"""
+    data = manifest + b'blargleblargle.aiiii\n'
+    with pytest.raises(errors.RpmError):
+        list(read_manifest(BytesIO(data)))
+    failures = []
+    assert expect == _infos(read_manifest(BytesIO(data), on_error=failures))
+    assert 'blargleblargle.aiiii' == failures[0][0]
@@ -0,0 +1,137 @@
+"""
+Test module for version_utils.ranges
+"""
+
+# Builtin imports
+from logging import getLogger
+from random import Random
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import errors, rpm
+from version_utils.ranges import Interval, RangeSet
+
+logger = getLogger(__name__)
+
+
+def evr(version, release='1', epoch='0'):
+    return epoch, version, release
+
+
+def _in_interval(point, interval):
+    """Check membership of an interval by comparing with compare_evrs"""
+    low, high, low_inclusive, high_inclusive = interval
+    if low is not None:
+        result = rpm.compare_evrs(point, low)
+        if result < 0 or (result == 0 and not low_inclusive):
+            return False
+    if high is not None:
+        result = rpm.compare_evrs(point, high)
+        if result > 0 or (result == 0 and not high_inclusive):
+            return False
+    return True
+
+
+def test_normalize():
+    """Test that overlapping, adjacent, and empty intervals merge"""
+    ranges = RangeSet([Interval(evr('2.0'), evr('3.0')),
+                       Interval(evr('1.0'), evr('2.5')),
+                       Interval(evr('3.0'), evr('4.0'), True, True),
+                       Interval(evr('5.0'), evr('5.0')),
+                       Interval(evr('6.0'), evr('6.0'), True, True)])
+    assert [Interval(evr('1.0'), evr('4.0'), True, True),
+            Interval(evr('6.0'), evr('6.0'), True, True)] == list(ranges)
+    assert 2 == len(ranges)
+    assert 0 == len(RangeSet([Interval(evr('2.0'), evr('1.0'))]))
+
+
+def test_exclusive_bounds_not_merged():
+    """Test that intervals excluding a shared bound stay separate"""
+    ranges = RangeSet([Interval(evr('1.0'), evr('2.0')),
+                       Interval(evr('2.0'), evr('3.0'), False)])
+    assert 2 == len(ranges)
+    assert evr('2.0') not in ranges
+    assert evr('1.9') in ranges and evr('2.1') in ranges
+
+
+def test_contains():
+    """Test membership, including equivalent EVRs and packages"""
+    ranges = RangeSet([(evr('1.01'), evr('2.0')), (None, evr('0.5'))])
+    assert evr('1.1') in ranges
+    assert evr('1.0') not in ranges
+    assert evr('0.1', epoch='0') in ranges
+    assert evr('1.0', epoch='1') not in ranges
+    assert rpm.package('foo-1.5-2.el7.x86_64') in ranges
+    assert rpm.package('foo-2.0-1.el7.x86_64') not in ranges
+
+
+def test_complement():
+    """Test complements, including of empty and unbounded sets"""
+    everything = ~RangeSet()
+    assert [Interval()] == list(everything)
+    assert RangeSet() == ~everything
+    ranges = RangeSet([(evr('1.0'), evr('2.0'))])
+    assert [Interval(None, evr('1.0')),
+            Interval(evr('2.0'), None)] == list(~ranges)
+    assert ranges == ~~ranges
+
+
+def test_operators():
+    """Test that operators match the named methods"""
+    range_a = RangeSet([(evr('1.0'), evr('3.0'))])
+    range_b = RangeSet([(evr('2.0'), None)])
+    assert range_a.union(range_b) == range_a | range_b
+    assert range_a.intersection(range_b) == range_a & range_b
+    assert range_a.difference(range_b) == range_a - range_b
+    assert [Interval(evr('2.0'), evr('3.0'))] == list(range_a & range_b)
+    assert [Interval(evr('1.0'), evr('2.0'))] == list(range_a - range_b)
+    assert hash(range_a | range_b) == hash(RangeSet([(evr('1.0'), None)]))
+
+
+def test_set_algebra_matches_compare_evrs():
+    """Test set operations against pairwise compare_evrs membership"""
+    rand = Random(1515)
+    versions = ['0.9', '1.0', '1.0a', '1.01', '1.1', '1.2~rc1', '1.2', '2']
+    points = [evr(version, release) for version in versions
+              for release in ('1', '2')]
+
+    def random_intervals():
+        intervals = []
+        for _ in range(rand.randint(0, 4)):
+            bounds = points + [None]
+            low, high = rand.choice(bounds), rand.choice(bounds)
+            intervals.append(Interval(low, high, rand.random() < 0.5,
+                                      rand.random() < 0.5))
+        return intervals
+
+    def contains(intervals, point):
+        return any(_in_interval(point, interval) for interval in intervals)
+
+    for _ in range(200):
+        intervals_a, intervals_b = random_intervals(), random_intervals()
+        range_a, range_b = RangeSet(intervals_a), RangeSet(intervals_b)
+        for point in points:
+            in_a = contains(intervals_a, point)
+            in_b = contains(intervals_b, point)
+            assert in_a == (point in range_a)
+            assert (in_a or in_b) == (point in range_a | range_b)
+            assert (in_a and in_b) == (point in range_a & range_b)
+            assert (in_a and not in_b) == (point in range_a - range_b)
+            assert (not in_a) == (point in ~range_a)
+
+
+def test_union_many():
+    """Test merging many sets at once"""
+    sets = [RangeSet([(evr('1.{0}'.format(minor)),
+                       evr('1.{0}'.format(minor + 1)))])
+            for minor in range(100)]
+    assert [Interval(evr('1.0'), evr('1.100'))] == list(
+        RangeSet().union(*sets))
+
+
+def test_bad_bound():
+    """Test that non-string bounds raise an error"""
+    with pytest.raises(errors.RpmError):
+        RangeSet([(evr(None), None)])
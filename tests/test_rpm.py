@@ -3,7 +3,9 @@ Test module for version_utils
 """
 
 # Builtin imports
-from logging import getLogger
+from logging import DEBUG, getLogger
+from random import Random
+from re import compile
 
 # Third party imports
 import pytest
@@ -11,9 +13,16 @@ import pytest
 # Local imports
 from version_utils import rpm
 from version_utils import errors
+from version_utils.common import StringPool
 
 logger = getLogger(__name__)
 
+# The regular expressions formerly used to parse package strings, which
+# the linear-time parser must agree with
+rpm_re = compile(r'(\S+)-(?:(\d*):)?(.*)-(~?\w+[\w.]*)')
+rpm_arch_re = compile(r'(\S+)-(?:(\d*):)?(.*)-(~?\w+[\w.]*)'
+                      r'[\s\S]*?\.([^.]*)\Z')
+
 # Version strings for testing, along with their parsed information
 version_info = [
     (
@@ -203,6 +212,17 @@ def test_package_no_arch(version_info):
     assert expect == pkg.info
 
 
+@pytest.fixture(params=['python', 'c'])
+def backend(request, monkeypatch):
+    """Run a test with each implementation of version comparison"""
+    if request.param == 'python':
+        monkeypatch.setattr(rpm, '_c_compare_evrs', None)
+        monkeypatch.setattr(rpm, '_compare_unequal', rpm._compare_versions)
+    elif rpm.backend != 'c':
+        pytest.skip('the C extension has not been built')
+    return request.param
+
+
 evr_list = [
     (('0', '1.0', '5a'), ('0', '1.0', '5a'), 0),
     (('0', '1.0', '5a'), ('1', '1.0', '5a'), -1),
@@ -212,16 +232,16 @@ evr_list = [
 
 
 @pytest.mark.parametrize('evr_a,evr_b,exp', evr_list)
-def test_evrs(evr_a, evr_b, exp, func=rpm.compare_evrs):
+def test_evrs(evr_a, evr_b, exp, backend, func=rpm.compare_evrs):
     """Test the compare_evrs function"""
     res = func(evr_a, evr_b)
     assert res == exp
 
 
 @pytest.mark.parametrize('evr_a,evr_b,exp', evr_list)
-def test_label_compare(evr_a, evr_b, exp):
+def test_label_compare(evr_a, evr_b, exp, backend):
     """Test the label_compare function"""
-    test_evrs(evr_a, evr_b, exp, func=rpm.labelCompare)
+    test_evrs(evr_a, evr_b, exp, backend, func=rpm.labelCompare)
 
 
 def test_parse_package_bad_package_no_arch():
@@ -365,6 +385,505 @@ def test_get_block_res(str_a, str_b, exp):
     ('~1.2.3', '1.2.3', -1),
     ('1.2.3.a', '1.2.3.~alpha', 1)
 ])
-def test_compare_versions(ver_a, ver_b, exp):
+def test_compare_versions(ver_a, ver_b, exp, backend):
     res = rpm.compare_versions(ver_a, ver_b)
     assert exp == res
+
+
+@pytest.mark.parametrize('test,expect', [
+    ('1.05', (['1', '05'], False)),
+    ('12a4.2', (['12', 'a', '4', '2'], False)),
+    ('~.4', (['~', '4'], False)),
+    ('1.0.', (['1', '0'], True)),
+    ('!!', ([], True)),
+    ('', ([], False))
+])
+def test_tokenize(test, expect):
+    """Test that version strings are split into segments"""
+    assert expect == rpm._tokenize(test)
+
+
+@pytest.mark.parametrize('seg_a,seg_b,exp', [
+    ('12345', '12345', 0),
+    ('12345', '1234', 1),
+    ('0012', '12', 0),
+    ('00123', '0012', 1),
+    ('1', 'a', 1),
+    ('a', '1', -1),
+    ('aawef', 'bawef', -1),
+    ('B', 'a', -1)
+])
+def test_compare_segments(seg_a, seg_b, exp):
+    """Test segment comparison"""
+    assert exp == rpm._compare_segments(seg_a, seg_b)
+
+
+@pytest.mark.parametrize('ver_a,ver_b', [(None, '1.0'), ('1.0', 1.07)])
+def test_compare_versions_bad_type(ver_a, ver_b, backend):
+    """Test that non-string versions raise an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.compare_versions(ver_a, ver_b)
+
+
+def _generate_versions(count, seed=1234):
+    """Generate a corpus of random version strings for testing"""
+    rand = Random(seed)
+    pieces = ['0', '00', '1', '01', '2', '10', '123', '007', 'a', 'b', 'Z',
+              'rc', 'el', 'beta', 'git', '~', '.', '-', '_', '+', '..']
+    return [''.join(rand.choice(pieces)
+                    for _ in range(rand.randint(0, 8)))
+            for _ in range(count)]
+
+
+def test_compare_versions_matches_legacy(backend):
+    """Compare the segment-based and list-based implementations"""
+    rand = Random(5678)
+    versions = _generate_versions(2000) + [
+        info[k] for _, info in version_info for k in ('version', 'release')
+    ]
+    pairs = [(rand.choice(versions), rand.choice(versions))
+             for _ in range(4000)]
+    pairs.extend((ver, ver + suffix) for ver in versions
+                 for suffix in ('.', '~', 'a', '0'))
+    for ver_a, ver_b in pairs:
+        for first, second in ((ver_a, ver_b), (ver_b, ver_a)):
+            assert (rpm._compare_versions_legacy(first, second) ==
+                    rpm.compare_versions(first, second)), (first, second)
+
+
+def test_version_key_matches_compare_versions():
+    """Test that version keys order like compare_versions"""
+    rand = Random(91011)
+    versions = _generate_versions(500)
+    for ver_a, ver_b in zip(versions, rand.sample(versions, len(versions))):
+        key_a, key_b = rpm.version_key(ver_a), rpm.version_key(ver_b)
+        exp = rpm.compare_versions(ver_a, ver_b)
+        assert exp == (key_a > key_b) - (key_a < key_b), (ver_a, ver_b)
+
+
+@pytest.mark.parametrize('evr_a,evr_b,exp', evr_list)
+def test_evr_key(evr_a, evr_b, exp):
+    """Test that EVR keys order like compare_evrs"""
+    key_a, key_b = rpm.evr_key(evr_a), rpm.evr_key(evr_b)
+    assert exp == (key_a > key_b) - (key_a < key_b)
+
+
+def test_evr_key_package_sort():
+    """Test sorting Package objects with evr_key"""
+    packages = [rpm.package(vs) for vs, _ in version_info
+                if vs.startswith('ruby-') or vs.startswith('openssl-')]
+    expect = sorted(packages, key=lambda pkg: rpm.evr_key(pkg.evr))
+    assert expect == sorted(packages, key=rpm.evr_key)
+    assert ['0', '0', '0', '1'] == [pkg.epoch for pkg in expect]
+    assert '1.~0.1e' == expect[0].version
+
+
+@pytest.mark.parametrize('evr_a,evr_b,exp', evr_list)
+def test_encode_evr(evr_a, evr_b, exp):
+    """Test that encoded EVRs order like compare_evrs"""
+    enc_a, enc_b = rpm.encode_evr(evr_a), rpm.encode_evr(evr_b)
+    assert exp == (enc_a > enc_b) - (enc_a < enc_b)
+
+
+def test_encode_evr_matches_compare_evrs():
+    """Test encoding and decoding random EVRs against compare_evrs"""
+    rand = Random(1415)
+    versions = _generate_versions(400) + [
+        '1.0~rc1', '1.0', '1.0.', '1.0a', '1.0.0', '01.00', '1' * 300,
+        '2' * 254, '2' * 255, '', '.', '~', '~~', '1.~', '-']
+    epochs = ['0', '1', '9', '10', '']
+    evrs = [(rand.choice(epochs), rand.choice(versions),
+             rand.choice(versions)) for _ in range(1000)]
+    evrs += [(evr[0], evr[1], evr[1]) for evr in evrs[:100]]
+    encoded = [rpm.encode_evr(evr) for evr in evrs]
+    for index, evr in enumerate(evrs):
+        decoded = rpm.decode_evr(encoded[index])
+        assert 0 == rpm.compare_evrs(evr, decoded), (evr, decoded)
+        assert encoded[index] == rpm.encode_evr(decoded), evr
+        other = rand.randrange(len(evrs))
+        exp = rpm.compare_evrs(evr, evrs[other])
+        enc_a, enc_b = encoded[index], encoded[other]
+        assert exp == (enc_a > enc_b) - (enc_a < enc_b), (evr, evrs[other])
+    expect = sorted(evrs, key=rpm.evr_key)
+    assert ([rpm.evr_key(evr) for evr in expect] ==
+            [rpm.evr_key(evr) for evr in sorted(evrs, key=rpm.encode_evr)])
+
+
+def test_encode_evr_package():
+    """Test encoding the EVR of a Package"""
+    pkg = rpm.package('openssl-1:1.0.1e-42.el6.x86_64')
+    assert rpm.encode_evr(pkg) == rpm.encode_evr(('1', '1.0.1e', '42.el6'))
+    assert ('1', '1.0.1.e', '42.el.6') == rpm.decode_evr(
+        rpm.encode_evr(pkg))
+
+
+@pytest.mark.parametrize('evr', [
+    (None, '1.0', '1'), (0, '1.0', '1'), ('0\x00', '1.0', '1'),
+    ('0', None, '1'), ('0', '1.0', 1),
+])
+def test_encode_evr_invalid(evr):
+    """Test that EVRs that cannot be encoded raise an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.encode_evr(evr)
+
+
+@pytest.mark.parametrize('data', [
+    b'', b'0', b'0\x00', b'0\x00\x00', b'0\x00\x04\x02' + b'1',
+    b'0\x00\x04\xff\x00', b'0\x00\x03ab', b'0\x00\x07\x00\x00',
+    b'0\x00\x00\x00\x00', b'\xff\x00\x00\x00',
+])
+def test_decode_evr_invalid(data):
+    """Test that data that is not an encoded EVR raises an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.decode_evr(data)
+
+
+def test_version_key_hashable():
+    """Test that equivalent versions have equal, hashable keys"""
+    keys = set([rpm.version_key('1.01'), rpm.version_key('1.1'),
+                rpm.version_key('1_1')])
+    assert 1 == len(keys)
+
+
+def test_version_key_bad_type():
+    """Test that non-string versions raise an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.version_key(None)
+
+
+@pytest.mark.parametrize('expression,name,operator,evr', [
+    ('openssl >= 1:1.0.2k-19.el7', 'openssl', '>=',
+     ('1', '1.0.2k', '19.el7')),
+    ('openssl>=1.0.2k', 'openssl', '>=', ('0', '1.0.2k', None)),
+    ('  gcc == 4.4.7-17.el6 ', 'gcc', '==', ('0', '4.4.7', '17.el6')),
+    ('python-six', 'python-six', None, None),
+])
+def test_constraint_parse(expression, name, operator, evr):
+    """Test parsing constraint expressions"""
+    constraint = rpm.constraint(expression)
+    assert (name, operator, evr) == (constraint.name, constraint.operator,
+                                     constraint.evr)
+
+
+@pytest.mark.parametrize('bad', ['', 'openssl >=', 'openssl => 1.0',
+                                 'openssl > a:1.0', 'openssl > 1.0-',
+                                 'openssl > 1.0 2.0'])
+def test_constraint_parse_errors(bad):
+    """Test that malformed constraint expressions raise an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.constraint(bad)
+
+
+@pytest.mark.parametrize('expression,exp', [
+    ('openssl >= 1:1.0.1e-42.el6', True),
+    ('openssl > 1:1.0.1e-42.el6', False),
+    ('openssl = 1:1.0.1e', True),
+    ('openssl < 1:1.0.1f', True),
+    ('openssl <= 1.0.2', False),
+    ('openssl > 1.0.2', True),
+    ('openssl', True),
+    ('gcc', False),
+])
+def test_constraint_matches(expression, exp):
+    """Test evaluating constraints, omitting the release and epoch"""
+    pkg = rpm.package('openssl-1:1.0.1e-42.el6.x86_64')
+    assert exp == rpm.constraint(expression).matches(pkg)
+
+
+def test_constraint_matches_compare_evrs():
+    """Test that constraints agree with labelCompare"""
+    rand = Random(2024)
+    evrs = [(rand.choice('01'), rand.choice(['1.0', '1.0a', '1.01', '1.1']),
+             rand.choice(['1', '1.el7', '2~rc1', '10']))
+            for _ in range(50)]
+    ops = {'<': [-1], '<=': [-1, 0], '=': [0], '>=': [0, 1], '>': [1]}
+    for operator, results in ops.items():
+        for evr in evrs[:10]:
+            constraint = rpm.Constraint('pkg', operator, evr)
+            for other in evrs:
+                exp = rpm.labelCompare(other, evr) in results
+                assert exp == constraint.matches_evr(other)
+
+
+def test_constraint_filter():
+    """Test filtering packages by a constraint"""
+    packages = [rpm.package(vs) for vs, _ in version_info]
+    constraint = rpm.constraint('openssl < 1:1.0.1e-42.el6')
+    expect = [pkg for pkg in packages if constraint.matches(pkg)]
+    assert expect == list(constraint.filter(packages))
+    assert expect and all(pkg.name == 'openssl' for pkg in expect)
+    assert 'openssl < 1:1.0.1e-42.el6' == str(constraint)
+
+
+def test_constraint_bad_operator():
+    """Test that unsupported operators raise an error"""
+    with pytest.raises(errors.RpmError):
+        rpm.Constraint('openssl', '!=', ('0', '1.0', '1'))
+    with pytest.raises(errors.RpmError):
+        rpm.Constraint('openssl', '>=')
+
+
+def test_set_tracing(caplog):
+    """Test that debug logging only happens when tracing is enabled"""
+    caplog.set_level(DEBUG, logger='version_utils.rpm')
+    rpm.compare_versions('1.0', '1.1')
+    assert [] == caplog.records
+    rpm.set_tracing()
+    try:
+        rpm.compare_versions('1.0', '1.1')
+    finally:
+        rpm.set_tracing(False)
+    assert 'compare_versions(1.0, 1.1)' == caplog.records[0].getMessage()
+
+
+@pytest.fixture
+def rpm_cache():
+    """Enable small parse and comparison caches for a test"""
+    rpm.configure_cache(parse_size=2, compare_size=2)
+    yield
+    rpm.configure_cache()
+
+
+def test_parse_cache(rpm_cache):
+    """Test that parse results are cached without being shared"""
+    vs, info = version_info[0]
+    first = rpm.parse_package(vs)
+    first['name'] = 'changed'
+    second = rpm.parse_package(vs)
+    assert info['name'] == second['name']
+    assert (1, 1) == rpm.cache_info()['parse'][:2]
+    assert info['arch'] == rpm.package(vs).arch
+    assert None is rpm.package(vs, arch_included=False).arch
+
+
+def test_parse_cache_errors(rpm_cache):
+    """Test that parse errors are raised every time"""
+    for _ in range(2):
+        with pytest.raises(errors.RpmError):
+            rpm.parse_package('blargleblargle.aiiii')
+    assert 0 == rpm.cache_info()['parse'].currsize
+
+
+def test_compare_cache(rpm_cache):
+    """Test caching, eviction, and clearing of comparisons"""
+    for ver_a, ver_b in [('1.0', '1.1'), ('1.1', '1.0'), ('1.0', '1.1'),
+                         ('1.2', '1.0')]:
+        res = rpm.compare_versions(ver_a, ver_b)
+        assert rpm._compare_versions(ver_a, ver_b) == res
+    assert (1, 3, 1, 2, 2) == rpm.cache_info()['compare']
+    rpm.clear_cache()
+    assert (0, 0, 0, 2, 0) == rpm.cache_info()['compare']
+
+
+def test_cache_disabled():
+    """Test that caching is disabled by default"""
+    assert {'parse': None, 'compare': None} == rpm.cache_info()
+
+
+def test_split_package_matches_pop_arch():
+    """Compare the linear-time parser to _pop_arch and the old regex"""
+    rand = Random(1213)
+    chars = 'ab1-.:~_ 9'
+    for _ in range(5000):
+        vs = ''.join(rand.choice(chars) for _ in range(rand.randint(1, 14)))
+        try:
+            char_list = list(vs)
+            arch = rpm._pop_arch(char_list)
+            match = rpm_re.match(''.join(char_list))
+            expect = match and (match.group(1), match.group(2) or '0',
+                                match.group(3), match.group(4), arch)
+        except errors.RpmError:
+            expect = None
+        try:
+            res = rpm._split_package(vs)
+        except errors.RpmError:
+            res = None
+        assert expect == res, vs
+
+
+@pytest.mark.parametrize('arch_included', [True, False])
+def test_split_package_matches_regex(arch_included):
+    """Compare the linear-time parser to the old regex on odd strings"""
+    regex = rpm_arch_re if arch_included else rpm_re
+    rand = Random(2124)
+    chars = 'a1-.:~_ \n+9'
+    strings = [vs for vs, _ in version_info]
+    strings += [''.join(rand.choice(chars)
+                        for _ in range(rand.randint(0, 20)))
+                for _ in range(20000)]
+    for vs in strings:
+        match = regex.match(vs)
+        try:
+            res = rpm._split_package(vs, arch_included)
+        except errors.RpmError:
+            res = None
+        if match is None:
+            assert res is None, repr(vs)
+        else:
+            name, epoch, version, release = match.groups()[:4]
+            arch = match.group(5) if arch_included else None
+            assert (name, epoch or '0', version, release, arch) == res, \
+                repr(vs)
+
+
+@pytest.mark.parametrize('package_string', [
+    '', '-', '--', 'a-b', '.x86_64', ' a-1-1.x86_64', 'a-1-+.x86_64',
+])
+def test_split_package_invalid(package_string):
+    """Test that malformed strings raise RpmError"""
+    with pytest.raises(errors.RpmError):
+        rpm._split_package(package_string)
+
+
+def test_parse_many():
+    """Test parsing package strings in bulk"""
+    lines = [vs + '\n' for vs, _ in version_info] + ['\n']
+    pkgs = list(rpm.parse_many(lines))
+    assert [rpm.package(vs).info for vs, _ in version_info] == [
+        pkg.info for pkg in pkgs]
+    assert version_info[0][0] == pkgs[0].package
+
+
+def test_parse_many_no_arch():
+    """Test parsing package strings without architectures in bulk"""
+    pkgs = rpm.parse_many([vs for vs, _ in version_info_no_arch],
+                          arch_included=False)
+    assert [rpm.package(vs, arch_included=False).info
+            for vs, _ in version_info_no_arch] == [pkg.info for pkg in pkgs]
+
+
+@pytest.mark.parametrize('bad', ['what_even_is_this_thing',
+                                 'blargleblargle.aiiii'])
+def test_parse_many_errors(bad):
+    """Test each way of handling unparseable strings"""
+    lines = [version_info[0][0], bad, version_info[1][0]]
+    with pytest.raises(errors.RpmError):
+        list(rpm.parse_many(lines))
+    assert 2 == len(list(rpm.parse_many(lines, on_error='skip')))
+    failures = []
+    assert 2 == len(list(rpm.parse_many(lines, on_error=failures)))
+    assert bad == failures[0][0]
+    assert isinstance(failures[0][1], errors.RpmError)
+
+
+def test_parse_many_invalid_on_error():
+    """Test that an invalid on_error raises before any string is parsed"""
+    with pytest.raises(ValueError):
+        rpm.parse_many(iter(()), on_error='ignore')
+
+
+def test_parse_many_pool():
+    """Test that packages parsed with a pool share equal fields"""
+    pool = StringPool()
+    strings = ['gcc-4.4.7-16.el6.x86_64', 'gcc-4.4.7-17.el6.x86_64']
+    pkg_a, pkg_b = rpm.parse_many(strings, pool=pool)
+    pkg_c = rpm.package('gcc-4.4.7-16.el6.x86_64', pool=pool)
+    assert pkg_a.version is pkg_b.version is pkg_c.version
+    assert pkg_a.release is pkg_c.release
+    assert pkg_a.info == rpm.package(strings[0]).info
+    assert 6 == len(pool)
+
+
+def test_parse_many_bad_on_error():
+    """Test that an invalid on_error value is rejected"""
+    with pytest.raises(ValueError):
+        list(rpm.parse_many([], on_error='ignore'))
+
+
+def _package_pairs():
+    """Get every ordered pair of package strings in version_info"""
+    return [(vs_a, vs_b) for vs_a, _ in version_info
+            for vs_b, _ in version_info]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_compare_many(workers):
+    """Test comparing many pairs, in and out of process"""
+    pairs = _package_pairs()
+    expect = [rpm.compare_packages(a, b) for a, b in pairs]
+    res = rpm.compare_many(iter(pairs), workers=workers, chunksize=7)
+    assert expect == res.tolist()
+
+
+def test_compare_many_no_arch():
+    """Test comparing many pairs without architectures"""
+    pairs = [(a, b) for a, _ in version_info_no_arch
+             for b, _ in version_info_no_arch]
+    expect = [rpm.compare_packages(a, b, False) for a, b in pairs]
+    assert expect == list(rpm.compare_many(pairs, arch_provided=False))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_compare_many_error(workers):
+    """Test that parse errors are raised from worker processes"""
+    pairs = _package_pairs() + [('blargleblargle.aiiii', 'nmap-6.40-1.i386')]
+    with pytest.raises(errors.RpmError):
+        rpm.compare_many(pairs, workers=workers, chunksize=10)
+
+
+def _changes(old, new):
+    return [(change.change,
+             change.old.package if change.old is not None else None,
+             change.new.package if change.new is not None else None)
+            for change in rpm.diff_inventories(old, new)]
+
+
+def test_diff_inventories():
+    """Test classifying the changes between two inventories"""
+    old = ['gcc-4.4.7-16.el6.x86_64\n', 'nmap-6.40-1.i386',
+           'bash-4.2-1.x86_64', 'openssl-1:1.0.1e-42.el6.x86_64',
+           'openssl-1:1.0.1e-42.el6.i686', '']
+    new = ['bash-4.2-01.x86_64', rpm.package('gcc-4.4.7-17.el6.x86_64'),
+           'openssl-1:1.0.1e-30.el6.x86_64', 'zsh-5.0-1.x86_64']
+    assert [('unchanged', 'bash-4.2-1.x86_64', 'bash-4.2-01.x86_64'),
+            ('upgraded', 'gcc-4.4.7-16.el6.x86_64',
+             'gcc-4.4.7-17.el6.x86_64'),
+            ('downgraded', 'openssl-1:1.0.1e-42.el6.x86_64',
+             'openssl-1:1.0.1e-30.el6.x86_64'),
+            ('added', None, 'zsh-5.0-1.x86_64'),
+            ('removed', 'nmap-6.40-1.i386', None),
+            ('removed', 'openssl-1:1.0.1e-42.el6.i686', None)] == _changes(
+                old, new)
+
+
+def test_diff_inventories_multiple_versions():
+    """Test diffing packages with several versions installed"""
+    old = ['kernel-3.10.0-1.el7.x86_64', 'kernel-3.10.0-2.el7.x86_64']
+    assert [('unchanged', old[1], old[1]),
+            ('upgraded', old[0], 'kernel-3.10.0-3.el7.x86_64')] == _changes(
+                old, [old[1], 'kernel-3.10.0-3.el7.x86_64'])
+    new = ['kernel-3.10.0-2.el7.x86_64', 'kernel-3.10.0-3.el7.x86_64',
+           'kernel-3.10.0-4.el7.x86_64']
+    assert [('unchanged', old[1], new[0]), ('added', None, new[1]),
+            ('added', None, new[2]), ('removed', old[0], None)] == _changes(
+                old, new)
+
+
+def test_diff_inventories_no_arch():
+    """Test diffing package strings without architectures"""
+    changes = list(rpm.diff_inventories(['gcc-4.4.7-16.el6'],
+                                        ['gcc-4.4.7-17.el6'],
+                                        arch_included=False))
+    assert ['upgraded'] == [change.change for change in changes]
+
+
+def test_backends_agree(monkeypatch):
+    """Test that the C and Python comparisons agree"""
+    if rpm.backend != 'c':
+        pytest.skip('the C extension has not been built')
+    rand = Random(1415)
+    versions = _generate_versions(1000) + ['1.\xe9', '\u0661.2', '1_\u4e00']
+    evr_pairs = []
+    for _ in range(20000):
+        ver_a, ver_b = rand.choice(versions), rand.choice(versions)
+        evr_pairs.append(((rand.choice('012'), ver_a, ver_b),
+                          (rand.choice('012'), ver_b, ver_a)))
+    c_results = [(rpm.compare_versions(evr_a[1], evr_b[1]),
+                  rpm.compare_evrs(evr_a, evr_b))
+                 for evr_a, evr_b in evr_pairs]
+    monkeypatch.setattr(rpm, '_c_compare_evrs', None)
+    monkeypatch.setattr(rpm, '_compare_unequal', rpm._compare_versions)
+    py_results = [(rpm.compare_versions(evr_a[1], evr_b[1]),
+                   rpm.compare_evrs(evr_a, evr_b))
+                  for evr_a, evr_b in evr_pairs]
+    assert c_results == py_results
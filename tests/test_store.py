@@ -0,0 +1,169 @@
+"""
+Test module for version_utils.store
+"""
+
+# Builtin imports
+from logging import getLogger
+from os.path import join
+from struct import pack, unpack_from
+
+# Third party imports
+import pytest
+
+# Local imports
+from version_utils import errors, rpm, store
+from version_utils.common import Package
+
+logger = getLogger(__name__)
+
+package_strings = [
+    'gcc-4.4.7-17.el6.x86_64',
+    'openssl-1:1.0.1e-42.el6.x86_64',
+    'openssl-0:1.0.1e-42.el6.i686',
+    'gcc-4.4.7-16.el6.x86_64',
+    'gcc-4.4.07-16.el6.x86_64',
+    'python-pyinvision-0.2.9-1.noarch',
+]
+
+
+def _fields(packages):
+    return [pkg.info + (pkg.package,) for pkg in packages]
+
+
+@pytest.fixture
+def packages():
+    pkgs = [rpm.package(string) for string in package_strings]
+    # Package strings that cannot be derived from the other fields
+    pkgs.append(Package('bash', '0', '4.2.46', '34.el7', 'x86_64',
+                        'bash 4.2.46'))
+    pkgs.append(Package('kernel', '0', '3.10.0', '1.el7', None, None))
+    pkgs.append(rpm.package('zsh-5.0.2-28.el7', arch_included=False))
+    return pkgs
+
+
+def test_round_trip(packages):
+    """Test that packages round-trip without losing information"""
+    stored = store.loads(store.dumps(packages))
+    assert len(packages) == len(stored)
+    assert _fields(packages) == _fields(stored)
+    assert _fields(packages[::-1]) == _fields(stored[index] for index in
+                                              range(-1, -len(stored) - 1, -1))
+    with pytest.raises(IndexError):
+        stored[len(packages)]
+
+
+def test_strings_stored_once(packages):
+    """Test that repeated and derivable strings are not stored again"""
+    data = store.dumps(packages * 100)
+    assert 1 == data.count(b'openssl')
+    assert b'gcc-4.4.7-17.el6.x86_64' not in data
+    assert 1 == data.count(b'bash 4.2.46')
+
+
+def test_ranks(packages):
+    """Test that EVR ranks order packages like compare_evrs"""
+    stored = store.loads(store.dumps(packages))
+    ranks = stored.ranks()
+    assert [stored.rank(index) for index in range(len(stored))] == list(
+        ranks)
+    for index_a, pkg_a in enumerate(packages):
+        for index_b, pkg_b in enumerate(packages):
+            rank_a, rank_b = ranks[index_a], ranks[index_b]
+            assert rpm.compare_evrs(pkg_a.evr, pkg_b.evr) == (
+                (rank_a > rank_b) - (rank_a < rank_b))
+    ranks.release()
+
+
+def test_ranks_none_fields():
+    """Test that EVRs with fields of None are stored and ranked"""
+    packages = [Package('a', '0', '1.0', '1'),
+                Package('b', None, '1.0', '1'),
+                Package('c', None, '0.9', '1'),
+                Package('d'),
+                Package('e', '0', '2.0', None),
+                Package('f', '0', None, '1'),
+                Package('g', None, None, None)]
+    stored = store.loads(store.dumps(packages))
+    assert _fields(packages) == _fields(stored)
+    assert [4, 4, 3, 0, 2, 1, 0] == list(stored.ranks())
+
+
+def test_dump_load(packages, tmpdir):
+    """Test writing packages to a file and memory-mapping it"""
+    path = join(str(tmpdir), 'packages.vupk')
+    with open(path, 'wb') as store_file:
+        store.dump(packages, store_file)
+    with store.load(path) as stored:
+        assert _fields(packages) == _fields(stored)
+
+
+def test_empty():
+    """Test storing no packages"""
+    assert [] == list(store.loads(store.dumps([])))
+
+
+@pytest.mark.parametrize('data', [b'', b'VUPK', b'NOPE' + b'\0' * 12,
+                                  b'VUPK\x02' + b'\0' * 11])
+def test_bad_data(data):
+    """Test that data not in the binary format raises an error"""
+    with pytest.raises(errors.StoreError):
+        store.loads(data)
+
+
+def test_truncated(packages):
+    """Test that truncated data raises an error"""
+    with pytest.raises(errors.StoreError):
+        store.loads(store.dumps(packages)[:-4])
+
+
+@pytest.mark.parametrize('length', [17, 20, 23, 24, 40])
+def test_truncated_string_table(packages, length):
+    """Test that data truncated within the string table raises an error"""
+    with pytest.raises(errors.StoreError):
+        store.loads(store.dumps(packages)[:length])
+
+
+def test_corrupt_offsets(packages):
+    """Test that string offsets out of order raise an error"""
+    data = bytearray(store.dumps(packages))
+    data[20:24] = pack(str('<I'), 1000)
+    with pytest.raises(errors.StoreError):
+        store.loads(bytes(data))
+    data[16:20] = pack(str('<I'), 1)
+    with pytest.raises(errors.StoreError):
+        store.loads(bytes(data))
+
+
+def test_corrupt_string_index(packages):
+    """Test that records with out of range string indices raise an error"""
+    data = bytearray(store.dumps(packages))
+    string_count = unpack_from(str('<I'), data, 12)[0]
+    record_start = len(data) - 28 * len(packages)
+    data[record_start:record_start + 4] = pack(str('<I'), string_count)
+    stored = store.loads(bytes(data))
+    assert _fields(packages[1:2]) == _fields([stored[1]])
+    with pytest.raises(errors.StoreError):
+        stored[0]
+    with pytest.raises(errors.StoreError):
+        list(stored)
+
+
+def test_corrupt_string_data(packages):
+    """Test that strings that are not valid UTF-8 raise an error"""
+    data = bytearray(store.dumps(packages))
+    start = data.index(b'gcc')
+    data[start:start + 3] = b'\xff\xff\xff'
+    stored = store.loads(bytes(data))
+    assert _fields(packages[1:3]) == _fields([stored[1], stored[2]])
+    with pytest.raises(errors.StoreError):
+        stored[0]
+    with pytest.raises(errors.StoreError):
+        list(stored)
+
+
+def test_empty_file(tmpdir):
+    """Test that empty files raise an error"""
+    path = join(str(tmpdir), 'empty.vupk')
+    open(path, 'wb').close()
+    with pytest.raises(errors.StoreError):
+        store.load(path)
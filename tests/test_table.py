@@ -0,0 +1,88 @@
+"""
+Test module for version_utils.table
+"""
+
+# Builtin imports
+from logging import getLogger
+
+# Third party imports
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+# Local imports
+from version_utils import rpm  # noqa: E402
+from version_utils.table import PackageTable  # noqa: E402
+
+logger = getLogger(__name__)
+
+package_strs = [
+    'openssl-1.0.1e-42.el6.x86_64',
+    'openssl-1.0.1e-48.el6.x86_64',
+    'openssl-1:1.0.1e-15.el6.x86_64',
+    'openssl-1.0.1e-42.el6.i686',
+    'gcc-4.4.7-16.el6.x86_64',
+    'gcc-4.4.7-17.el6.x86_64',
+    'nmap-6.40-1.i386',
+]
+
+
+@pytest.fixture
+def table():
+    return PackageTable(rpm.package(pkg) for pkg in package_strs)
+
+
+def _expected(evr, result, name=None):
+    """Get the package strings comparing to ``evr`` with ``result``"""
+    return [pkg for pkg in package_strs
+            if (name is None or rpm.package(pkg).name == name) and
+            rpm.compare_evrs(rpm.package(pkg).evr, evr) == result]
+
+
+def _selected(table, mask):
+    return [pkg.package for pkg in table.packages(mask)]
+
+
+@pytest.mark.parametrize('evr', [
+    ('0', '1.0.1e', '42.el6'),
+    ('0', '1.0.1e', '45'),
+    ('0', '4.4.7', '16.el6'),
+    ('1', '0', '0'),
+    ('0', '0', '0'),
+])
+def test_filters(table, evr):
+    """Test that filters agree with compare_evrs"""
+    assert _expected(evr, 1) == _selected(table, table.newer_than(evr))
+    assert _expected(evr, 0) == _selected(table, table.equal_to(evr))
+    assert _expected(evr, -1) == _selected(table, table.older_than(evr))
+
+
+def test_filter_by_name(table):
+    """Test restricting a filter to a package name"""
+    evr = ('0', '1.0.1e', '42.el6')
+    mask = table.older_than(evr, name='gcc')
+    assert _expected(evr, -1, 'gcc') == _selected(table, mask)
+    assert 0 == table.named('bash').sum()
+
+
+def test_ranks(table):
+    """Test that equal EVRs share a rank and ranks follow EVR order"""
+    assert table.rank[0] == table.rank[3]
+    assert table.rank[1] > table.rank[0]
+    assert table.rank[2] == table.rank.max()
+
+
+def test_dictionary_encoding(table):
+    """Test that columns store each distinct value once"""
+    assert ['openssl', 'gcc', 'nmap'] == table.values('name')
+    assert [0, 0, 0, 0, 1, 1, 2] == table.column('name').tolist()
+    assert ['x86_64', 'i686', 'i386'] == table.values('arch')
+
+
+def test_from_parse_package():
+    """Test building a table from parse_package dictionaries"""
+    table = PackageTable(rpm.parse_package(pkg) for pkg in package_strs)
+    assert 7 == len(table)
+    assert ([rpm.package(pkg).info for pkg in package_strs] ==
+            [pkg.info for pkg in table.packages()])
+    assert None is next(table.packages()).package
@@ -1,19 +1,54 @@
 """
 The version_utils package currently contains the following modules:
 
+* ``advisory`` - matching installed packages against fixed-in versions
+* ``aio`` - asyncio versions of bulk parsing and comparison (requires
+  Python 3.6+, and is not imported by default)
+* ``apk`` - apk version comparison and package parsing functionality
+* ``cli`` - the ``version_utils`` command-line tool (not imported by
+  default)
 * ``common`` - common functionality, classes, etc.
+* ``dpkg`` - dpkg version comparison and package parsing functionality
 * ``errors`` - exceptions
+* ``extsort`` - external merge sorting of package lists larger than
+  memory (requires Python 3.5+, and is not imported by default)
+* ``inventory`` - indexes of installed packages for version queries
+* ``manifest`` - reading package manifests, such as ``rpm -qa`` output
+* ``ranges`` - sets of version ranges with union, intersection, etc.
 * ``rpm`` - rpm version comparison and package comparison functionality
+* ``store`` - a compact binary format for sets of parsed packages
+  (requires Python 3.4+, and is not imported by default)
+* ``table`` - columnar package tables for vectorized version filtering
+  (requires NumPy, and is not imported by default)
 
 """
 
 # Standard library imports
 from __future__ import absolute_import, division, print_function
+from importlib import import_module
 import logging
+import sys
 
-from version_utils import common, errors, rpm
 from version_utils.version import __version__, __version_info__
 
+# Submodules available as attributes of the package without importing
+# them first
+_submodules = ('apk', 'common', 'dpkg', 'errors', 'rpm')
+
+if sys.version_info >= (3, 7):
+    # Import submodules when they are first used, so that importing one
+    # module, such as the command-line tool, does not import them all
+    def __getattr__(name):
+        if name in _submodules:
+            return import_module('{0}.{1}'.format(__name__, name))
+        raise AttributeError('module {0!r} has no attribute '
+                             '{1!r}'.format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_submodules))
+else:
+    from version_utils import apk, common, dpkg, errors, rpm  # noqa: F401
+
 try:  # Python 2.7+
     from logging import NullHandler
 except ImportError:
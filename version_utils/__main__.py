@@ -0,0 +1,15 @@
+"""
+__main__.py module for version_utils
+
+Runs the command-line tool with ``python -m version_utils``.
+"""
+
+# Standard library imports
+from __future__ import absolute_import, division, print_function
+import sys
+
+# version_utils imports
+from version_utils.cli import main
+
+
+sys.exit(main())
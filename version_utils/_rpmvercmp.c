@@ -0,0 +1,287 @@
+/*
+ * _rpmvercmp.c module for version_utils
+ *
+ * Optional compiled implementations of rpm.compare_versions and
+ * rpm.compare_evrs. The comparison rules are exactly those of the pure
+ * Python segment comparison in rpm.py, which is used whenever this
+ * extension has not been built.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+static PyObject *RpmError = NULL;
+
+#define IS_DIGIT(c) ((c) >= '0' && (c) <= '9')
+#define IS_ALPHA(c) (((c) >= 'a' && (c) <= 'z') || ((c) >= 'A' && (c) <= 'Z'))
+#define IS_SEGMENT(c) (IS_DIGIT(c) || IS_ALPHA(c) || (c) == '~')
+
+typedef struct {
+    int kind;
+    const void *data;
+    Py_ssize_t length;
+} version_str;
+
+/* Skip separator characters, returning the start of the next segment */
+static Py_ssize_t
+skip_separators(const version_str *ver, Py_ssize_t pos)
+{
+    while (pos < ver->length &&
+           !IS_SEGMENT(PyUnicode_READ(ver->kind, ver->data, pos))) {
+        pos++;
+    }
+    return pos;
+}
+
+/* Find the end of the digit or letter segment starting at pos */
+static Py_ssize_t
+segment_end(const version_str *ver, Py_ssize_t pos, int digits)
+{
+    Py_UCS4 c;
+    while (pos < ver->length) {
+        c = PyUnicode_READ(ver->kind, ver->data, pos);
+        if (digits ? !IS_DIGIT(c) : !IS_ALPHA(c)) {
+            break;
+        }
+        pos++;
+    }
+    return pos;
+}
+
+/* Compare two segments of the same type, as in rpm._compare_segments */
+static int
+compare_segments(const version_str *a, Py_ssize_t start_a, Py_ssize_t end_a,
+                 const version_str *b, Py_ssize_t start_b, Py_ssize_t end_b,
+                 int digits)
+{
+    Py_UCS4 c_a, c_b;
+    if (digits) {
+        while (start_a < end_a &&
+               PyUnicode_READ(a->kind, a->data, start_a) == '0') {
+            start_a++;
+        }
+        while (start_b < end_b &&
+               PyUnicode_READ(b->kind, b->data, start_b) == '0') {
+            start_b++;
+        }
+        if (end_a - start_a != end_b - start_b) {
+            return end_a - start_a > end_b - start_b ? 1 : -1;
+        }
+    }
+    while (start_a < end_a && start_b < end_b) {
+        c_a = PyUnicode_READ(a->kind, a->data, start_a++);
+        c_b = PyUnicode_READ(b->kind, b->data, start_b++);
+        if (c_a != c_b) {
+            return c_a > c_b ? 1 : -1;
+        }
+    }
+    if (start_a < end_a) {
+        return 1;
+    }
+    return start_b < end_b ? -1 : 0;
+}
+
+/* Compare two version strings that are known not to be equal */
+static int
+compare_unequal(const version_str *a, const version_str *b)
+{
+    Py_ssize_t pos_a = 0, pos_b = 0, end_a, end_b;
+    Py_UCS4 c_a, c_b;
+    int digits_a, digits_b, result, remaining_a, remaining_b;
+    int trailing_a, trailing_b;
+
+    for (;;) {
+        pos_a = skip_separators(a, pos_a);
+        pos_b = skip_separators(b, pos_b);
+        if (pos_a == a->length || pos_b == b->length) {
+            break;
+        }
+        c_a = PyUnicode_READ(a->kind, a->data, pos_a);
+        c_b = PyUnicode_READ(b->kind, b->data, pos_b);
+        if (c_a == '~' || c_b == '~') {
+            if (c_a != c_b) {
+                return c_a == '~' ? -1 : 1;
+            }
+            pos_a++;
+            pos_b++;
+            continue;
+        }
+        digits_a = IS_DIGIT(c_a);
+        digits_b = IS_DIGIT(c_b);
+        if (digits_a != digits_b) {
+            return digits_a ? 1 : -1;
+        }
+        end_a = segment_end(a, pos_a, digits_a);
+        end_b = segment_end(b, pos_b, digits_b);
+        result = compare_segments(a, pos_a, end_a, b, pos_b, end_b,
+                                  digits_a);
+        if (result != 0) {
+            return result;
+        }
+        pos_a = end_a;
+        pos_b = end_b;
+    }
+    /* Trailing separators count as remaining characters, unless the
+     * other version has remaining characters too */
+    trailing_a = a->length != 0 &&
+        !IS_SEGMENT(PyUnicode_READ(a->kind, a->data, a->length - 1));
+    trailing_b = b->length != 0 &&
+        !IS_SEGMENT(PyUnicode_READ(b->kind, b->data, b->length - 1));
+    remaining_a = pos_a < a->length || trailing_a;
+    remaining_b = pos_b < b->length || trailing_b;
+    if (remaining_a && remaining_b) {
+        remaining_a = pos_a < a->length;
+        remaining_b = pos_b < b->length;
+    }
+    return remaining_a - remaining_b;
+}
+
+/* Compare two version objects, returning -2 with an exception set on
+ * error */
+static int
+compare_objects(PyObject *obj_a, PyObject *obj_b)
+{
+    version_str a, b;
+    int equal = PyObject_RichCompareBool(obj_a, obj_b, Py_EQ);
+    if (equal < 0) {
+        return -2;
+    }
+    if (equal) {
+        return 0;
+    }
+    if (!PyUnicode_Check(obj_a) || !PyUnicode_Check(obj_b)) {
+        PyObject *msg = PyUnicode_FromFormat("Could not compare %S to %S",
+                                             obj_a, obj_b);
+        if (msg != NULL) {
+            PyErr_SetObject(RpmError, msg);
+            Py_DECREF(msg);
+        }
+        return -2;
+    }
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(obj_a) < 0 || PyUnicode_READY(obj_b) < 0) {
+        return -2;
+    }
+#endif
+    a.kind = PyUnicode_KIND(obj_a);
+    a.data = PyUnicode_DATA(obj_a);
+    a.length = PyUnicode_GET_LENGTH(obj_a);
+    b.kind = PyUnicode_KIND(obj_b);
+    b.data = PyUnicode_DATA(obj_b);
+    b.length = PyUnicode_GET_LENGTH(obj_b);
+    return compare_unequal(&a, &b);
+}
+
+PyDoc_STRVAR(compare_versions_doc,
+"compare_versions(version_a, version_b)\n\
+\n\
+Compare two RPM version strings, as rpm.compare_versions does.");
+
+static PyObject *
+compare_versions(PyObject *self, PyObject *args)
+{
+    PyObject *version_a, *version_b;
+    int result;
+    if (!PyArg_ParseTuple(args, "OO:compare_versions",
+                          &version_a, &version_b)) {
+        return NULL;
+    }
+    result = compare_objects(version_a, version_b);
+    if (result == -2) {
+        return NULL;
+    }
+    return PyLong_FromLong(result);
+}
+
+PyDoc_STRVAR(compare_evrs_doc,
+"compare_evrs(evr_a, evr_b)\n\
+\n\
+Compare two EVR tuples, as rpm.compare_evrs does.");
+
+static PyObject *
+compare_evrs(PyObject *self, PyObject *args)
+{
+    PyObject *evr_a, *evr_b, *seq_a = NULL, *seq_b = NULL;
+    PyObject **items_a, **items_b;
+    PyObject *result = NULL;
+    int cmp, i;
+    if (!PyArg_ParseTuple(args, "OO:compare_evrs", &evr_a, &evr_b)) {
+        return NULL;
+    }
+    seq_a = PySequence_Fast(evr_a, "an EVR must be a sequence");
+    if (seq_a == NULL) {
+        goto done;
+    }
+    seq_b = PySequence_Fast(evr_b, "an EVR must be a sequence");
+    if (seq_b == NULL) {
+        goto done;
+    }
+    if (PySequence_Fast_GET_SIZE(seq_a) != 3 ||
+            PySequence_Fast_GET_SIZE(seq_b) != 3) {
+        PyErr_SetString(PyExc_ValueError,
+                        "an EVR must contain exactly 3 values");
+        goto done;
+    }
+    items_a = PySequence_Fast_ITEMS(seq_a);
+    items_b = PySequence_Fast_ITEMS(seq_b);
+    cmp = PyObject_RichCompareBool(items_a[0], items_b[0], Py_NE);
+    if (cmp < 0) {
+        goto done;
+    }
+    if (cmp) {
+        cmp = PyObject_RichCompareBool(items_a[0], items_b[0], Py_GT);
+        if (cmp >= 0) {
+            result = PyLong_FromLong(cmp ? 1 : -1);
+        }
+        goto done;
+    }
+    for (i = 1; i < 3; i++) {
+        cmp = compare_objects(items_a[i], items_b[i]);
+        if (cmp == -2) {
+            goto done;
+        }
+        if (cmp != 0 || i == 2) {
+            result = PyLong_FromLong(cmp);
+            goto done;
+        }
+    }
+done:
+    Py_XDECREF(seq_a);
+    Py_XDECREF(seq_b);
+    return result;
+}
+
+static PyMethodDef rpmvercmp_methods[] = {
+    {"compare_versions", compare_versions, METH_VARARGS,
+     compare_versions_doc},
+    {"compare_evrs", compare_evrs, METH_VARARGS, compare_evrs_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef rpmvercmp_module = {
+    PyModuleDef_HEAD_INIT,
+    "version_utils._rpmvercmp",
+    "Compiled RPM version comparison for version_utils",
+    -1,
+    rpmvercmp_methods
+};
+
+PyMODINIT_FUNC
+PyInit__rpmvercmp(void)
+{
+    PyObject *module, *errors;
+    errors = PyImport_ImportModule("version_utils.errors");
+    if (errors == NULL) {
+        return NULL;
+    }
+    RpmError = PyObject_GetAttrString(errors, "RpmError");
+    Py_DECREF(errors);
+    if (RpmError == NULL) {
+        return NULL;
+    }
+    module = PyModule_Create(&rpmvercmp_module);
+    if (module == NULL) {
+        Py_CLEAR(RpmError);
+    }
+    return module;
+}
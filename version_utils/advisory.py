@@ -0,0 +1,147 @@
+"""
+advisory module for version_utils
+
+Contains functionality for matching installed packages against security
+advisories that give the version in which a package was fixed. Public
+classes include:
+
+    * :any:`Advisory`: an advisory for a package name and fixed-in EVR
+    * :any:`AdvisoryIndex`: advisories indexed by package name, for
+      finding the advisories affecting packages across many hosts
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from bisect import bisect_right
+from logging import getLogger
+
+# version_utils imports
+from version_utils.rpm import evr_key
+
+
+logger = getLogger(__name__)
+
+
+class Advisory(object):
+    """An advisory that a package is fixed in a given version
+
+    Packages with the advisory's name and a version older than the
+    fixed-in EVR are affected by the advisory.
+
+    :param str advisory_id: an identifier for the advisory, such as
+        ``RHSA-2016:0301``
+    :param str name: the name of the affected package
+    :param tuple fixed_evr: the EVR tuple of the first fixed version
+    :param str arch: if provided, only packages with this architecture
+        are affected, default None
+    :ivar str id: the advisory identifier
+    :ivar str name: the name of the affected package
+    :ivar tuple fixed_evr: the EVR tuple of the first fixed version
+    :ivar str arch: the affected architecture, or None for all
+    """
+
+    __slots__ = ('id', 'name', 'fixed_evr', 'arch')
+
+    def __init__(self, advisory_id, name, fixed_evr, arch=None):
+        self.id = advisory_id
+        self.name = name
+        self.fixed_evr = fixed_evr
+        self.arch = arch
+
+    def __repr__(self):
+        """Full representation of an Advisory object"""
+        return 'Advisory({0!r}, {1!r}, {2!r}, {3!r})'.format(
+            self.id, self.name, self.fixed_evr, self.arch)
+
+
+class AdvisoryIndex(object):
+    """An index of advisories by package name and fixed-in version
+
+    Advisories for each package name are sorted by their fixed-in EVR,
+    so the advisories affecting a package are found by a single
+    bisection: they are those fixed in a version newer than the
+    package's. Finding the advisories for a package takes O(log k)
+    comparisons of pre-tokenized keys for k advisories on its name,
+    rather than a comparison against every advisory.
+
+    Versions are ordered by ``key``, which by default applies the RPM
+    comparison rules of :any:`rpm.compare_evrs`.
+
+    :param advisories: an iterable of :any:`Advisory` objects
+    :param key: default :any:`rpm.evr_key` - a function returning a
+        sort key for an EVR tuple
+    """
+
+    def __init__(self, advisories, key=evr_key):
+        self._key = key
+        by_name = {}
+        for advisory in advisories:
+            by_name.setdefault(advisory.name, []).append(
+                (key(advisory.fixed_evr), advisory))
+        self._index = {}
+        for name, entries in by_name.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._index[name] = ([entry[0] for entry in entries],
+                                 [entry[1] for entry in entries])
+
+    def __len__(self):
+        return sum(len(entry[1]) for entry in self._index.values())
+
+    def affecting(self, package):
+        """Get the advisories affecting a package
+
+        :param common.Package package: an installed package
+        :return: a list of :any:`Advisory` objects whose fixed-in
+            version is newer than the package's
+        :rtype: list
+        """
+        if package.name not in self._index:
+            return []
+        return self._affecting(package, self._key(package.evr))
+
+    def match(self, hosts):
+        """Find the advisories affecting the packages on many hosts
+
+        A generator yielding a tuple of (host, package, advisory) for
+        each advisory affecting each package on each host. The
+        advisories affecting a name, architecture, and EVR are found
+        once per call, since the same versions are usually installed
+        across a fleet.
+
+        :param hosts: a dictionary mapping hosts to iterables of
+            :any:`common.Package` objects, or an iterable of
+            (host, packages) tuples
+        :return: a generator of (host, package, :any:`Advisory`) tuples
+        :rtype: generator
+        """
+        if hasattr(hosts, 'items'):
+            hosts = hosts.items()
+        found = {}
+        index = self._index
+        for host, packages in hosts:
+            for package in packages:
+                name = package.name
+                if name not in index:
+                    continue
+                evr = package.evr
+                installed = (name, package.arch, evr)
+                affected = found.get(installed)
+                if affected is None:
+                    affected = found[installed] = self._affecting(
+                        package, self._key(evr))
+                for advisory in affected:
+                    yield host, package, advisory
+
+    def _affecting(self, package, key):
+        """Get the advisories affecting a package with an indexed name
+
+        :param common.Package package: an installed package
+        :param key: the sort key of the package's EVR
+        :return: a list of :any:`Advisory` objects
+        :rtype: list
+        """
+        fixed_keys, advisories = self._index[package.name]
+        affected = advisories[bisect_right(fixed_keys, key):]
+        return [advisory for advisory in affected
+                if advisory.arch is None or advisory.arch == package.arch]
@@ -0,0 +1,200 @@
+"""
+aio module for version_utils
+
+Contains asyncio versions of the bulk parsing and comparison functions
+of :any:`rpm`, for use in services where parsing or comparing large
+numbers of packages on the event loop would delay other work. Public
+functions include:
+
+    * :any:`parse_many`: parse package strings from an iterable or an
+      async iterable, asynchronously yielding :any:`common.Package`
+      objects
+    * :any:`compare_many`: compare pairs of package strings from an
+      iterable or an async iterable
+
+Inputs are processed in chunks, each of which is run in an executor
+while the event loop continues with other tasks. Only a bounded number
+of chunks are read ahead of the consumer, so a slow consumer applies
+backpressure to the input, and cancelling the consuming task cancels
+any chunks that have not started.
+
+This module requires Python 3.6 or later, and is not imported by
+default.
+"""
+
+# Standard library imports
+from array import array
+from asyncio import get_event_loop
+from collections import deque
+from itertools import islice
+from logging import getLogger
+
+# version_utils imports
+from version_utils import rpm
+from version_utils.errors import RpmError
+
+
+logger = getLogger(__name__)
+
+
+async def parse_many(package_strings, arch_included=True, on_error='raise',
+                     chunksize=1000, executor=None, max_pending=2,
+                     pool=None):
+    """Parse many RPM package strings, yielding Package objects
+
+    An async generator with the same results as :any:`rpm.parse_many`:
+    surrounding whitespace is stripped from each string, blank strings
+    are skipped, and each remaining string is parsed with
+    :any:`rpm.package`. Strings that cannot be parsed are handled
+    according to ``on_error``, as for :any:`rpm.parse_many`.
+
+    :param package_strings: an iterable or async iterable of RPM
+        package strings
+    :param bool arch_included: default True - whether the package
+        strings end with an architecture
+    :param on_error: ``'raise'``, ``'skip'``, or a list to collect
+        failures in
+    :param int chunksize: default 1000 - the number of strings parsed
+        in each call to the executor
+    :param executor: a :any:`concurrent.futures.Executor` to parse
+        chunks in, default None for the event loop's default executor
+    :param int max_pending: default 2 - the most chunks to read from
+        ``package_strings`` before their packages have been consumed
+    :param common.StringPool pool: an optional pool to intern the fields
+        of the packages in, as for :any:`rpm.package`. Fields are
+        interned on the event loop, so the pool is shared even when
+        chunks are parsed in other processes
+    :return: an async generator of :any:`common.Package` objects
+    :rtype: async_generator
+    :raises RpmError: if a string cannot be parsed and ``on_error`` is
+        ``'raise'``
+    """
+    if (on_error not in ('raise', 'skip') and
+            not hasattr(on_error, 'append')):
+        raise ValueError('on_error must be "raise", "skip", or a list, '
+                         'not {0!r}'.format(on_error))
+    chunks = _map_chunks(_parse_chunk, package_strings, chunksize, executor,
+                         max_pending, arch_included)
+    async for results in chunks:
+        for result in results:
+            if type(result) is not tuple:
+                if pool is not None:
+                    pool.intern_package(result)
+                yield result
+            elif on_error == 'raise':
+                raise result[1]
+            elif on_error != 'skip':
+                on_error.append(result)
+
+
+async def compare_many(pairs, arch_provided=True, chunksize=10000,
+                       executor=None, max_pending=2):
+    """Compare many pairs of RPM package strings
+
+    A coroutine with the same results as :any:`rpm.compare_many`, each
+    pair being compared with :any:`rpm.compare_packages`. Passing a
+    :any:`concurrent.futures.ProcessPoolExecutor` as ``executor``
+    compares up to ``max_pending`` chunks in parallel.
+
+    :param pairs: an iterable or async iterable of 2-tuples of RPM
+        package strings
+    :param bool arch_provided: default True - whether package strings
+        contain architecture information
+    :param int chunksize: default 10000 - the number of pairs compared
+        in each call to the executor
+    :param executor: a :any:`concurrent.futures.Executor` to compare
+        chunks in, default None for the event loop's default executor
+    :param int max_pending: default 2 - the most chunks to read from
+        ``pairs`` before earlier chunks have been compared
+    :return: an array of signed bytes holding 1, 0, or -1 for each pair
+    :rtype: array.array
+    :raises RpmError: if a package string cannot be parsed
+    """
+    results = array('b')
+    chunks = _map_chunks(rpm._compare_chunk, pairs, chunksize, executor,
+                         max_pending, arch_provided)
+    async for chunk_results in chunks:
+        results.extend(chunk_results)
+    return results
+
+
+def _parse_chunk(package_strings, arch_included):
+    """Parse a chunk of package strings in an executor
+
+    Failures are returned rather than raised, so that the packages
+    preceding them can still be yielded.
+
+    :param list package_strings: RPM package strings
+    :param bool arch_included: whether the package strings end with an
+        architecture
+    :return: a :any:`common.Package` object, or a tuple of (package
+        string, :any:`RpmError`), for each non-blank string
+    :rtype: list
+    """
+    results = []
+    for package_string in package_strings:
+        package_string = package_string.strip()
+        if not package_string:
+            continue
+        try:
+            results.append(rpm.package(package_string, arch_included))
+        except RpmError as exc:
+            results.append((package_string, exc))
+    return results
+
+
+async def _map_chunks(func, items, chunksize, executor, max_pending, *args):
+    """Apply a function to chunks of items in an executor, in order
+
+    An async generator yielding the result of ``func(chunk, *args)``
+    for each chunk. Up to ``max_pending`` chunks are submitted before
+    the oldest result is awaited, and no more items are read until
+    then. Chunks still pending when the generator is cancelled or
+    closed are cancelled.
+
+    :param func: a function taking a list of items and ``args``
+    :param items: an iterable or async iterable
+    :param int chunksize: the number of items in each chunk
+    :param executor: a :any:`concurrent.futures.Executor`, or None
+    :param int max_pending: the most chunks to submit at once
+    :return: an async generator of the results of ``func``
+    :rtype: async_generator
+    """
+    loop = get_event_loop()
+    pending = deque()
+    try:
+        async for chunk in _chunks(items, chunksize):
+            pending.append(loop.run_in_executor(executor, func, chunk,
+                                                *args))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _chunks(items, chunksize):
+    """Split an iterable or async iterable into lists of items
+
+    :param items: an iterable or async iterable
+    :param int chunksize: the number of items in each list
+    :return: an async generator of non-empty lists
+    :rtype: async_generator
+    """
+    if hasattr(items, '__aiter__'):
+        chunk = []
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+    items = iter(items)
+    chunk = list(islice(items, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunksize))
@@ -0,0 +1,337 @@
+"""
+apk module for version_utils
+
+Contains Alpine package parsing and version comparison operations for
+version_utils, following the algorithm of ``apk version -t`` in
+apk-tools. Public methods include:
+
+    * :any:`compare_versions`: compare two Alpine version strings, e.g.
+      ``1.2.3_rc1-r0`` and ``1.2.3-r0``
+    * :any:`compare_evrs`: compare two (epoch, version, release)
+      tuples, or the EVRs of two :any:`common.Package` objects
+    * :any:`compare_many`: compare many pairs of version strings
+    * :any:`version_key` and :any:`evr_key`: get sortable keys for
+      version strings and EVR tuples, e.g. for use with ``sorted()``
+    * :any:`package`: parse a line of ``apk info -v`` or ``apk list``
+      output into a :any:`common.Package` object
+
+Every comparison is made by building an :any:`ApkKey` for each version,
+a flat tuple of integers that orders exactly as apk-tools orders
+versions, so each version is tokenized once and comparisons of keys run
+entirely in C.
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from array import array
+from logging import getLogger
+from re import compile
+
+# version_utils imports
+from version_utils.common import Package
+from version_utils.errors import ApkError
+
+
+logger = getLogger(__name__)
+
+_digits_re = compile('[0-9]*')
+_zeros_re = compile('0*')
+
+# Token types, in the order of apk-tools' version.c. A version may only
+# move to a later type, except where _type_resets allows it
+(_digit_or_zero, _digit, _letter, _suffix, _suffix_no, _revision_no,
+ _end) = range(7)
+_invalid = -1
+_type_resets = frozenset([(_digit, _digit_or_zero), (_suffix_no, _suffix),
+                          (_letter, _digit)])
+
+# Pre-release suffixes, which sort before the end of a version, then
+# post-release suffixes, which sort after it
+_suffixes = ('alpha', 'beta', 'pre', 'rc', 'cvs', 'svn', 'git', 'hg', 'p')
+_pre_suffixes = 4
+# The rank of a token type in a key: an earlier type outranks a later
+# one, and a pre-release suffix is outranked by everything, even the end
+_pre_suffix_rank = -1
+
+# Return values:
+#   a_newer: a is newer than b, return 1
+#   b_newer: b is newer than a, return -1
+#   a_eq_b: a and b are equal, return 0
+a_newer = 1
+b_newer = -1
+a_eq_b = 0
+
+
+def compare_versions(version_a, version_b):
+    """Compare two Alpine version strings to determine which is newer
+
+    Versions are compared as by ``apk version -t``, token by token.
+    Numbers are compared numerically, except that after a period, a run
+    of leading zeros is a token of its own, valued minus its length, so
+    ``1.01`` is older than ``1.1``, as with decimal fractions, and
+    ``1.0`` is older than ``1.``. As in apk-tools, this also makes
+    ``1.0_rc1`` newer than ``1.0``, as the zero token ends ``1.0`` but
+    is followed by a number in ``1.0_rc1``. A letter, such as
+    the ``a`` of ``1.2a``, sorts after the end of the version. Suffixes
+    sort in the order ``_alpha``, ``_beta``, ``_pre``, ``_rc``, (no
+    suffix), ``_cvs``, ``_svn``, ``_git``, ``_hg``, ``_p``, each
+    followed by an optional number, and the ``-rN`` revision is
+    compared last.
+
+    :param str version_a: an Alpine version string, e.g. ``1.2.3-r0``
+    :param str version_b: an Alpine version string
+    :return: 1 (if ``a`` is newer), 0 (if versions are equal), or -1
+        (if ``b`` is newer)
+    :rtype: int
+    :raises ApkError: if a version is not a valid Alpine version string
+    """
+    key_a, key_b = version_key(version_a), version_key(version_b)
+    if key_a == key_b:
+        return a_eq_b
+    return a_newer if key_a > key_b else b_newer
+
+
+def compare_evrs(evr_a, evr_b):
+    """Compare two Alpine EVR tuples to determine which is newer
+
+    :param evr_a: an (epoch, version, release) tuple, where the epoch
+        is ignored and the release, e.g. ``r0``, may be None, or a
+        :any:`common.Package` object
+    :param evr_b: an EVR tuple or a :any:`common.Package` object
+    :return: 1 (if ``a`` is newer), 0 (if versions are equal), or -1
+        (if ``b`` is newer)
+    :rtype: int
+    :raises ApkError: if a version is not a valid Alpine version string
+    """
+    key_a, key_b = evr_key(evr_a), evr_key(evr_b)
+    if key_a == key_b:
+        return a_eq_b
+    return a_newer if key_a > key_b else b_newer
+
+
+def compare_many(pairs):
+    """Compare many pairs of Alpine version strings
+
+    Equivalent to calling :any:`compare_versions` on each pair, but
+    the key of each distinct version is built only once, so comparing
+    the versions installed across many container images, which repeat
+    heavily, costs little more than comparing tuples.
+
+    :param pairs: an iterable of 2-tuples of Alpine version strings
+    :return: an array of signed bytes holding 1, 0, or -1 for each pair
+    :rtype: array.array
+    :raises ApkError: if a version is not a valid Alpine version string
+    """
+    results = array(str('b'))
+    append = results.append
+    keys = {}
+    for version_a, version_b in pairs:
+        key_a = keys.get(version_a)
+        if key_a is None:
+            key_a = keys[version_a] = ApkKey(version_a)
+        key_b = keys.get(version_b)
+        if key_b is None:
+            key_b = keys[version_b] = ApkKey(version_b)
+        append((key_a > key_b) - (key_a < key_b))
+    return results
+
+
+def version_key(version):
+    """Get a sort key for an Alpine version string
+
+    The version is tokenized once, so the returned key can be compared
+    repeatedly without re-parsing the string, e.g.
+    ``sorted(versions, key=apk.version_key)``. Keys order exactly as
+    :any:`compare_versions` orders the strings they were made from.
+
+    :param str version: an Alpine version string, including any ``-rN``
+        revision
+    :return: a sort key for the version
+    :rtype: ApkKey
+    :raises ApkError: if the version is not a valid Alpine version
+        string
+    """
+    return ApkKey(version)
+
+
+def evr_key(evr):
+    """Get a sort key for an Alpine EVR tuple or a Package
+
+    Alpine versions have no epoch, so the epoch is ignored, and the
+    version and release are joined with a hyphen, as in ``1.2.3-r0``.
+
+    :param evr: an (epoch, version, release) tuple, where the release
+        may be None, or a :any:`common.Package` object
+    :return: a sort key for the EVR
+    :rtype: ApkKey
+    :raises ApkError: if the version is not a valid Alpine version
+        string
+    """
+    _, version, release = getattr(evr, 'evr', evr)
+    if release:
+        version = '{0}-{1}'.format(version, release)
+    return ApkKey(version)
+
+
+class ApkKey(tuple):
+    """A pre-tokenized, sortable representation of an Alpine version
+
+    A flat tuple of integers holding the rank of each token's type
+    followed by the token's value, then 0 for the end of the version.
+    Earlier types rank higher, so ``1.1.1`` is newer than ``1.1a`` and
+    ``1.1a`` than ``1.1``, except that pre-release suffixes rank below
+    everything. Numbers are their values, with a run of leading zeros
+    after a period a token of its own, valued minus its length, letters
+    are their character codes, and suffixes their positions relative to
+    the end of the version.
+
+    Because every item is an integer, comparing two keys is a single
+    tuple comparison. Keys are immutable and hashable.
+
+    :param str version: an Alpine version string, including any ``-rN``
+        revision
+    :raises ApkError: if the version is not a valid Alpine version
+        string
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, version):
+        try:
+            length = len(version)
+        except TypeError:
+            raise ApkError('Could not create a key for {0}'.format(version))
+        if not length:
+            raise ApkError('Version string is empty')
+        key = []
+        append = key.append
+        token, pos = _digit, 0
+        while token != _end:
+            start = pos
+            next_token = None
+            if pos >= length:
+                # A version ending in a separator, such as '1.', has a
+                # final token of value 0, as in apk-tools
+                value = 0
+            elif token == _digit_or_zero and version[pos] == '0':
+                # A run of n zeros is a token of its own, of value -n,
+                # as in apk-tools
+                pos = _zeros_re.match(version, pos).end()
+                value = start - pos
+                next_token = _digit
+            elif token == _letter:
+                value = ord(version[pos])
+                pos += 1
+            elif token == _suffix:
+                for value, suffix in enumerate(_suffixes):
+                    if version.startswith(suffix, pos):
+                        break
+                else:
+                    raise ApkError('Invalid suffix: {0}'.format(version))
+                pos += len(suffix)
+                value -= _pre_suffixes
+            else:
+                pos = _digits_re.match(version, pos).end()
+                value = int(version[start:pos]) if pos > start else 0
+            if token == _suffix and value < 0:
+                append(_pre_suffix_rank)
+            else:
+                append(_end - token)
+            append(value)
+            if pos >= length:
+                token = _end
+            elif next_token is not None:
+                token = next_token
+            else:
+                token, pos = _next_token(version, token, pos)
+        append(0)
+        return tuple.__new__(cls, key)
+
+    def __repr__(self):
+        """Full representation of an ApkKey object"""
+        return 'ApkKey({0})'.format(tuple.__repr__(self))
+
+
+def _next_token(version, token, pos):
+    """Find the type of the token starting at a position in a version
+
+    :param str version: an Alpine version string
+    :param int token: the type of the previous token
+    :param int pos: the position after the previous token
+    :return: the type of the next token, and the position of its value
+        after any separator
+    :rtype: tuple
+    :raises ApkError: if the next token is not valid after the previous
+        one
+    """
+    char = version[pos]
+    if token <= _digit and 'a' <= char <= 'z':
+        next_token = _letter
+    elif token == _letter and '0' <= char <= '9':
+        next_token = _digit
+    elif token == _suffix and '0' <= char <= '9':
+        next_token = _suffix_no
+    else:
+        if char == '.':
+            next_token = _digit_or_zero
+        elif char == '_':
+            next_token = _suffix
+        elif char == '-' and version.startswith('r', pos + 1):
+            next_token = _revision_no
+            pos += 1
+        else:
+            next_token = _invalid
+        pos += 1
+    if next_token < token and (token, next_token) not in _type_resets:
+        raise ApkError('Invalid version string: {0}'.format(version))
+    return next_token, pos
+
+
+def package(package_string):
+    """Parse an Alpine package string into a Package object
+
+    Two forms are accepted:
+
+    * ``name-version``, as printed by ``apk info -v``, e.g.
+      ``musl-1.2.3-r4``
+    * whitespace-separated fields starting with ``name-version`` and
+      the architecture, as printed by ``apk list``, e.g.
+      ``musl-1.2.4-r2 x86_64 {musl} (MIT) [installed]``
+
+    The version starts after the last hyphen in the string that is
+    followed by a digit, apart from the hyphen of the ``-rN`` revision,
+    as in apk-tools. The version and the revision, e.g. ``r4``, are
+    stored as the Package's version and release, and the epoch and, for
+    the first form, the architecture are None.
+
+    :param str package_string: an Alpine package string
+    :return: the parsed package
+    :rtype: common.Package
+    :raises ApkError: if the string cannot be parsed, or its version is
+        not a valid Alpine version string
+    """
+    try:
+        fields = package_string.split()
+    except AttributeError:
+        raise ApkError('Could not parse package {0}'.format(package_string))
+    if not fields:
+        raise ApkError('Package string is empty')
+    name_version = fields[0]
+    arch = fields[1] if len(fields) > 1 else None
+    end = len(name_version) - 1
+    hyphens = 0
+    while True:
+        hyphen = name_version.rfind('-', 0, end)
+        if hyphen <= 0 or hyphens == 2:
+            raise ApkError('Could not parse package string: '
+                           '{0}'.format(package_string))
+        if '0' <= name_version[hyphen + 1] <= '9':
+            break
+        hyphens += 1
+        end = hyphen
+    version = name_version[hyphen + 1:]
+    ApkKey(version)
+    version, _, release = version.partition('-')
+    return Package(name_version[:hyphen], None, version, release or None,
+                   arch, package_str=package_string)
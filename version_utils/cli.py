@@ -0,0 +1,253 @@
+"""
+cli module for version_utils
+
+Contains the ``version_utils`` command-line tool, for comparing and
+sorting lists of RPM packages from the shell. Subcommands include:
+
+    * ``compare``: compare two package strings, or pairs of package
+      strings read one pair per line
+    * ``sort``: sort package strings by name and then version, using
+      temporary files for lists too large to sort in memory on Python
+      3.5 and later
+    * ``newest``: print the newest version of each package
+    * ``diff``: print the packages added, removed, upgraded, or
+      downgraded between two package lists
+
+Package lists are read from files, or from standard input if no files
+are given, and may be gzip-compressed. Results are written to standard
+output as they are produced. Modules are imported only by the
+subcommands that use them, to keep startup fast.
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from argparse import ArgumentParser
+from errno import EPIPE
+from logging import getLogger
+import os
+import sys
+
+# version_utils imports
+from version_utils.errors import VersionUtilsError
+from version_utils.version import __version__
+
+
+logger = getLogger(__name__)
+
+_prog = 'version_utils'
+
+
+def main(argv=None):
+    """Run the command-line tool
+
+    :param list argv: the command-line arguments, default None to use
+        ``sys.argv``
+    :return: the exit status
+    :rtype: int
+    """
+    args = _parser().parse_args(argv)
+    try:
+        args.func(args, sys.stdout)
+        sys.stdout.flush()
+    except VersionUtilsError as exc:
+        print('{0}: error: {1}'.format(_prog, exc), file=sys.stderr)
+        return 1
+    except IOError as exc:  # Includes BrokenPipeError, e.g. from head
+        if exc.errno != EPIPE:
+            raise
+        # Stop Python from failing again to flush output when exiting
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def _parser():
+    """Create the argument parser for the command-line tool
+
+    :return: the argument parser
+    :rtype: argparse.ArgumentParser
+    """
+    parser = ArgumentParser(
+        prog=_prog, description='Compare and sort RPM package strings.')
+    parser.add_argument('--version', action='version',
+                        version='%(prog)s {0}'.format(__version__))
+    subparsers = parser.add_subparsers(title='subcommands')
+    subparsers.required = True
+    subparsers.dest = 'subcommand'
+
+    compare = subparsers.add_parser(
+        'compare', help='compare package strings',
+        description='Compare two package strings, or each pair of package '
+                    'strings read from standard input, one pair per line, '
+                    'printing 1 if the first is newer, -1 if the second is '
+                    'newer, and 0 if they are equivalent.')
+    compare.add_argument('packages', nargs='*', metavar='PACKAGE',
+                         help='two package strings to compare')
+    compare.add_argument('-j', '--jobs', type=int, default=1,
+                         help='the number of processes to compare pairs '
+                              'from standard input in (default 1)')
+    compare.set_defaults(func=_compare)
+
+    sort = subparsers.add_parser(
+        'sort', help='sort package strings by name and version',
+        description='Print package strings sorted by name, then by version '
+                    'and architecture. On Python 3.5 and later, lists too '
+                    'large to sort in memory are sorted in runs written to '
+                    'temporary files.')
+    sort.add_argument('-r', '--reverse', action='store_true',
+                      help='reverse the sort order (names descending, newest '
+                           'versions first)')
+    sort.add_argument('-S', '--buffer-size', type=int, default=64,
+                      metavar='MIB',
+                      help='the approximate memory to use in MiB before '
+                           'sorting in temporary files (default 64)')
+    sort.add_argument('-T', '--temporary-directory', metavar='DIR',
+                      help='the directory to write temporary files in')
+    sort.set_defaults(func=_sort)
+
+    newest = subparsers.add_parser(
+        'newest', help='print the newest version of each package',
+        description='Print the newest version of each package name and '
+                    'architecture, in order of first appearance.')
+    newest.set_defaults(func=_newest)
+
+    diff = subparsers.add_parser(
+        'diff', help='print the changes between two package lists',
+        description='Print a tab-separated line of the change, the old '
+                    'package, and the new package for each package added, '
+                    'removed, upgraded, or downgraded between two package '
+                    'lists. Missing packages are printed as "-".')
+    diff.add_argument('old', metavar='OLD',
+                      help='the old package list, or "-" for standard input')
+    diff.add_argument('new', metavar='NEW',
+                      help='the new package list, or "-" for standard input')
+    diff.add_argument('-u', '--unchanged', action='store_true',
+                      help='also print unchanged packages')
+    diff.set_defaults(func=_diff)
+
+    for subparser in (compare, sort, newest, diff):
+        subparser.add_argument('--no-arch', dest='arch_included',
+                               action='store_false',
+                               help='package strings do not end with an '
+                                    'architecture')
+    for subparser in (sort, newest):
+        subparser.add_argument('files', nargs='*', metavar='FILE',
+                               help='package lists to read, default '
+                                    'standard input')
+    for subparser in (sort, newest, diff):
+        subparser.add_argument('-s', '--skip-invalid', dest='on_error',
+                               action='store_const', const='skip',
+                               default='raise',
+                               help='skip lines that cannot be parsed')
+    return parser
+
+
+def _compare(args, out):
+    """Compare two package strings, or pairs from standard input"""
+    from version_utils import rpm
+    if len(args.packages) == 2:
+        out.write('{0}\n'.format(rpm.compare_packages(
+            args.packages[0], args.packages[1], args.arch_included)))
+        return
+    if args.packages:
+        raise VersionUtilsError('compare takes two package strings, or '
+                                'none to read pairs from standard input')
+    pairs = (_split_pair(line) for line in _stdin_lines())
+    for results in rpm._compare_chunks(pairs, args.jobs,
+                                       arch_provided=args.arch_included):
+        out.write(''.join('{0}\n'.format(result) for result in results))
+
+
+def _sort(args, out):
+    """Print packages sorted by name, version, and architecture"""
+    packages = _read_packages(args.files, args)
+    if sys.version_info < (3, 5):
+        # extsort needs the key and reverse arguments of heapq.merge
+        from version_utils import rpm
+        packages = sorted(packages, key=lambda pkg: (
+            pkg.name, rpm.evr_key(pkg), pkg.arch or ''), reverse=args.reverse)
+    else:
+        from version_utils.extsort import sort_packages
+        packages = sort_packages(
+            packages, args.reverse, args.buffer_size * 1024 * 1024,
+            args.temporary_directory)
+    _write_packages(packages, out)
+
+
+def _newest(args, out):
+    """Print the newest version of each package name and architecture"""
+    from version_utils import rpm
+    compare_evrs = rpm.compare_evrs
+    newest = {}
+    order = []
+    for pkg in _read_packages(args.files, args):
+        key = (pkg.name, pkg.arch)
+        current = newest.get(key)
+        if current is None:
+            order.append(key)
+            newest[key] = pkg
+        elif compare_evrs(pkg.evr, current.evr) > 0:
+            newest[key] = pkg
+    _write_packages((newest[key] for key in order), out)
+
+
+def _diff(args, out):
+    """Print the changes between two package lists"""
+    from version_utils import rpm
+    old = list(_read_packages([args.old], args))
+    new = list(_read_packages([args.new], args))
+    for change, old_pkg, new_pkg in rpm.diff_inventories(old, new):
+        if change == 'unchanged' and not args.unchanged:
+            continue
+        out.write('{0}\t{1}\t{2}\n'.format(
+            change, _package_string(old_pkg), _package_string(new_pkg)))
+
+
+def _read_packages(files, args):
+    """Read packages from files, or standard input if none are given
+
+    :param list files: paths, where ``-`` is standard input
+    :param args: the parsed arguments
+    :return: a generator of :any:`common.Package` objects
+    :rtype: generator
+    """
+    from version_utils.manifest import read_manifest
+    for path in files or ['-']:
+        source = _stdin_buffer() if path == '-' else path
+        for pkg in read_manifest(source, args.arch_included, args.on_error):
+            yield pkg
+
+
+def _write_packages(packages, out):
+    """Write the package string of each package on its own line"""
+    for pkg in packages:
+        out.write(_package_string(pkg))
+        out.write('\n')
+
+
+def _package_string(pkg):
+    """Get a package's string, or ``-`` for None"""
+    return '-' if pkg is None else pkg.package
+
+
+def _split_pair(line):
+    """Split a line holding two whitespace-separated package strings"""
+    fields = line.split()
+    if len(fields) != 2:
+        raise VersionUtilsError('Expected two package strings: '
+                                '{0}'.format(line.strip()))
+    return fields[0], fields[1]
+
+
+def _stdin_lines():
+    """Yield the lines of standard input that are not blank"""
+    for line in sys.stdin:
+        if line.strip():
+            yield line
+
+
+def _stdin_buffer():
+    """Get standard input as a binary stream"""
+    return getattr(sys.stdin, 'buffer', sys.stdin)
@@ -6,18 +6,36 @@ management systems.
 # Standard library imports
 from __future__ import (absolute_import, division,
                         print_function, unicode_literals)
+from collections import namedtuple, OrderedDict
 from logging import getLogger
+from sys import getsizeof
+from threading import Lock
+
+try:  # Python 3
+    from sys import intern
+except ImportError:  # Python 2, where intern is a builtin
+    pass
 
 # Local imports
 
 logger = getLogger(__name__)
 
 
+CacheInfo = namedtuple('CacheInfo',
+                       'hits misses evictions maxsize currsize')
+PoolInfo = namedtuple('PoolInfo', 'lookups hits size nbytes')
+
+
 class Package(object):
     """A class to hold information about a system package
 
     All parameters except ``name`` are optional and default to None
 
+    Packages are stored compactly, since large numbers of them may be
+    held in memory at once: instances have no ``__dict__``, the name and
+    architecture strings are interned, and ``evr`` and ``info`` are
+    assembled from the individual fields when accessed.
+
     :param str name: package name
     :param str epoch: epoch string, default None
     :param str version: version string, default None
@@ -35,17 +53,27 @@ class Package(object):
     :ivar str package: the system-style package string
     """
 
+    __slots__ = ('name', 'epoch', 'version', 'release', 'arch', 'package')
+
     def __init__(self, name, epoch=None, version=None, release=None,
                  arch=None, package_str=None):
-        self.name = name
+        self.name = _intern(name)
         self.epoch = epoch
         self.version = version
         self.release = release
-        self.arch = arch
-        self.evr = (epoch, version, release)
-        self.info = (name, epoch, version, release, arch)
+        self.arch = _intern(arch)
         self.package = package_str
 
+    @property
+    def evr(self):
+        """A 3-tuple containing (epoch, version, release)"""
+        return self.epoch, self.version, self.release
+
+    @property
+    def info(self):
+        """A 5-tuple containing (name, epoch, version, release, arch)"""
+        return self.name, self.epoch, self.version, self.release, self.arch
+
     def __str__(self):
         """Create a string representation of a Package object"""
         return ('Package Object: {0}'.format(self.info))
@@ -55,3 +83,176 @@ class Package(object):
         return ('Package("{0}", "{1}", "{2}", "{3}", "{4}", '
                 '"{5}")'.format(self.name, self.epoch, self.version,
                                 self.release, self.arch, self.package))
+
+    def __reduce__(self):
+        """Pickle a Package object as its constructor arguments"""
+        return (Package, (self.name, self.epoch, self.version,
+                          self.release, self.arch, self.package))
+
+
+def _intern(value):
+    """Intern a native string, returning any other value unchanged
+
+    :param value: the value to intern
+    :return: the interned string, or ``value``
+    """
+    return intern(value) if type(value) is str else value
+
+
+class LRUCache(object):
+    """A thread-safe, bounded cache with least-recently-used eviction
+
+    Once the cache holds ``maxsize`` entries, adding a new entry evicts
+    the entry that was least recently retrieved or added. Unhashable
+    keys are never cached: looking them up is always a miss, and
+    storing them does nothing.
+
+    :param int maxsize: the maximum number of entries to hold
+    :ivar int maxsize: the maximum number of entries to hold
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Get a cached value, marking it as most recently used
+
+        :param key: the key to look up
+        :param default: the value to return if ``key`` is not cached
+        :return: the cached value, or ``default``
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except (KeyError, TypeError):
+                self._misses += 1
+                return default
+            self._data[key] = value
+            self._hits += 1
+            return value
+
+    def set(self, key, value):
+        """Cache a value, evicting the least recently used if full
+
+        :param key: the key to store the value under
+        :param value: the value to cache
+        :return: None
+        :rtype: None
+        """
+        with self._lock:
+            try:
+                self._data.pop(key, None)
+                self._data[key] = value
+            except TypeError:
+                return
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def info(self):
+        """Get statistics about the use of the cache
+
+        :return: hit, miss, and eviction counts, along with the maximum
+            and current size of the cache
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self.maxsize, len(self._data))
+
+    def clear(self):
+        """Remove all entries and reset statistics
+
+        :return: None
+        :rtype: None
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class StringPool(object):
+    """A pool of deduplicated strings, such as package fields
+
+    Interning a string returns the pool's copy of an equal string if it
+    has one, and otherwise adds the string to the pool. Sharing a pool
+    between the parsers of many package strings, e.g. with the ``pool``
+    parameter of :any:`rpm.package` or :any:`rpm.parse_many`, stores
+    each distinct name, epoch, version, release, and architecture once,
+    however many packages hold it.
+
+    Unlike the builtin ``intern``, the pool keeps its strings alive
+    until it is cleared, so long-running processes can bound its memory
+    with :any:`info` and :any:`clear`. Interning is thread-safe, though
+    statistics may undercount under concurrent use.
+    """
+
+    def __init__(self):
+        self._strings = {}
+        self._lookups = 0
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __contains__(self, value):
+        return value in self._strings
+
+    def intern(self, value):
+        """Get the pool's copy of a string, adding it if necessary
+
+        :param value: the string to intern, or None
+        :return: a string equal to ``value``, or None
+        """
+        if value is None:
+            return None
+        self._lookups += 1
+        return self._strings.setdefault(value, value)
+
+    def intern_package(self, package):
+        """Replace a package's fields with the pool's copies
+
+        The package string, which is usually unique, is not interned.
+
+        :param Package package: the package to update
+        :return: ``package``
+        :rtype: Package
+        """
+        intern = self.intern
+        package.name = intern(package.name)
+        package.epoch = intern(package.epoch)
+        package.version = intern(package.version)
+        package.release = intern(package.release)
+        package.arch = intern(package.arch)
+        return package
+
+    def info(self):
+        """Get statistics about the use of the pool
+
+        :return: the number of lookups, the number of those that found
+            an existing string, the number of strings in the pool, and
+            the approximate memory used by the pool and its strings in
+            bytes
+        :rtype: PoolInfo
+        """
+        strings = list(self._strings)
+        size = len(strings)
+        nbytes = getsizeof(self._strings) + sum(getsizeof(string)
+                                                for string in strings)
+        return PoolInfo(self._lookups, self._lookups - size, size, nbytes)
+
+    def clear(self):
+        """Remove all strings and reset statistics
+
+        Strings already held by packages are unaffected.
+
+        :return: None
+        :rtype: None
+        """
+        self._strings = {}
+        self._lookups = 0
@@ -0,0 +1,342 @@
+"""
+dpkg module for version_utils
+
+Contains Debian package parsing and version comparison operations for
+version_utils, following the algorithm of ``dpkg --compare-versions``
+as described in the Debian Policy Manual. Public methods include:
+
+    * :any:`compare_versions`: compare two Debian version strings, e.g.
+      ``1:2.30-1ubuntu2`` and ``2.4-1``
+    * :any:`compare_evrs`: compare two (epoch, upstream version,
+      revision) tuples, or the EVRs of two :any:`common.Package`
+      objects
+    * :any:`compare_many`: compare many pairs of version strings
+    * :any:`version_key` and :any:`evr_key`: get sortable keys for
+      version strings and EVR tuples, e.g. for use with ``sorted()``
+    * :any:`package`: parse a ``name_version_arch`` package file name,
+      or a line of ``dpkg-query`` output, into a :any:`common.Package`
+      object
+    * :any:`parse_version`: split a version string into its epoch,
+      upstream version, and revision
+
+Every comparison is made by building a :any:`DpkgKey` for each version,
+a flat tuple of integers that orders exactly as dpkg orders versions,
+so comparisons of keys run entirely in C. Keys can be built once and
+compared many times, and :any:`compare_many` builds a single key for
+each distinct version in a batch.
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from array import array
+from logging import getLogger
+from re import compile
+
+# version_utils imports
+from version_utils.common import Package
+from version_utils.errors import DpkgError
+
+
+logger = getLogger(__name__)
+
+# Alternating runs of non-digits and digits, the units dpkg compares
+_run_re = compile('([^0-9]*)([0-9]*)')
+_epoch_re = compile(r'[0-9]+\Z')
+_whitespace_re = compile(r'\s')
+
+# Return values:
+#   a_newer: a is newer than b, return 1
+#   b_newer: b is newer than a, return -1
+#   a_eq_b: a and b are equal, return 0
+a_newer = 1
+b_newer = -1
+a_eq_b = 0
+
+
+class _RunItems(dict):
+    """The key items of each run of non-digits, computed once each
+
+    As in dpkg, each character of a run is weighed: the end of the run
+    weighs 0, tildes weigh less, letters weigh their character codes,
+    and any other character weighs more than every letter. Runs such
+    as ``.``, ``~``, and ``ubuntu`` recur across versions, so their
+    items are cached, up to a fixed number of distinct runs.
+    """
+
+    max_size = 4096
+
+    def __missing__(self, run):
+        items = []
+        for char in run:
+            if char == '~':
+                items.append(-1)
+            elif 'a' <= char <= 'z' or 'A' <= char <= 'Z':
+                items.append(ord(char))
+            else:
+                items.append(ord(char) + 256)
+        items.append(0)
+        items = tuple(items)
+        if len(self) < self.max_size:
+            self[run] = items
+        return items
+
+
+_run_items = _RunItems()
+
+
+def compare_versions(version_a, version_b):
+    """Compare two Debian version strings to determine which is newer
+
+    Versions are compared as by ``dpkg --compare-versions``: by epoch
+    numerically, then by upstream version, then by revision. Upstream
+    versions and revisions are compared in alternating runs of
+    non-digits, compared character by character with ``~`` sorting
+    before everything, even the end of the version, and letters before
+    other characters, and runs of digits, compared numerically. A
+    missing revision is equal to a revision of ``0``.
+
+    :param str version_a: a Debian version string, e.g. ``1:2.30-1``
+    :param str version_b: a Debian version string
+    :return: 1 (if ``a`` is newer), 0 (if versions are equal), or -1
+        (if ``b`` is newer)
+    :rtype: int
+    :raises DpkgError: if a version is not a valid Debian version
+        string
+    """
+    key_a, key_b = version_key(version_a), version_key(version_b)
+    if key_a == key_b:
+        return a_eq_b
+    return a_newer if key_a > key_b else b_newer
+
+
+def compare_evrs(evr_a, evr_b):
+    """Compare two Debian EVR tuples to determine which is newer
+
+    :param evr_a: an (epoch, upstream version, revision) tuple, where
+        the epoch and revision may be None, or a :any:`common.Package`
+        object
+    :param evr_b: an EVR tuple or a :any:`common.Package` object
+    :return: 1 (if ``a`` is newer), 0 (if versions are equal), or -1
+        (if ``b`` is newer)
+    :rtype: int
+    :raises DpkgError: if an epoch is not numeric, or the upstream
+        version or revision is not a string
+    """
+    key_a, key_b = evr_key(evr_a), evr_key(evr_b)
+    if key_a == key_b:
+        return a_eq_b
+    return a_newer if key_a > key_b else b_newer
+
+
+def compare_many(pairs):
+    """Compare many pairs of Debian version strings
+
+    Equivalent to calling :any:`compare_versions` on each pair, but
+    the key of each distinct version is built only once, so comparing
+    the versions installed across a fleet, which repeat heavily, costs
+    little more than comparing tuples.
+
+    :param pairs: an iterable of 2-tuples of Debian version strings
+    :return: an array of signed bytes holding 1, 0, or -1 for each pair
+    :rtype: array.array
+    :raises DpkgError: if a version is not a valid Debian version
+        string
+    """
+    results = array(str('b'))
+    append = results.append
+    keys = {}
+    for version_a, version_b in pairs:
+        key_a = keys.get(version_a)
+        if key_a is None:
+            key_a = keys[version_a] = version_key(version_a)
+        key_b = keys.get(version_b)
+        if key_b is None:
+            key_b = keys[version_b] = version_key(version_b)
+        append((key_a > key_b) - (key_a < key_b))
+    return results
+
+
+def version_key(version):
+    """Get a sort key for a Debian version string
+
+    The version is tokenized once, so the returned key can be compared
+    repeatedly without re-parsing the string, e.g.
+    ``sorted(versions, key=dpkg.version_key)``. Keys order exactly as
+    :any:`compare_versions` orders the strings they were made from,
+    and equal versions, such as ``1.01`` and ``1.1-0``, have equal
+    keys.
+
+    :param str version: a Debian version string
+    :return: a sort key for the version
+    :rtype: DpkgKey
+    :raises DpkgError: if the version is not a valid Debian version
+        string
+    """
+    return DpkgKey(parse_version(version))
+
+
+def evr_key(evr):
+    """Get a sort key for a Debian EVR tuple or a Package
+
+    :param evr: an (epoch, upstream version, revision) tuple, where
+        the epoch and revision may be None, or a :any:`common.Package`
+        object
+    :return: a sort key for the EVR
+    :rtype: DpkgKey
+    :raises DpkgError: if the epoch is not numeric, or the upstream
+        version or revision is not a string
+    """
+    return DpkgKey(getattr(evr, 'evr', evr))
+
+
+class DpkgKey(tuple):
+    """A pre-tokenized, sortable representation of a Debian version
+
+    A flat tuple of integers: the epoch, then the items of the upstream
+    version, then those of the revision. Each string is stored as its
+    runs of non-digits and digits in turn. A run of non-digits is the
+    weight of each character followed by 0 for the end of the run, and
+    a run of digits is its numeric value, with 0 for an empty run. A
+    final 0 marks the end of the string, which sorts after a tilde and
+    before any other character, as dpkg compares the end of a string.
+
+    Because every item is an integer, comparing two keys is a single
+    tuple comparison. Keys are immutable and hashable.
+
+    :param tuple evr: an (epoch, upstream version, revision) tuple,
+        where the epoch and revision may be None
+    :raises DpkgError: if the epoch is not numeric, or the upstream
+        version or revision is not a string
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, evr):
+        epoch, upstream, revision = evr
+        try:
+            key = [int(epoch or 0)]
+        except ValueError:
+            raise DpkgError('Epoch is not a number: {0}'.format(epoch))
+        _extend_key(key, upstream)
+        _extend_key(key, revision or '')
+        return tuple.__new__(cls, key)
+
+    def __repr__(self):
+        """Full representation of a DpkgKey object"""
+        return 'DpkgKey({0})'.format(tuple.__repr__(self))
+
+
+def _extend_key(key, version):
+    """Append the items of an upstream version or revision to a key
+
+    :param list key: the key items so far
+    :param str version: an upstream version or revision
+    :return: None
+    :rtype: None
+    :raises DpkgError: if the version is not a string
+    """
+    try:
+        runs = _run_re.findall(version)
+    except TypeError:
+        raise DpkgError('Could not create a key for {0}'.format(version))
+    start = len(key)
+    run_items = _run_items
+    for letters, digits in runs:
+        if letters:
+            key += run_items[letters]
+        elif digits:
+            key.append(0)
+        else:
+            continue
+        key.append(int(digits) if digits else 0)
+    if len(key) == start:
+        # An empty string equals a run of zeros, such as '0'
+        key += (0, 0)
+    key.append(0)
+
+
+def parse_version(version):
+    """Split a Debian version string into its components
+
+    The epoch is everything before the first colon, and defaults to
+    ``'0'``. The revision is everything after the last hyphen, and is
+    None if there is no hyphen. Surrounding whitespace is ignored.
+
+    :param str version: a Debian version string, of the form
+        ``[epoch:]upstream_version[-debian_revision]``
+    :return: an (epoch, upstream version, revision) tuple
+    :rtype: tuple
+    :raises DpkgError: if the version is empty, contains whitespace,
+        or has an empty or non-numeric epoch, or an empty upstream
+        version or revision
+    """
+    try:
+        version = version.strip()
+    except AttributeError:
+        raise DpkgError('Could not parse version {0}'.format(version))
+    if not version:
+        raise DpkgError('Version string is empty')
+    if _whitespace_re.search(version) is not None:
+        raise DpkgError('Version string has embedded spaces: '
+                        '{0}'.format(version))
+    epoch, colon, rest = version.partition(':')
+    if not colon:
+        epoch, rest = '0', version
+    elif _epoch_re.match(epoch) is None:
+        raise DpkgError('Epoch is not a number: {0}'.format(version))
+    upstream, hyphen, revision = rest.rpartition('-')
+    if not hyphen:
+        upstream, revision = rest, None
+    elif not revision:
+        raise DpkgError('Revision is empty: {0}'.format(version))
+    if not upstream:
+        raise DpkgError('Upstream version is empty: {0}'.format(version))
+    return epoch, upstream, revision
+
+
+def package(package_string, arch_included=True):
+    """Parse a Debian package string into a Package object
+
+    Two forms are accepted:
+
+    * package file names, ``name_version_arch``, optionally followed by
+      ``.deb``, with the epoch's colon optionally escaped as ``%3a``,
+      e.g. ``openssh-client_1%3a8.2p1-4ubuntu0.5_amd64.deb``
+    * whitespace-separated fields, as printed by ``dpkg-query -W -f
+      '${Package} ${Version} ${Architecture}\\n'``. The architecture may
+      instead follow the name after a colon, as in the
+      ``${binary:Package}`` field, e.g. ``libc6:amd64 2.31-0ubuntu9``
+
+    The upstream version and revision are stored as the Package's
+    version and release, and the epoch defaults to ``'0'``.
+
+    :param str package_string: a Debian package string
+    :param bool arch_included: default True - strings may be provided
+        without an architecture; if providing such strings, set this
+        option to False
+    :return: the parsed package
+    :rtype: common.Package
+    :raises DpkgError: if the string cannot be parsed
+    """
+    try:
+        fields = package_string.split()
+    except AttributeError:
+        raise DpkgError('Could not parse package {0}'.format(package_string))
+    if len(fields) == 1:
+        fields = fields[0]
+        if fields.endswith('.deb'):
+            fields = fields[:-4]
+        fields = fields.replace('%3a', ':').replace('%3A', ':').split('_')
+    arch = None
+    if arch_included and len(fields) == 2 and ':' in fields[0]:
+        name, arch = fields[0].split(':', 1)
+        fields = [name, fields[1]]
+    elif arch_included and len(fields) == 3:
+        arch = fields.pop()
+    if len(fields) != 2 or not fields[0] or (arch_included and not arch):
+        raise DpkgError('Could not parse package string: '
+                        '{0}'.format(package_string))
+    epoch, upstream, revision = parse_version(fields[1])
+    return Package(fields[0], epoch, upstream, revision, arch,
+                   package_str=package_string)
@@ -0,0 +1,212 @@
+"""
+extsort module for version_utils
+
+Contains an external merge sort for package lists too large to sort in
+memory, such as inventories exported from a whole fleet. Public
+functions include:
+
+    * :any:`sort_packages`: sort :any:`common.Package` objects by
+      name, EVR, and architecture
+    * :any:`sort_package_strings`: parse and sort RPM package strings,
+      such as the lines of ``rpm -qa`` output
+
+Packages are read in runs that fit in a memory budget. Each run is
+sorted and written to a temporary file, and the runs are then merged
+with :any:`heapq.merge`. Sort keys are computed once per package, as
+bytes from :any:`rpm.encode_evr`, so sorting and merging never parse or
+compare versions again.
+
+This module requires Python 3.5 or later, and is not imported by
+default.
+"""
+
+# Standard library imports
+from heapq import merge
+from itertools import islice
+from logging import getLogger
+from operator import itemgetter
+from os import fdopen, remove
+from pickle import dump, HIGHEST_PROTOCOL, load
+from tempfile import mkstemp
+
+# version_utils imports
+from version_utils import rpm
+from version_utils.common import Package
+
+
+logger = getLogger(__name__)
+
+_default_memory = 64 * 1024 * 1024
+# An estimate of the memory used by each package held in a run, beyond
+# twice the length of its sort key, from benchmarks/bench_extsort.py
+_record_overhead = 360
+
+
+def sort_packages(packages, reverse=False, memory=_default_memory,
+                  tmpdir=None, fan_in=128):
+    """Sort packages by name, then EVR, then architecture
+
+    A generator yielding the packages in order, with EVRs ordered by
+    the rules of :any:`rpm.compare_evrs`. The sort is stable, so
+    packages with the same name, equivalent EVRs, and the same
+    architecture are yielded in the order they were read.
+
+    Packages are held in memory until their estimated size reaches
+    ``memory``, and are then sorted and written to a temporary file as
+    a run. If every package fits in one run, nothing is written. Run
+    files are closed once written, and are reopened only to be merged.
+    Runs are merged ``fan_in`` at a time, in several passes if there
+    are more than ``fan_in`` runs, so that at most ``fan_in`` files are
+    open for reading at once, and the memory used to read them stays
+    bounded. Temporary files are removed when the generator is
+    exhausted or closed.
+
+    :param packages: an iterable of :any:`common.Package` objects
+    :param bool reverse: default False - whether to yield the newest
+        versions and the last names first
+    :param int memory: default 64 MiB - the approximate number of bytes
+        of packages to hold in memory before writing a run
+    :param str tmpdir: the directory to write runs in, default None for
+        the system's temporary directory
+    :param int fan_in: default 128 - the most runs to merge at once
+    :return: a generator of :any:`common.Package` objects
+    :rtype: generator
+    :raises RpmError: if a package's epoch, version, or release cannot
+        be encoded
+    """
+    if fan_in < 2:
+        raise ValueError('fan_in must be at least 2, not '
+                         '{0!r}'.format(fan_in))
+    runs = []
+    merged = None
+    # Runs are read a block at a time while merging, so that merging
+    # fan_in runs holds about as many records as a single run
+    block_size = None
+    try:
+        records = []
+        size = 0
+        for pkg in packages:
+            key = _sort_key(pkg)
+            records.append((key, pkg.info + (pkg.package,)))
+            size += 2 * len(key) + _record_overhead
+            if size >= memory:
+                if block_size is None:
+                    block_size = max(1, len(records) // fan_in)
+                records.sort(key=itemgetter(0), reverse=reverse)
+                runs.append(_write_run(records, tmpdir, block_size))
+                records, size = [], 0
+        records.sort(key=itemgetter(0), reverse=reverse)
+        if not runs:
+            merged = records
+        else:
+            if records:
+                runs.append(_write_run(records, tmpdir, block_size))
+            records = None
+            logger.debug('merging %s runs', len(runs))
+            # Merge the earliest runs first, keeping runs in input order
+            # so that the sort stays stable
+            while len(runs) > fan_in:
+                group = runs[:fan_in]
+                runs[:fan_in] = [_write_run(
+                    _merge_runs(group, reverse), tmpdir, block_size)]
+                for run_path in group:
+                    remove(run_path)
+            merged = _merge_runs(runs, reverse)
+        for _, args in merged:
+            yield Package(*args)
+    finally:
+        if merged is not None and not isinstance(merged, list):
+            # Close the run files being read before removing them
+            merged.close()
+        for run_path in runs:
+            remove(run_path)
+
+
+def sort_package_strings(package_strings, arch_included=True,
+                         on_error='raise', **kwargs):
+    """Parse and sort RPM package strings
+
+    A generator yielding the package strings sorted as by
+    :any:`sort_packages`. Strings are parsed as by
+    :any:`rpm.parse_many`, so surrounding whitespace is stripped and
+    blank strings are skipped.
+
+    :param package_strings: an iterable of RPM package strings, such as
+        an open file of ``rpm -qa`` output
+    :param bool arch_included: default True - whether the package
+        strings end with an architecture
+    :param on_error: ``'raise'``, ``'skip'``, or a list to collect
+        failures in, as for :any:`rpm.parse_many`
+    :param kwargs: keyword arguments for :any:`sort_packages`
+    :return: a generator of package strings
+    :rtype: generator
+    :raises RpmError: if a string cannot be parsed and ``on_error`` is
+        ``'raise'``
+    """
+    packages = rpm.parse_many(package_strings, arch_included, on_error)
+    for pkg in sort_packages(packages, **kwargs):
+        yield pkg.package
+
+
+def _sort_key(pkg):
+    """Get a package's sort key as bytes
+
+    The name and EVR are each self-delimiting, so the concatenated key
+    orders by name, then EVR, then architecture.
+
+    :param common.Package pkg: a package
+    :return: the sort key
+    :rtype: bytes
+    :raises RpmError: if the EVR cannot be encoded
+    """
+    return b''.join((pkg.name.encode('utf-8'), b'\0',
+                     rpm.encode_evr(pkg.evr),
+                     (pkg.arch or '').encode('utf-8')))
+
+
+def _write_run(records, tmpdir, block_size):
+    """Write sorted records to a new temporary file in blocks
+
+    The file is closed once written, and must be removed by the caller.
+
+    :param records: an iterable of (key, package arguments) tuples
+    :param str tmpdir: the directory to create the file in, or None
+    :param int block_size: the number of records in each block
+    :return: the path of the file
+    :rtype: str
+    """
+    descriptor, run_path = mkstemp(prefix='version_utils-', suffix='.run',
+                                   dir=tmpdir)
+    try:
+        with fdopen(descriptor, 'wb') as run_file:
+            records = iter(records)
+            block = list(islice(records, block_size))
+            while block:
+                dump(block, run_file, HIGHEST_PROTOCOL)
+                block = list(islice(records, block_size))
+    except BaseException:
+        remove(run_path)
+        raise
+    return run_path
+
+
+def _read_run(run_path):
+    """Read the records written to a run file, a block at a time
+
+    The file is opened when the first record is read, and closed when
+    the last has been read or the generator is closed.
+    """
+    with open(run_path, 'rb') as run_file:
+        while True:
+            try:
+                block = load(run_file)
+            except EOFError:
+                return
+            for record in block:
+                yield record
+
+
+def _merge_runs(run_paths, reverse):
+    """Merge sorted run files into a single sorted iterator of records"""
+    return merge(*[_read_run(run_path) for run_path in run_paths],
+                 key=itemgetter(0), reverse=reverse)
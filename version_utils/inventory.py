@@ -0,0 +1,202 @@
+"""
+inventory module for version_utils
+
+Contains an index of the packages installed on a host, for answering
+version queries without comparing against every package. Public
+classes include:
+
+    * :any:`Inventory`: packages indexed by name and by name and
+      architecture, with each index kept in version order
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from bisect import bisect_left, bisect_right
+from logging import getLogger
+
+# version_utils imports
+from version_utils.rpm import evr_key
+
+
+logger = getLogger(__name__)
+
+
+class Inventory(object):
+    """An index of installed packages in version order
+
+    Packages are grouped by name, and by name and architecture. Each
+    group is kept sorted by version, so the newest version of a package
+    is found in constant time, and whether a version is installed, or
+    which versions are older or newer than it, is found by bisection in
+    O(log n) comparisons. Adding or removing a package inserts it into,
+    or deletes it from, its sorted groups without re-sorting them.
+
+    Versions are ordered by ``key``, which by default applies the RPM
+    comparison rules of :any:`rpm.compare_evrs`.
+
+    :param packages: an optional iterable of :any:`common.Package`
+        objects to add
+    :param key: default :any:`rpm.evr_key` - a function returning a
+        sort key for a :any:`common.Package` or an EVR tuple
+    """
+
+    def __init__(self, packages=(), key=evr_key):
+        self._key = key
+        self._by_name = {}
+        self._by_name_arch = {}
+        for package in packages:
+            self.add(package)
+
+    def __len__(self):
+        return sum(len(group[1]) for group in self._by_name.values())
+
+    def __iter__(self):
+        """Iterate over packages, grouped by name in version order"""
+        for name in sorted(self._by_name):
+            for package in self._by_name[name][1]:
+                yield package
+
+    def __contains__(self, package):
+        """Check whether a package with the same information is present"""
+        group = self._by_name_arch.get((package.name, package.arch))
+        return group is not None and self._find(group, package) is not None
+
+    def add(self, package):
+        """Add a package to the inventory
+
+        :param common.Package package: the package to add
+        :return: None
+        :rtype: None
+        """
+        key = self._key(package)
+        for groups, group_key in ((self._by_name, package.name),
+                                  (self._by_name_arch,
+                                   (package.name, package.arch))):
+            keys, packages = groups.setdefault(group_key, ([], []))
+            index = bisect_right(keys, key)
+            keys.insert(index, key)
+            packages.insert(index, package)
+
+    def remove(self, package):
+        """Remove a package from the inventory
+
+        The package removed is one with the same name, epoch, version,
+        release, and architecture as ``package``, which need not be the
+        same object.
+
+        :param common.Package package: the package to remove
+        :return: None
+        :rtype: None
+        :raises KeyError: if no such package is in the inventory
+        """
+        for groups, group_key in ((self._by_name_arch,
+                                   (package.name, package.arch)),
+                                  (self._by_name, package.name)):
+            group = groups.get(group_key)
+            index = None if group is None else self._find(group, package)
+            if index is None:
+                raise KeyError('{0} is not in the inventory'.format(package))
+            del group[0][index]
+            del group[1][index]
+            if not group[0]:
+                del groups[group_key]
+
+    def names(self):
+        """Get the names of all packages in the inventory
+
+        :return: a sorted list of package names
+        :rtype: list
+        """
+        return sorted(self._by_name)
+
+    def versions(self, name, arch=None):
+        """Get all installed versions of a package, oldest first
+
+        :param str name: a package name
+        :param str arch: if provided, only return packages with this
+            architecture
+        :return: a list of :any:`common.Package` objects
+        :rtype: list
+        """
+        return list(self._group(name, arch)[1])
+
+    def newest(self, name, arch=None):
+        """Get the newest installed version of a package
+
+        :param str name: a package name
+        :param str arch: if provided, only consider packages with this
+            architecture
+        :return: the newest package, or None if none are installed
+        :rtype: common.Package
+        """
+        packages = self._group(name, arch)[1]
+        return packages[-1] if packages else None
+
+    def older_than(self, name, evr, arch=None):
+        """Get the installed versions of a package older than an EVR
+
+        :param str name: a package name
+        :param tuple evr: an EVR tuple
+        :param str arch: if provided, only return packages with this
+            architecture
+        :return: a list of :any:`common.Package` objects, oldest first
+        :rtype: list
+        """
+        keys, packages = self._group(name, arch)
+        return packages[:bisect_left(keys, self._key(evr))]
+
+    def newer_than(self, name, evr, arch=None):
+        """Get the installed versions of a package newer than an EVR
+
+        :param str name: a package name
+        :param tuple evr: an EVR tuple
+        :param str arch: if provided, only return packages with this
+            architecture
+        :return: a list of :any:`common.Package` objects, oldest first
+        :rtype: list
+        """
+        keys, packages = self._group(name, arch)
+        return packages[bisect_right(keys, self._key(evr)):]
+
+    def is_installed(self, name, evr=None, arch=None):
+        """Check whether a package is installed
+
+        :param str name: a package name
+        :param tuple evr: if provided, only check for versions
+            equivalent to this EVR
+        :param str arch: if provided, only check for packages with this
+            architecture
+        :return: whether a matching package is installed
+        :rtype: bool
+        """
+        keys = self._group(name, arch)[0]
+        if evr is None:
+            return len(keys) != 0
+        key = self._key(evr)
+        index = bisect_left(keys, key)
+        return index < len(keys) and keys[index] == key
+
+    def _group(self, name, arch):
+        """Get the (keys, packages) lists for a name and optional arch"""
+        if arch is None:
+            group = self._by_name.get(name)
+        else:
+            group = self._by_name_arch.get((name, arch))
+        return ([], []) if group is None else group
+
+    def _find(self, group, package):
+        """Find the index of a package with the same information
+
+        :param tuple group: a (keys, packages) tuple of sorted lists
+        :param common.Package package: the package to find
+        :return: the index of the package, or None if it is not found
+        :rtype: int
+        """
+        keys, packages = group
+        key = self._key(package)
+        info = package.info
+        for index in range(bisect_left(keys, key), bisect_right(keys, key)):
+            if packages[index].info == info:
+                return index
+        return None
@@ -0,0 +1,120 @@
+"""
+manifest module for version_utils
+
+Contains functions for reading package manifests, such as files of
+``rpm -qa`` output collected from many hosts. Public functions include:
+
+    * :any:`read_manifest`: lazily parse the packages listed in a
+      manifest file or binary stream, which may be gzip-compressed
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from gzip import GzipFile
+from logging import getLogger
+from mmap import ACCESS_READ, mmap
+from os import fstat
+
+# version_utils imports
+from version_utils import rpm
+
+
+logger = getLogger(__name__)
+
+_gzip_magic = b'\x1f\x8b'
+
+
+def read_manifest(source, arch_included=True, on_error='raise',
+                  encoding='utf-8', pool=None):
+    """Parse the packages in a manifest, yielding Package objects
+
+    A manifest lists one package string per line, as printed by
+    ``rpm -qa``. Blank lines and lines starting with ``#`` are skipped
+    without being decoded. Packages are parsed lazily as the returned
+    generator is consumed, so memory use does not depend on the size
+    of the manifest.
+
+    ``source`` may be a path or a binary stream, such as
+    ``sys.stdin.buffer``. Files given by path are memory-mapped rather
+    than read into buffers. Gzip-compressed manifests are detected by
+    their contents and decompressed as they are read.
+
+    :param source: the path of a manifest file, or a binary stream
+    :param bool arch_included: default True - whether the package
+        strings end with an architecture
+    :param on_error: ``'raise'``, ``'skip'``, or a list to collect
+        failures in, as for :any:`rpm.parse_many`
+    :param str encoding: default 'utf-8' - the encoding of the manifest.
+        Undecodable bytes are replaced rather than raising an error
+    :param common.StringPool pool: an optional pool to intern the fields
+        of the packages in, as for :any:`rpm.package`
+    :return: a generator of :any:`common.Package` objects
+    :rtype: generator
+    :raises RpmError: if a line cannot be parsed and ``on_error`` is
+        ``'raise'``
+    """
+    lines = _decoded_lines(_manifest_lines(source), encoding)
+    return rpm.parse_many(lines, arch_included, on_error, pool)
+
+
+def _manifest_lines(source):
+    """Yield the raw lines of a manifest file or stream
+
+    :param source: the path of a manifest file, or a binary stream
+    :return: a generator of lines as bytes
+    :rtype: generator
+    """
+    if hasattr(source, 'read'):
+        if _is_gzip(source):
+            source = GzipFile(fileobj=source, mode='rb')
+        for line in source:
+            yield line
+        return
+    with open(source, 'rb') as manifest:
+        if fstat(manifest.fileno()).st_size == 0:
+            return  # Empty files cannot be memory-mapped
+        if _is_gzip(manifest):
+            for line in GzipFile(fileobj=manifest, mode='rb'):
+                yield line
+            return
+        mapped = mmap(manifest.fileno(), 0, access=ACCESS_READ)
+        try:
+            for line in iter(mapped.readline, b''):
+                yield line
+        finally:
+            mapped.close()
+
+
+def _decoded_lines(lines, encoding):
+    """Decode lines that are not blank or comments
+
+    :param lines: an iterable of lines as bytes
+    :param str encoding: the encoding of the lines
+    :return: a generator of decoded lines
+    :rtype: generator
+    """
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith(b'#'):
+            yield stripped.decode(encoding, 'replace')
+
+
+def _is_gzip(stream):
+    """Check whether a binary stream starts with the gzip magic number
+
+    The stream is left at its original position.
+
+    :param stream: a binary stream that supports ``peek``, or that is
+        seekable
+    :return: whether the stream appears to be gzip-compressed
+    :rtype: bool
+    """
+    if hasattr(stream, 'peek'):
+        return stream.peek(2)[:2] == _gzip_magic
+    if hasattr(stream, 'seekable') and not stream.seekable():
+        return False
+    position = stream.tell()
+    head = stream.read(2)
+    stream.seek(position)
+    return head == _gzip_magic
@@ -0,0 +1,272 @@
+"""
+ranges module for version_utils
+
+Contains sets of RPM version ranges, such as the affected versions
+described by advisory feeds, with set algebra over them. Public classes
+include:
+
+    * :any:`Interval`: a range of EVRs, optionally unbounded at either
+      end, with inclusive or exclusive bounds
+    * :any:`RangeSet`: a normalized union of intervals, supporting
+      union, intersection, difference, complement, and membership
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from bisect import bisect_right
+from collections import namedtuple
+from logging import getLogger
+from operator import itemgetter
+
+# version_utils imports
+from version_utils.rpm import evr_key
+
+
+logger = getLogger(__name__)
+
+# Bounds are stored as cuts between EVRs: (0,) is below every EVR, (2,)
+# is above every EVR, and (1, key, 0) and (1, key, 1) are just below and
+# just above the EVRs with the given evr_key. Cuts sort in that order,
+# so an interval is the EVRs between a lower cut and a higher cut.
+_bottom = (0,)
+_top = (2,)
+
+
+class Interval(namedtuple('Interval', 'low high low_inclusive '
+                                      'high_inclusive')):
+    """A range of EVRs between two bounds
+
+    :param tuple low: the EVR tuple of the lower bound, or None if the
+        interval is unbounded below, default None
+    :param tuple high: the EVR tuple of the upper bound, or None if the
+        interval is unbounded above, default None
+    :param bool low_inclusive: default True - whether ``low`` is in the
+        interval
+    :param bool high_inclusive: default False - whether ``high`` is in
+        the interval
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, low=None, high=None, low_inclusive=True,
+                high_inclusive=False):
+        return super(Interval, cls).__new__(cls, low, high, low_inclusive,
+                                            high_inclusive)
+
+
+class RangeSet(object):
+    """A set of EVRs, stored as sorted, disjoint intervals
+
+    Intervals are normalized when a set is created: empty intervals are
+    dropped, and overlapping or adjacent intervals are merged, so that
+    equal sets have equal intervals. Bounds are tokenized once into
+    :any:`rpm.evr_key` keys, and versions are ordered by the rules of
+    :any:`rpm.compare_evrs`. EVRs that compare equal, such as
+    ``1.01`` and ``1.1``, are the same point.
+
+    Membership is tested by bisecting the sorted bounds, taking
+    O(log k) comparisons for a set of k intervals. Union, intersection,
+    difference, and complement return new sets, and are also available
+    as the ``|``, ``&``, ``-``, and ``~`` operators. Sets are immutable
+    and hashable.
+
+    :param intervals: an iterable of :any:`Interval` objects, or of
+        tuples of their fields
+    :raises RpmError: if a bound's version or release is not a string
+    """
+
+    __slots__ = ('_cuts', '_evrs')
+
+    def __init__(self, intervals=()):
+        bounds = []
+        for interval in intervals:
+            interval = Interval(*interval)
+            bounds.append((_lower_cut(interval.low, interval.low_inclusive),
+                           _upper_cut(interval.high, interval.high_inclusive),
+                           interval.low, interval.high))
+        self._set_bounds(_normalize(bounds))
+
+    @classmethod
+    def _from_bounds(cls, bounds):
+        """Create a set from normalized (low, high, evr, evr) bounds"""
+        range_set = cls.__new__(cls)
+        range_set._set_bounds(bounds)
+        return range_set
+
+    def _set_bounds(self, bounds):
+        """Store normalized bounds as flat tuples of cuts and EVRs"""
+        cuts, evrs = [], []
+        for low, high, low_evr, high_evr in bounds:
+            cuts += (low, high)
+            evrs += (low_evr, high_evr)
+        self._cuts = tuple(cuts)
+        self._evrs = tuple(evrs)
+
+    def _bounds(self):
+        """Get the (low cut, high cut, low EVR, high EVR) of each interval"""
+        cuts, evrs = self._cuts, self._evrs
+        return [(cuts[index], cuts[index + 1], evrs[index], evrs[index + 1])
+                for index in range(0, len(cuts), 2)]
+
+    def __len__(self):
+        """Get the number of disjoint intervals in the set"""
+        return len(self._cuts) // 2
+
+    def __iter__(self):
+        """Iterate over the set's intervals, lowest first"""
+        cuts, evrs = self._cuts, self._evrs
+        for index in range(0, len(cuts), 2):
+            low, high = cuts[index], cuts[index + 1]
+            yield Interval(evrs[index], evrs[index + 1],
+                           low == _bottom or low[2] == 0,
+                           high != _top and high[2] == 1)
+
+    def __contains__(self, evr):
+        """Check whether an EVR tuple or a Package is in the set"""
+        return bisect_right(self._cuts, (1, evr_key(evr), 0)) % 2 == 1
+
+    def __eq__(self, other):
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self._cuts == other._cuts
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self._cuts)
+
+    def __repr__(self):
+        """Full representation of a RangeSet object"""
+        return 'RangeSet({0!r})'.format(list(self))
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __invert__(self):
+        return self.complement()
+
+    def union(self, *others):
+        """Get the EVRs in this set or any of the others
+
+        All intervals are merged in a single pass after sorting, so
+        merging many sets at once is faster than merging them in turn.
+
+        :param others: :any:`RangeSet` objects
+        :return: the union of the sets
+        :rtype: RangeSet
+        """
+        bounds = self._bounds()
+        for other in others:
+            bounds += other._bounds()
+        return RangeSet._from_bounds(_normalize(bounds))
+
+    def intersection(self, *others):
+        """Get the EVRs in this set and all of the others
+
+        :param others: :any:`RangeSet` objects
+        :return: the intersection of the sets
+        :rtype: RangeSet
+        """
+        bounds = self._bounds()
+        for other in others:
+            bounds = _intersect(bounds, other._bounds())
+        return RangeSet._from_bounds(bounds)
+
+    def difference(self, *others):
+        """Get the EVRs in this set and not in any of the others
+
+        :param others: :any:`RangeSet` objects
+        :return: the difference of the sets
+        :rtype: RangeSet
+        """
+        if not others:
+            return self
+        return self.intersection(RangeSet().union(*others).complement())
+
+    def complement(self):
+        """Get the EVRs not in this set
+
+        :return: the complement of the set
+        :rtype: RangeSet
+        """
+        cuts, evrs = list(self._cuts), list(self._evrs)
+        if cuts and cuts[0] == _bottom:
+            del cuts[0], evrs[0]
+        else:
+            cuts.insert(0, _bottom)
+            evrs.insert(0, None)
+        if cuts and cuts[-1] == _top:
+            del cuts[-1], evrs[-1]
+        else:
+            cuts.append(_top)
+            evrs.append(None)
+        complement = RangeSet.__new__(RangeSet)
+        complement._cuts = tuple(cuts)
+        complement._evrs = tuple(evrs)
+        return complement
+
+
+def _lower_cut(evr, inclusive):
+    """Get the cut just below or above a lower bound"""
+    if evr is None:
+        return _bottom
+    return 1, evr_key(evr), 0 if inclusive else 1
+
+
+def _upper_cut(evr, inclusive):
+    """Get the cut just above or below an upper bound"""
+    if evr is None:
+        return _top
+    return 1, evr_key(evr), 1 if inclusive else 0
+
+
+def _normalize(bounds):
+    """Sort bounds and merge any that overlap or are adjacent
+
+    :param list bounds: (low cut, high cut, low EVR, high EVR) tuples
+    :return: sorted, disjoint bounds, without empty intervals
+    :rtype: list
+    """
+    bounds = sorted((bound for bound in bounds if bound[0] < bound[1]),
+                    key=itemgetter(0))
+    merged = []
+    for bound in bounds:
+        last = merged[-1] if merged else None
+        if last is not None and bound[0] <= last[1]:
+            if bound[1] > last[1]:
+                merged[-1] = (last[0], bound[1], last[2], bound[3])
+        else:
+            merged.append(bound)
+    return merged
+
+
+def _intersect(bounds_a, bounds_b):
+    """Intersect two lists of normalized bounds in a single pass
+
+    :param list bounds_a: normalized bounds
+    :param list bounds_b: normalized bounds
+    :return: the normalized bounds of the intersection
+    :rtype: list
+    """
+    result = []
+    index_a = index_b = 0
+    while index_a < len(bounds_a) and index_b < len(bounds_b):
+        bound_a, bound_b = bounds_a[index_a], bounds_b[index_b]
+        low = bound_a if bound_a[0] >= bound_b[0] else bound_b
+        high = bound_a if bound_a[1] <= bound_b[1] else bound_b
+        if low[0] < high[1]:
+            result.append((low[0], high[1], low[2], high[3]))
+        if bound_a[1] < bound_b[1]:
+            index_a += 1
+        else:
+            index_b += 1
+    return result
@@ -0,0 +1,422 @@
+"""
+store module for version_utils
+
+Contains a compact binary format for sets of parsed packages, for
+caching inventories between processes without pickling. Public
+functions and classes include:
+
+    * :any:`dump` and :any:`dumps`: write packages in the binary format
+      to a file, or to bytes
+    * :any:`load` and :any:`loads`: open a file, or bytes, in the binary
+      format as a :any:`PackageStore`
+    * :any:`PackageStore`: a read-only sequence of the stored packages,
+      decoded on access
+
+The format is a header, then a table of the distinct strings used by
+the packages, each stored once, then a fixed-width record for each
+package. All integers are unsigned, 32-bit, and little-endian:
+
+    * header: the magic bytes ``VUPK``, the format version and a
+      reserved field as 16-bit integers, the number of records, and the
+      number of strings
+    * string offsets: one more offset than there are strings, giving the
+      start and end of each string in the string data
+    * string data: the UTF-8 encoded strings, padded with null bytes to
+      a multiple of 4 bytes
+    * records: for each package, the string indices of its name, epoch,
+      version, release, architecture, and package string, with
+      0xFFFFFFFF for None, followed by its EVR rank. Package strings
+      of the usual ``name-[epoch:]version-release.arch`` form are not
+      stored, and are instead given as 0xFFFFFFFE if the epoch is only
+      included when it is not ``0``, or 0xFFFFFFFD if it is always
+      included
+
+EVR ranks order the packages by the rules of :any:`rpm.compare_evrs`,
+with equivalent EVRs sharing a rank, so stored packages can be sorted
+and compared by version without parsing their versions again. An epoch
+of None ranks as ``0``. EVRs with a version or release of None, which
+:any:`rpm.compare_evrs` cannot compare, rank below all others, ordered
+by their fields with None before any string.
+
+This module requires Python 3.4 or later, for ``memoryview.cast`` and
+``Struct.iter_unpack``, and is not imported by default.
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from array import array
+from collections import OrderedDict
+from logging import getLogger
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from struct import Struct
+from sys import byteorder
+
+# version_utils imports
+from version_utils.common import Package
+from version_utils.errors import StoreError
+from version_utils.rpm import evr_key
+
+
+logger = getLogger(__name__)
+
+_magic = b'VUPK'
+_format_version = 1
+_header = Struct(str('<4sHHII'))
+_record = Struct(str('<7I'))
+_rank = Struct(str('<I'))
+_none = 0xFFFFFFFF
+# Package strings that are derived from the other fields, with the epoch
+# included only if it is not '0', or always included
+_derived = 0xFFFFFFFE
+_derived_epoch = 0xFFFFFFFD
+_fields = 7
+
+
+def dumps(packages):
+    """Serialize packages to bytes in the binary format
+
+    :param packages: an iterable of :any:`common.Package` objects
+    :return: the serialized packages
+    :rtype: bytes
+    :raises RpmError: if a package's version or release is neither a
+        string nor None
+    """
+    # None is pre-seeded so that len(strings) - 1 is the next free index.
+    # Strings are written in insertion order, which plain dicts only
+    # keep from Python 3.7
+    strings = OrderedDict([(None, _none)])
+    intern = strings.setdefault
+    records = []
+    append = records.append
+    evr_codes = {}
+    evrs = []
+    for pkg in packages:
+        name, epoch, version, release, arch = info = pkg.info
+        package_str = pkg.package
+        if package_str is not None and package_str == _package_string(
+                info, epoch != '0'):
+            package_str = _derived
+        elif package_str is not None and package_str == _package_string(
+                info, True):
+            package_str = _derived_epoch
+        else:
+            package_str = intern(package_str, len(strings) - 1)
+        evr = (epoch, version, release)
+        code = evr_codes.get(evr)
+        if code is None:
+            code = evr_codes[evr] = len(evrs)
+            evrs.append(evr)
+        append((intern(name, len(strings) - 1),
+                intern(epoch, len(strings) - 1),
+                intern(version, len(strings) - 1),
+                intern(release, len(strings) - 1),
+                intern(arch, len(strings) - 1),
+                package_str, code))
+    # Rank distinct EVRs, giving equivalent EVRs the same rank
+    keys = [_rank_key(evr) for evr in evrs]
+    ranks = [0] * len(keys)
+    rank, previous = -1, None
+    for code in sorted(range(len(keys)), key=keys.__getitem__):
+        if keys[code] != previous:
+            rank, previous = rank + 1, keys[code]
+        ranks[code] = rank
+
+    words = array(str('I'))
+    for record in records:
+        words.extend(record[:-1])
+        words.append(ranks[record[-1]])
+    del strings[None]
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = array(str('I'), [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    data = b''.join(encoded)
+    data += b'\0' * (-len(data) % 4)
+    if byteorder != 'little':
+        offsets.byteswap()
+        words.byteswap()
+    header = _header.pack(_magic, _format_version, 0, len(records),
+                          len(encoded))
+    return b''.join((header, offsets.tobytes(), data, words.tobytes()))
+
+
+def dump(packages, stream):
+    """Serialize packages in the binary format to a binary stream
+
+    :param packages: an iterable of :any:`common.Package` objects
+    :param stream: a binary stream, such as a file opened with ``'wb'``
+    :return: None
+    :rtype: None
+    :raises RpmError: if a package's version or release is neither a
+        string nor None
+    """
+    stream.write(dumps(packages))
+
+
+def loads(data):
+    """Open serialized packages held in memory
+
+    :param data: bytes, or any object supporting the buffer protocol,
+        such as a ``bytearray`` or ``mmap``. The data is not copied
+    :return: the stored packages
+    :rtype: PackageStore
+    :raises StoreError: if the data is not in the binary format
+    """
+    return PackageStore(data)
+
+
+def load(path):
+    """Open a file of serialized packages
+
+    The file is memory-mapped rather than read, so packages are only
+    read from disk as they are accessed. Close the returned store, or
+    use it as a context manager, to release the mapping.
+
+    :param str path: the path of a file written by :any:`dump`
+    :return: the stored packages
+    :rtype: PackageStore
+    :raises StoreError: if the file is not in the binary format
+    """
+    with open(path, 'rb') as store_file:
+        if fstat(store_file.fileno()).st_size == 0:
+            raise StoreError('{0} is empty'.format(path))
+        mapped = mmap(store_file.fileno(), 0, access=ACCESS_READ)
+    try:
+        return PackageStore(mapped)
+    except StoreError:
+        mapped.close()
+        raise
+
+
+class PackageStore(object):
+    """A read-only sequence of packages in the binary format
+
+    Records and strings are read in place from the underlying buffer
+    when they are accessed, and each string is decoded at most once.
+    Indexing or iterating returns :any:`common.Package` objects equal
+    to those that were stored, including their package strings.
+
+    :param data: an object supporting the buffer protocol, holding
+        packages serialized by :any:`dumps`
+    :raises StoreError: if the data is not in the binary format
+    """
+
+    def __init__(self, data):
+        self._buffer = data
+        view = memoryview(data)
+        if len(view) < _header.size:
+            raise StoreError('Data is too short to hold stored packages')
+        magic, version, _, count, string_count = _header.unpack_from(view)
+        if magic != _magic:
+            raise StoreError('Data does not hold stored packages')
+        if version != _format_version:
+            raise StoreError('Unsupported store format version: '
+                             '{0}'.format(version))
+        start = _header.size
+        self._data_start = start + 4 * (string_count + 1)
+        if len(view) < self._data_start:
+            raise StoreError('Stored packages are truncated')
+        self._offsets = offsets = _words(view, start, string_count + 1)
+        if offsets[0] != 0 or any(
+                offsets[index] > offsets[index + 1]
+                for index in range(string_count)):
+            raise StoreError('Stored string offsets are corrupt')
+        data_size = offsets[-1] + (-offsets[-1] % 4)
+        self._records_start = self._data_start + data_size
+        if len(view) < self._records_start + count * _record.size:
+            raise StoreError('Stored packages are truncated')
+        self._view = view
+        self._strings = [None] * string_count
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """Get the stored package at an index
+
+        :param int index: the index of the package, which may be
+            negative
+        :return: the package
+        :rtype: common.Package
+        :raises StoreError: if the package's record is corrupt
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('PackageStore index out of range')
+        return Package(*_package_args(_record.unpack_from(
+            self._view, self._records_start + index * _record.size),
+            self._string))
+
+    def __iter__(self):
+        # Every string is needed, so decode them all up front
+        table = dict(enumerate(self._string(index)
+                               for index in range(len(self._strings))))
+        table[_none] = None
+        end = self._records_start + self._count * _record.size
+        records = self._view[self._records_start:end]
+        # Identical records are common in inventories from many hosts
+        fields_args = {}
+        for fields in _record.iter_unpack(records):
+            args = fields_args.get(fields)
+            if args is None:
+                try:
+                    args = fields_args[fields] = _package_args(
+                        fields, table.__getitem__)
+                except KeyError as exc:
+                    raise StoreError('String index out of range: '
+                                     '{0}'.format(exc.args[0]))
+            yield Package(*args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def rank(self, index):
+        """Get the EVR rank of the stored package at an index
+
+        Packages with higher ranks have newer EVRs, and packages with
+        equivalent EVRs have equal ranks.
+
+        :param int index: the index of the package
+        :return: the EVR rank
+        :rtype: int
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('PackageStore index out of range')
+        offset = self._records_start + (index + 1) * _record.size - 4
+        return _rank.unpack_from(self._view, offset)[0]
+
+    def ranks(self):
+        """Get the EVR ranks of all stored packages
+
+        On little-endian machines, the result is a view of the ranks in
+        the underlying buffer, which can also be passed to e.g.
+        ``numpy.asarray`` without copying.
+
+        :return: the EVR rank of each package, in order
+        :rtype: memoryview
+        """
+        words = _words(self._view, self._records_start,
+                       self._count * _fields)
+        return memoryview(words)[_fields - 1::_fields]
+
+    def close(self):
+        """Release the underlying buffer, closing it if it was mapped
+
+        Views returned by :any:`ranks` must be released first.
+
+        :return: None
+        :rtype: None
+        """
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._view.release()
+        if isinstance(self._buffer, mmap):
+            self._buffer.close()
+
+    def _string(self, index):
+        """Get a string from the string table, decoding it once
+
+        :param int index: the index of the string, or 0xFFFFFFFF
+        :return: the string, or None
+        :rtype: str
+        :raises StoreError: if the index is out of range, or the string
+            is not valid UTF-8
+        """
+        if index == _none:
+            return None
+        if index >= len(self._strings):
+            raise StoreError('String index out of range: {0}'.format(index))
+        value = self._strings[index]
+        if value is None:
+            start = self._data_start + self._offsets[index]
+            end = self._data_start + self._offsets[index + 1]
+            try:
+                value = self._view[start:end].tobytes().decode('utf-8')
+            except UnicodeDecodeError:
+                raise StoreError('Corrupt string data at index '
+                                 '{0}'.format(index))
+            self._strings[index] = value
+        return value
+
+
+def _rank_key(evr):
+    """Get the key that EVR ranks are assigned in the order of
+
+    :param tuple evr: an (epoch, version, release) tuple, whose fields
+        may be None
+    :return: a sort key for the EVR
+    :rtype: tuple
+    :raises RpmError: if the version or release is neither a string
+        nor None
+    """
+    epoch, version, release = evr
+    if version is None or release is None:
+        return (False, tuple((field is not None, field or '')
+                             for field in evr))
+    return (True, evr_key((epoch or '0', version, release)))
+
+
+def _package_args(fields, string):
+    """Get the arguments to create a Package from the fields of a record
+
+    :param tuple fields: the unpacked fields of a record
+    :param string: a function returning the string at an index of the
+        string table, or None for 0xFFFFFFFF
+    :return: the name, epoch, version, release, architecture, and
+        package string of the package
+    :rtype: tuple
+    """
+    info = (string(fields[0]), string(fields[1]), string(fields[2]),
+            string(fields[3]), string(fields[4]))
+    package_str = fields[5]
+    if package_str == _derived:
+        package_str = _package_string(info, info[1] != '0')
+    elif package_str == _derived_epoch:
+        package_str = _package_string(info, True)
+    else:
+        package_str = string(package_str)
+    return info + (package_str,)
+
+
+def _package_string(info, with_epoch):
+    """Format a package string from a package's information
+
+    :param tuple info: a (name, epoch, version, release, arch) tuple
+    :param bool with_epoch: whether to include the epoch
+    :return: the package string, or None if it cannot be formatted
+    :rtype: str
+    """
+    name, epoch, version, release, arch = info
+    if None in info:
+        return None
+    if with_epoch:
+        return '{0}-{1}:{2}-{3}.{4}'.format(name, epoch, version, release,
+                                            arch)
+    return '{0}-{1}-{2}.{3}'.format(name, version, release, arch)
+
+
+def _words(view, start, count):
+    """Get unsigned, 32-bit, little-endian integers from a buffer
+
+    :param memoryview view: the buffer
+    :param int start: the offset of the first integer
+    :param int count: the number of integers
+    :return: a view of the integers in the buffer on little-endian
+        machines, and otherwise a byte-swapped copy of them
+    :rtype: memoryview or array.array
+    """
+    data = view[start:start + 4 * count]
+    if byteorder == 'little':
+        return data.cast(str('I'))
+    words = array(str('I'), data.tobytes())
+    words.byteswap()
+    return words
@@ -0,0 +1,201 @@
+"""
+table module for version_utils
+
+Contains a columnar, NumPy-backed table of RPM packages, for filtering
+large numbers of packages by version without comparing them one at a
+time. Public classes include:
+
+    * :any:`PackageTable`: a table of package names, epochs, versions,
+      releases, and architectures, with each row ranked by EVR
+
+NumPy is an optional dependency of version_utils, and is only required
+to use this module.
+"""
+
+# Standard library imports
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+from bisect import bisect_left, bisect_right
+from logging import getLogger
+
+# Third party imports
+try:
+    import numpy
+except ImportError:  # numpy is only needed for this module
+    numpy = None
+
+# version_utils imports
+from version_utils.common import Package
+from version_utils.rpm import evr_key
+
+
+logger = getLogger(__name__)
+
+_columns = ('name', 'epoch', 'version', 'release', 'arch')
+
+
+class PackageTable(object):
+    """A columnar table of packages with precomputed EVR ranks
+
+    Each of the name, epoch, version, release, and architecture columns
+    is dictionary-encoded: the distinct strings in the column are
+    stored once, and each row holds an integer code into them. Each
+    distinct EVR in the table is given an integer rank, ordered by the
+    rules of :any:`rpm.compare_evrs`, with equivalent EVRs sharing a
+    rank. Version filters are then vectorized comparisons of the rank
+    column, returning boolean NumPy arrays that can be combined with
+    ``&`` and ``|`` and passed to :any:`packages`.
+
+    :param packages: an iterable of :any:`common.Package` objects, as
+        returned by :any:`rpm.package`, or of dictionaries, as returned
+        by :any:`rpm.parse_package`
+    :raises ImportError: if NumPy is not installed
+    :ivar numpy.ndarray rank: the EVR rank of each row
+    """
+
+    def __init__(self, packages):
+        if numpy is None:
+            raise ImportError('PackageTable requires numpy')
+        values = dict((column, []) for column in _columns)
+        codes = dict((column, {}) for column in _columns)
+        rows = dict((column, []) for column in _columns)
+        evr_codes, evrs, evr_rows = {}, [], []
+        self._package_strs = []
+        for pkg in packages:
+            if isinstance(pkg, dict):
+                epoch, version, release = pkg['EVR']
+                fields = (pkg['name'], epoch, version, release, pkg['arch'])
+                self._package_strs.append(None)
+            else:
+                fields = pkg.info
+                self._package_strs.append(pkg.package)
+            for column, value in zip(_columns, fields):
+                column_codes = codes[column]
+                if value not in column_codes:
+                    column_codes[value] = len(values[column])
+                    values[column].append(value)
+                rows[column].append(column_codes[value])
+            evr = fields[1:4]
+            if evr not in evr_codes:
+                evr_codes[evr] = len(evrs)
+                evrs.append(evr)
+            evr_rows.append(evr_codes[evr])
+        self._values = values
+        self._codes = codes
+        self._rows = dict(
+            (column, numpy.array(rows[column], dtype=numpy.int32))
+            for column in _columns)
+        keys = [evr_key(evr) for evr in evrs]
+        # Rank distinct EVRs, giving equivalent EVRs the same rank
+        self._keys = sorted(set(keys))
+        evr_ranks = numpy.array([bisect_left(self._keys, key)
+                                 for key in keys], dtype=numpy.int32)
+        self.rank = evr_ranks[numpy.array(evr_rows, dtype=numpy.intp)]
+
+    def __len__(self):
+        return len(self._package_strs)
+
+    def values(self, column):
+        """Get the distinct values of a column
+
+        :param str column: one of ``name``, ``epoch``, ``version``,
+            ``release``, or ``arch``
+        :return: the distinct values, in order of first appearance
+        :rtype: list
+        """
+        return list(self._values[column])
+
+    def column(self, column):
+        """Get the value codes of each row for a column
+
+        Codes are indices into the list returned by :any:`values`.
+
+        :param str column: one of ``name``, ``epoch``, ``version``,
+            ``release``, or ``arch``
+        :return: the code of each row's value
+        :rtype: numpy.ndarray
+        """
+        return self._rows[column]
+
+    def equal_to(self, evr, name=None):
+        """Get a mask of rows with an EVR equivalent to ``evr``
+
+        :param tuple evr: an EVR tuple
+        :param str name: if provided, only match rows with this name
+        :return: a boolean array with an entry for each row
+        :rtype: numpy.ndarray
+        """
+        low, high = self._rank_bounds(evr)
+        mask = (self.rank >= low) & (self.rank < high)
+        return self._with_name(mask, name)
+
+    def newer_than(self, evr, name=None):
+        """Get a mask of rows with an EVR newer than ``evr``
+
+        :param tuple evr: an EVR tuple
+        :param str name: if provided, only match rows with this name
+        :return: a boolean array with an entry for each row
+        :rtype: numpy.ndarray
+        """
+        high = self._rank_bounds(evr)[1]
+        return self._with_name(self.rank >= high, name)
+
+    def older_than(self, evr, name=None):
+        """Get a mask of rows with an EVR older than ``evr``
+
+        :param tuple evr: an EVR tuple
+        :param str name: if provided, only match rows with this name
+        :return: a boolean array with an entry for each row
+        :rtype: numpy.ndarray
+        """
+        low = self._rank_bounds(evr)[0]
+        return self._with_name(self.rank < low, name)
+
+    def named(self, name):
+        """Get a mask of rows with the given package name
+
+        :param str name: a package name
+        :return: a boolean array with an entry for each row
+        :rtype: numpy.ndarray
+        """
+        code = self._codes['name'].get(name)
+        if code is None:
+            return numpy.zeros(len(self), dtype=bool)
+        return self._rows['name'] == code
+
+    def packages(self, mask=None):
+        """Get the rows of the table as Package objects
+
+        :param numpy.ndarray mask: an optional boolean array selecting
+            which rows to return, such as one returned by
+            :any:`newer_than`
+        :return: a generator of :any:`common.Package` objects
+        :rtype: generator
+        """
+        if mask is None:
+            indices = range(len(self))
+        else:
+            indices = numpy.flatnonzero(mask).tolist()
+        values, rows = self._values, self._rows
+        for index in indices:
+            fields = [values[column][rows[column][index]]
+                      for column in _columns]
+            yield Package(*fields, package_str=self._package_strs[index])
+
+    def _rank_bounds(self, evr):
+        """Get the range of ranks equivalent to ``evr``
+
+        :param tuple evr: an EVR tuple
+        :return: a 2-tuple of (lowest rank not older than ``evr``,
+            lowest rank newer than ``evr``)
+        :rtype: tuple
+        """
+        key = evr_key(evr)
+        return (bisect_left(self._keys, key),
+                bisect_right(self._keys, key))
+
+    def _with_name(self, mask, name):
+        """Restrict a mask to rows with the given name, if any"""
+        if name is None:
+            return mask
+        return mask & self.named(name)